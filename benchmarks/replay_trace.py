@@ -0,0 +1,53 @@
+"""Record an interaction trace once, then replay it against each release.
+
+Run from the repository root. The app is built by a factory function that
+takes an App and adds the widgets to it:
+
+    python benchmarks/replay_trace.py record myapp:build trace.bin
+    python benchmarks/replay_trace.py replay myapp:build trace.bin [stats.json]
+
+Replays run in a hidden window with vsync off and a fixed 60 FPS clock, and
+print the profiler's frame statistics as JSON.
+"""
+
+import importlib
+import sys
+
+sys.path.insert(0, ".")
+
+from opgi import App
+from opgi.replay import InputRecorder, InputReplayer
+
+
+def load_factory(spec):
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def record(factory, path):
+    app = App()
+    factory(app)
+    with InputRecorder(app, path):
+        app.run()
+
+
+def replay(factory, path, stats_path=None):
+    app = App(visible=False, profile=True)
+    factory(app)
+    InputReplayer(app, path).start()
+    app.run()
+    print(app.profiler.dump_json(stats_path))
+
+
+def main():
+    if len(sys.argv) < 4 or sys.argv[1] not in ("record", "replay"):
+        sys.exit(__doc__)
+    mode, factory, path = sys.argv[1:4]
+    if mode == "record":
+        record(load_factory(factory), path)
+    else:
+        replay(load_factory(factory), path, *sys.argv[4:5])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Measure memory used per widget instance.
+
+Run from the repository root:
+
+    python benchmarks/widget_memory.py [count]
+
+Widgets are only constructed, never drawn, so no window or GL context is
+needed.
+"""
+
+import gc
+import sys
+import tracemalloc
+
+sys.path.insert(0, ".")
+
+from opgi import (
+    Button,
+    CheckButton,
+    ComboBox,
+    Label,
+    List,
+    ProgressBar,
+    Slider,
+    SpinBox,
+    TextInput,
+)
+
+FACTORIES = {
+    "Label": lambda i: Label("Label", i, 0),
+    "Button": lambda i: Button(i, 0, 100, 30, "Button"),
+    "TextInput": lambda i: TextInput(i, 0),
+    "SpinBox": lambda i: SpinBox(i, 0),
+    "CheckButton": lambda i: CheckButton(i, 0),
+    "ComboBox": lambda i: ComboBox(i, 0),
+    "List": lambda i: List(i, 0, 200, 300),
+    "Slider": lambda i: Slider(i, 0, 200, 30),
+    "ProgressBar": lambda i: ProgressBar(i, 0, 200, 20),
+}
+
+
+def measure(factory, count):
+    """Return the average number of bytes allocated per widget"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    widgets = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Don't count the list holding the widgets
+    list_bytes = sys.getsizeof(widgets)
+    del widgets
+    return (after - before - list_bytes) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    print(f"{'widget':<12} {'bytes/widget':>12}  ({count} instances)")
+    for name, factory in FACTORIES.items():
+        print(f"{name:<12} {measure(factory, count):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
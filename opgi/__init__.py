@@ -1,7 +1,36 @@
 from .app import App
+from .backend import GLBackend, SoftwareBackend, set_backend
+from .binding import Observable, ObservableList, bind, bind_items
+from .capture import FFmpegSink, FrameCapture, RawFileSink
+from .cellgrid import CellGrid, CellView
+from .chart import Chart, Series
+from .declarative import Element, Reconciler, h
+from .latency import FramePacer, LatencyTracker
 from .layouts import GridLayout, HorizontalLayout, VerticalLayout
-from .widgets import (Button, CheckButton, ComboBox, Label, List, ProgressBar,
-                      RadioButton, Slider, SpinBox, TextInput)
+from .pool import WidgetPool
+from .profiling import Profiler
+from .remote import RemoteClient, RemoteServer, RemoteView
+from .renderer import RenderThread
+from .replay import InputRecorder, InputReplayer
+from .resolution import DynamicResolution
+from .stack import Stack, TabView
+from .table import Table
+from .tasks import Background
+from .text import set_text_scale, use_font, use_glut, use_sdf_font
+from .tree import TreeNode, TreeView
+from .watchdog import Watchdog
+from .widgets import (
+    Button,
+    CheckButton,
+    ComboBox,
+    Label,
+    List,
+    ProgressBar,
+    RadioButton,
+    Slider,
+    SpinBox,
+    TextInput,
+)
 
 __all__ = [
     "App",
@@ -13,9 +42,48 @@ __all__ = [
     "RadioButton",
     "ComboBox",
     "List",
+    "TreeView",
+    "TreeNode",
     "Slider",
     "ProgressBar",
+    "CellGrid",
+    "CellView",
+    "Table",
+    "Chart",
+    "Series",
+    "Stack",
+    "TabView",
     "GridLayout",
     "HorizontalLayout",
     "VerticalLayout",
+    "Observable",
+    "ObservableList",
+    "bind",
+    "bind_items",
+    "Element",
+    "Reconciler",
+    "h",
+    "WidgetPool",
+    "Profiler",
+    "LatencyTracker",
+    "FramePacer",
+    "DynamicResolution",
+    "InputRecorder",
+    "InputReplayer",
+    "FrameCapture",
+    "RawFileSink",
+    "FFmpegSink",
+    "RemoteServer",
+    "RemoteClient",
+    "RemoteView",
+    "RenderThread",
+    "Watchdog",
+    "Background",
+    "use_font",
+    "use_glut",
+    "use_sdf_font",
+    "set_text_scale",
+    "GLBackend",
+    "SoftwareBackend",
+    "set_backend",
 ]
@@ -1,20 +1,115 @@
-import glfw
-import OpenGL.GL as gl
-from OpenGL import GLUT as glut
+import time
+from contextlib import nullcontext
+
+import numpy as np
+
+try:
+    import glfw
+    import OpenGL.GL as gl
+    from OpenGL import GLUT as glut
+except ImportError:  # opgi still imports, widgets draw with SoftwareBackend
+    glfw = gl = glut = None
+
+from .backend import GLBackend, RecordingBackend, replay, set_backend
+from .binding import default_scheduler
+from .capture import FrameCapture
+from .latency import FramePacer, LatencyTracker
+from .profiling import Profiler
+from .remote import RemoteServer
+from .renderer import Frame, RenderThread
+from .resolution import DynamicResolution
+from .tasks import Background, TaskRunner
+from .watchdog import Watchdog
+
+
+def _no_measure(name):
+    return nullcontext()
+
+
+def _no_section(label, budget_ms=None):
+    return nullcontext()
 
 
 class App:
-    def __init__(self, width=800, height=600, title="Simple GUI"):
+    def __init__(
+        self,
+        width=800,
+        height=600,
+        title="Simple GUI",
+        profile=False,
+        gpu_timing=False,
+        low_latency=False,
+        visible=True,
+        render_thread=False,
+    ):
+        if glfw is None or gl is None:
+            raise ImportError("App needs glfw and PyOpenGL, SoftwareBackend does not")
         self.width = width
         self.height = height
         self.original_width = width
         self.original_height = height
+
+        # Widgets work in window coordinates; on scaled displays the
+        # framebuffer has content_scale times as many pixels. Frames are
+        # drawn into a buffer of target_size pixels, the framebuffer unless
+        # dynamic resolution has lowered the scale.
+        self.fb_width = width
+        self.fb_height = height
+        self.content_scale = 1.0
+        self.target_size = (width, height)
+        self.resolution = None
         self.widgets = []
         self.focused_widget = None
 
+        # Pointer state: the widget that got the press receives all moves
+        # until release; moves are coalesced and delivered once per frame
+        self.captured_widget = None
+        self.cursor_x = 0.0
+        self.cursor_y = 0.0
+        self._pending_move = None
+
+        # Frame counter and clock used by widgets; an InputReplayer swaps in
+        # a fixed clock and feeds recorded events instead of GLFW
+        self.frame = 0
+        self.clock = glfw.get_time
+        self.input_replay = None
+
+        # Overlay layer: popups and tooltips drawn after the main pass. While
+        # an overlay is open the main pass is cached in a texture and only
+        # redrawn after invalidate()
+        self.overlays = []
+        self._main_layer_valid = False
+        self._main_layer_texture = None
+        self._main_layer_size = None
+
+        # Optional instrumentation, F3 toggles the HUD while profiling
+        self.profiler = None
+        self.watchdog = None
+        self.latency = None
+
+        # Low-latency mode polls input late in the frame, see FramePacer
+        self.pacer = None
+
+        # Rendered frames are read back asynchronously while capturing, and
+        # their draw commands are streamed to viewers while serving
+        self.capture = None
+        self.remote = None
+
+        # With a render thread this thread only records frames, see
+        # start_render_thread()
+        self.render_thread = None
+
+        # Background callbacks run in pools, their results come back here
+        self.tasks = TaskRunner()
+
+        # Observable changes are applied to bound widgets once per frame
+        self.bindings = default_scheduler
+
         if not glfw.init():
             raise RuntimeError("GLFW init failed")
 
+        if not visible:
+            glfw.window_hint(glfw.VISIBLE, glfw.FALSE)
         self.window = glfw.create_window(width, height, title, None, None)
         if not self.window:
             glfw.terminate()
@@ -23,16 +118,238 @@ class App:
         glfw.make_context_current(self.window)
         glut.glutInit()
 
-        # Set callbacks
-        glfw.set_mouse_button_callback(self.window, self.on_mouse_click)
-        glfw.set_key_callback(self.window, self.on_key_press)
-        glfw.set_char_callback(self.window, self.on_char_input)
-        glfw.set_window_size_callback(self.window, self.on_window_resize)
-        glfw.set_cursor_pos_callback(self.window, self.on_mouse_move)
+        # Widgets draw through the current backend, see opgi.backend
+        self.backend = GLBackend(self)
+        set_backend(self.backend)
+        self.backend.setup()
+        # Records frames for the render thread and remote viewers
+        self.recorder = RecordingBackend(self.backend.text_width)
+
+        self.connect_input()
+        # Not an input callback, so it stays connected while replaying
+        glfw.set_framebuffer_size_callback(self.window, self.on_framebuffer_resize)
 
         gl.glClearColor(0.95, 0.95, 0.95, 1)
         self.setup_projection()
 
+        if profile or gpu_timing:
+            self.enable_profiling(gpu_timing=gpu_timing)
+        if low_latency:
+            self.set_low_latency()
+        if render_thread:
+            self.start_render_thread()
+
+    def connect_input(self, enabled=True):
+        """Route GLFW input callbacks to the App handlers, or ignore input"""
+        window = self.window
+        glfw.set_mouse_button_callback(window, self.on_mouse_click if enabled else None)
+        glfw.set_key_callback(window, self.on_key_press if enabled else None)
+        glfw.set_char_callback(window, self.on_char_input if enabled else None)
+        glfw.set_window_size_callback(
+            window, self.on_window_resize if enabled else None
+        )
+        glfw.set_cursor_pos_callback(window, self.on_mouse_move if enabled else None)
+        glfw.set_scroll_callback(window, self.on_scroll if enabled else None)
+
+    def time(self):
+        """Current time in seconds on the app clock"""
+        return self.clock()
+
+    def poll_events(self):
+        """Process pending input, from GLFW or from a replayed trace"""
+        if self.input_replay:
+            self.input_replay.poll()
+        else:
+            glfw.poll_events()
+
+    def enable_profiling(self, profiler=None, gpu_timing=False):
+        """Start collecting draw, GL call and event handler statistics.
+
+        With gpu_timing the clear, widget, overlay and swap passes are also
+        wrapped in GL timer queries where the driver supports them.
+        """
+        if gpu_timing:
+            self._require_context("GPU timing")
+        self.profiler = profiler or Profiler()
+        self.profiler.install()
+        if gpu_timing:
+            self.profiler.enable_gpu_timing()
+        return self.profiler
+
+    def disable_profiling(self):
+        if self.profiler:
+            self.profiler.uninstall()
+        self.profiler = None
+
+    def enable_watchdog(self, budget_ms=16, callback_budget_ms=None, **options):
+        """Log frames and callbacks that run over budget with their hot code.
+
+        The watchdog thread samples the UI thread's stack while a frame or a
+        widget callback is over budget, see Watchdog.
+        """
+        if self.watchdog:
+            self.watchdog.stop()
+        self.watchdog = Watchdog(budget_ms, callback_budget_ms, **options)
+        self.watchdog.start()
+        return self.watchdog
+
+    def disable_watchdog(self):
+        if self.watchdog:
+            self.watchdog.stop()
+        self.watchdog = None
+
+    def enable_latency_tracking(self, sync=False):
+        """Measure click-to-present and keypress-to-present latency.
+
+        See LatencyTracker; the distributions are in app.latency.stats().
+        """
+        self.latency = LatencyTracker(sync=sync)
+        return self.latency
+
+    def disable_latency_tracking(self):
+        self.latency = None
+
+    def start_capture(self, sink, ring=3, max_queue=8, every=1):
+        """Stream rendered frames to sink, see FrameCapture.
+
+        sink is a callable taking (frame, index, timestamp) or an object
+        with write() and close(), like RawFileSink and FFmpegSink.
+        """
+        self._require_context("Capturing")
+        self.stop_capture()
+        self.capture = FrameCapture(sink, ring, max_queue, every)
+        return self.capture
+
+    def stop_capture(self):
+        if self.capture:
+            self._require_context("Capturing")
+            self.capture.stop()
+            self.capture = None
+
+    def serve_remote(self, host="127.0.0.1", port=0, max_queue=4):
+        """Stream draw commands to remote viewers, see RemoteServer.
+
+        Connect with ``python -m opgi.remote host port``. The server's
+        ``address`` holds the port picked when port is 0.
+        """
+        self.stop_remote()
+        self.remote = RemoteServer(host, port, max_queue)
+        return self.remote
+
+    def stop_remote(self):
+        if self.remote:
+            self.remote.close()
+            self.remote = None
+            self.invalidate()
+
+    def screenshot(self):
+        """Render a frame and read it back right away as an RGBA array.
+
+        Unlike start_capture() this waits for the GPU, so it is meant for
+        single images, not for every frame.
+        """
+        self._require_context("screenshot()")
+        self.render_frame()
+        gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+        data = gl.glReadPixels(
+            0, 0, self.fb_width, self.fb_height, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE
+        )
+        pixels = np.frombuffer(data, dtype=np.uint8)
+        return np.ascontiguousarray(
+            pixels.reshape(self.fb_height, self.fb_width, 4)[::-1]
+        )
+
+    def set_low_latency(self, enabled=True, margin_ms=2.0, refresh_rate=None):
+        """Poll input just before rendering instead of right after the swap"""
+        if enabled:
+            self._require_context("Low-latency mode")
+        self.pacer = FramePacer(refresh_rate, margin_ms) if enabled else None
+
+    def set_dynamic_resolution(self, enabled=True, budget_ms=12.0, **options):
+        """Render at a lower resolution while frames take over budget_ms.
+
+        Other options are passed to DynamicResolution. Use FreeType or SDF
+        text with it, since GLUT bitmap text is stretched when scaled down.
+        """
+        self._require_context("Dynamic resolution")
+        if self.resolution:
+            self.resolution.release()
+        self.resolution = DynamicResolution(budget_ms, **options) if enabled else None
+        self.invalidate()
+
+    def start_render_thread(self):
+        """Submit GL on a separate thread, see RenderThread.
+
+        This thread keeps handling input and recording the next frame while
+        the render thread draws the previous one. Remote viewers get the same
+        recorded frames. Low-latency mode and GPU timing need rendering on
+        this thread and do not work with it, neither does the profiler HUD.
+        Set up fonts, capture and dynamic resolution before starting it.
+        """
+        if self.render_thread:
+            return self.render_thread
+        if self.pacer or (self.profiler and self.profiler.gpu_timer):
+            raise RuntimeError(
+                "A render thread does not work with low-latency mode or GPU timing"
+            )
+        # Display lists and vertex buffers are not recorded, free them while
+        # the context is still current here
+        self.release_resources()
+        self.render_thread = RenderThread(self)
+        set_backend(self.recorder)
+        self.render_thread.start()
+        return self.render_thread
+
+    def stop_render_thread(self):
+        """Draw on this thread again, after the queued frame is presented"""
+        if self.render_thread:
+            self.render_thread.stop()
+            self.render_thread = None
+            set_backend(self.backend)
+            self.setup_projection()
+            self.invalidate()
+
+    def _require_context(self, action):
+        if self.render_thread:
+            raise RuntimeError(
+                f"{action} needs rendering on this thread, "
+                "call stop_render_thread() first"
+            )
+
+    def scissor_box(self, x, y, width, height):
+        """Pixel box for glScissor() of a rectangle in window coordinates"""
+        scale_x = self.target_size[0] / self.width
+        scale_y = self.target_size[1] / self.height
+        left = round(x * scale_x)
+        bottom = round((self.height - y - height) * scale_y)
+        return (
+            left,
+            bottom,
+            round((x + width) * scale_x) - left,
+            round((self.height - y) * scale_y) - bottom,
+        )
+
+    def invoke_callback(self, widget, callback, *args):
+        """Run a widget's user callback, watched when the watchdog is on.
+
+        Callbacks wrapped in Background are handed to a pool instead and the
+        widget stays busy until their result is processed.
+        """
+        if isinstance(callback, Background):
+            self.tasks.submit(widget, callback, *args)
+            self.invalidate()
+            return None
+        if self.watchdog:
+            with self.watchdog.callback_section(callback):
+                return callback(*args)
+        return callback(*args)
+
+    def _dispatch(self, widget, handler, *args):
+        """Call an event handler on a widget, timing it when profiling"""
+        if self.profiler:
+            return self.profiler.call_handler(widget, handler, *args)
+        return getattr(widget, handler)(*args)
+
     def on_window_resize(self, window, width, height):
         """Handle window resize events"""
         if width > 0 and height > 0:  # Prevent division by zero
@@ -40,14 +357,30 @@ class App:
             self.height = height
             self.setup_projection()
             self.update_layouts()
+            self.invalidate()
             print(f"Window resized to: {width}x{height}")  # Debug output
 
+    def on_framebuffer_resize(self, window, width, height):
+        """Handle framebuffer size changes, e.g. moving to a HiDPI monitor"""
+        if width > 0 and height > 0:
+            self.setup_projection()
+            self.invalidate()
+
     def setup_projection(self):
         """Update OpenGL projection matrix for new window size"""
-        gl.glViewport(0, 0, self.width, self.height)
+        self.fb_width, self.fb_height = glfw.get_framebuffer_size(self.window)
+        self.content_scale = self.fb_width / self.width
+        self.target_size = (self.fb_width, self.fb_height)
+        # The render thread applies the new size with its next frame
+        if not self.render_thread:
+            self.apply_projection(self.width, self.height, *self.target_size)
+
+    def apply_projection(self, width, height, fb_width, fb_height):
+        """Set viewport and projection for a window of the given sizes"""
+        gl.glViewport(0, 0, fb_width, fb_height)
         gl.glMatrixMode(gl.GL_PROJECTION)
         gl.glLoadIdentity()
-        gl.glOrtho(0, self.width, self.height, 0, -1, 1)
+        gl.glOrtho(0, width, height, 0, -1, 1)
         gl.glMatrixMode(gl.GL_MODELVIEW)
 
         # Clear the entire window to avoid black areas
@@ -55,35 +388,145 @@ class App:
         gl.glClear(gl.GL_COLOR_BUFFER_BIT)
 
     def on_mouse_click(self, window, button, action, mods):
-        if button == glfw.MOUSE_BUTTON_LEFT and action == glfw.PRESS:
-            x, y = glfw.get_cursor_pos(window)
-            self.focused_widget = None
+        if button != glfw.MOUSE_BUTTON_LEFT:
+            return
+
+        if action == glfw.PRESS:
+            if self.latency:
+                self.latency.stamp("click")
+            if self.input_replay is None:
+                self.cursor_x, self.cursor_y = glfw.get_cursor_pos(window)
+            x, y = self.cursor_x, self.cursor_y
 
-            for widget in self.widgets:
-                if hasattr(widget, "contains") and widget.contains(x, y):
-                    self.focused_widget = widget
-                    if hasattr(widget, "on_click"):
-                        widget.on_click()
-                    break
+            # Open popups get the click first; a click outside dismisses them
+            if self.overlays and self._overlay_click(x, y):
+                return
+
+            self.focused_widget = self.widget_at(x, y)
+            self.captured_widget = self.focused_widget
+            self.invalidate()
+
+            if self.focused_widget and hasattr(self.focused_widget, "on_click"):
+                self._dispatch(self.focused_widget, "on_click")
+
+        elif action == glfw.RELEASE:
+            # Deliver the final drag position before ending the capture
+            self.flush_mouse_move()
+            widget = self.captured_widget
+            self.captured_widget = None
+            if widget and hasattr(widget, "on_mouse_release"):
+                self._dispatch(widget, "on_mouse_release")
+
+    def _overlay_click(self, x, y):
+        """Route a press to the overlay layer, return True if it was consumed"""
+        overlay = self.overlay_at(x, y)
+        if overlay is not None:
+            self.focused_widget = overlay
+            self.captured_widget = overlay
+            self._dispatch(overlay, "on_click")
+            return True
+
+        dismissed = False
+        for overlay in list(self.overlays):
+            if hasattr(overlay, "on_overlay_dismiss"):
+                self._dispatch(overlay, "on_overlay_dismiss")
+                dismissed = True
+        return dismissed
 
     def on_mouse_move(self, window, x, y):
-        for widget in self.widgets:
-            if hasattr(widget, "on_mouse_move"):
-                widget.on_mouse_move(x, y)
+        self.cursor_x, self.cursor_y = x, y
+        if self.captured_widget and hasattr(self.captured_widget, "on_mouse_move"):
+            self._pending_move = (x, y)
+        elif self.overlays and hasattr(self.overlays[-1], "on_overlay_hover"):
+            # Hovering a popup only changes the overlay layer
+            self._dispatch(self.overlays[-1], "on_overlay_hover", x, y)
+
+    def flush_mouse_move(self):
+        """Send the latest coalesced cursor position to the captured widget"""
+        if self._pending_move is None:
+            return
+        x, y = self._pending_move
+        self._pending_move = None
+        if self.captured_widget and hasattr(self.captured_widget, "on_mouse_move"):
+            # A widget with an open overlay, e.g. a Slider showing its value
+            # tooltip, still draws itself in the cached main layer
+            self.invalidate()
+            self._dispatch(self.captured_widget, "on_mouse_move", x, y)
+
+    def on_scroll(self, window, dx, dy):
+        if self.input_replay is None:
+            self.cursor_x, self.cursor_y = glfw.get_cursor_pos(window)
+        x, y = self.cursor_x, self.cursor_y
+
+        overlay = self.overlay_at(x, y)
+        if overlay is not None and hasattr(overlay, "on_scroll"):
+            self._dispatch(overlay, "on_scroll", dx, dy)
+            return
+
+        # Widgets inside layouts scroll too, e.g. a List on a TabView page
+        widget = self.widget_at(x, y)
+        if widget is not None and hasattr(widget, "on_scroll"):
+            self.invalidate()
+            self._dispatch(widget, "on_scroll", dx, dy)
 
     def on_key_press(self, window, key, scancode, action, mods):
+        if self.latency and action != glfw.RELEASE:
+            self.latency.stamp("key")
+
+        if self.profiler and key == glfw.KEY_F3 and action == glfw.PRESS:
+            self.profiler.hud_visible = not self.profiler.hud_visible
+            return
+
         if self.focused_widget and hasattr(self.focused_widget, "on_key_press"):
-            self.focused_widget.on_key_press(key, action)
+            self.invalidate()
+            self._dispatch(self.focused_widget, "on_key_press", key, action)
 
     def on_char_input(self, window, char):
         if self.focused_widget and hasattr(self.focused_widget, "on_char_input"):
-            self.focused_widget.on_char_input(char)
+            self.invalidate()
+            self._dispatch(self.focused_widget, "on_char_input", char)
+
+    def widget_at(self, x, y):
+        """Return the widget under (x, y), descending into layouts"""
+        for widget in self.widgets:
+            if hasattr(widget, "visible") and not widget.visible:
+                continue
+            if hasattr(widget, "contains") and widget.contains(x, y):
+                if hasattr(widget, "widget_at"):
+                    return widget.widget_at(x, y) or widget
+                return widget
+        return None
+
+    def overlay_at(self, x, y):
+        """Return the top-most open popup under (x, y)"""
+        for overlay in reversed(self.overlays):
+            if hasattr(overlay, "overlay_contains") and overlay.overlay_contains(x, y):
+                return overlay
+        return None
 
     def add_widget(self, widget):
-        widget.app = self
+        if hasattr(widget, "set_app"):
+            widget.set_app(self)
+        else:
+            widget.app = self
         self.widgets.append(widget)
         return widget
 
+    def open_overlay(self, widget):
+        """Draw widget.draw_overlay() above all widgets until close_overlay()"""
+        if widget not in self.overlays:
+            self.overlays.append(widget)
+            self.invalidate()
+
+    def close_overlay(self, widget):
+        if widget in self.overlays:
+            self.overlays.remove(widget)
+            self.invalidate()
+
+    def invalidate(self):
+        """Mark the cached main layer as stale so it is redrawn next frame"""
+        self._main_layer_valid = False
+
     def update_layouts(self):
         """Update all layouts in the application"""
         for widget in self.widgets:
@@ -93,19 +536,200 @@ class App:
             if hasattr(widget, "update_from_window_size"):
                 widget.update_from_window_size(self.width, self.height)
 
+    def draw_widgets(self):
+        """Main pass: draw all visible widgets"""
+        for widget in self.widgets:
+            if hasattr(widget, "visible") and not widget.visible:
+                continue
+            if hasattr(widget, "draw"):
+                if self.profiler:
+                    self.profiler.draw_widget(widget)
+                else:
+                    widget.draw()
+
+    def draw_overlays(self):
+        """Overlay pass: draw open popups and tooltips, bottom to top"""
+        for overlay in self.overlays:
+            overlay.draw_overlay()
+
+    def _store_main_layer(self):
+        """Copy the freshly drawn main layer into a texture"""
+        size = self.target_size
+        if self._main_layer_texture is None:
+            self._main_layer_texture = gl.glGenTextures(1)
+
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self._main_layer_texture)
+        if self._main_layer_size != size:
+            for param in (gl.GL_TEXTURE_MIN_FILTER, gl.GL_TEXTURE_MAG_FILTER):
+                gl.glTexParameteri(gl.GL_TEXTURE_2D, param, gl.GL_NEAREST)
+            gl.glCopyTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGB, 0, 0, *size, 0)
+            self._main_layer_size = size
+        else:
+            gl.glCopyTexSubImage2D(gl.GL_TEXTURE_2D, 0, 0, 0, 0, 0, *size)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+
+    def _draw_main_layer(self):
+        """Draw the cached main layer as one textured quad"""
+        gl.glEnable(gl.GL_TEXTURE_2D)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self._main_layer_texture)
+        gl.glColor3f(1, 1, 1)
+
+        # Texture rows start at the bottom, the projection starts at the top
+        gl.glBegin(gl.GL_QUADS)
+        gl.glTexCoord2f(0, 1)
+        gl.glVertex2f(0, 0)
+        gl.glTexCoord2f(1, 1)
+        gl.glVertex2f(self.width, 0)
+        gl.glTexCoord2f(1, 0)
+        gl.glVertex2f(self.width, self.height)
+        gl.glTexCoord2f(0, 0)
+        gl.glVertex2f(0, self.height)
+        gl.glEnd()
+
+        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+        gl.glDisable(gl.GL_TEXTURE_2D)
+
+    def render_frame(self):
+        """Draw one frame: clear, main pass and overlay pass"""
+        measure = self.profiler.measure_pass if self.profiler else _no_measure
+        resolution = self.resolution
+        if resolution:
+            self.target_size = resolution.begin(self.fb_width, self.fb_height)
+
+        # Viewers need the commands of both layers, so they are recorded and
+        # replayed instead of drawn, and the main layer texture is not used
+        frame = self.record_frame() if self.remote else None
+
+        with measure("clear"):
+            gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+            self.backend.setup()  # Blending may have been left on by others
+
+        if frame is not None:
+            with measure("replay"):
+                replay(frame.commands, self.backend)
+        else:
+            with measure("widgets"):
+                if not self.overlays:
+                    self.draw_widgets()
+                elif self._main_layer_valid:
+                    self._draw_main_layer()
+                else:
+                    # Set first, so widgets that animate can invalidate it
+                    self._main_layer_valid = True
+                    self.draw_widgets()
+                    self._store_main_layer()
+
+        with measure("overlay" if frame is None else "hud"):
+            if frame is None:
+                self.draw_overlays()
+                self.tasks.draw()
+            if self.profiler and self.profiler.hud_visible:
+                self.profiler.draw_hud(self)
+
+        if frame is not None:
+            self.remote.send(frame)
+        if resolution:
+            if resolution.end():
+                self.invalidate()  # The cached main layer has the old size
+            self.target_size = (self.fb_width, self.fb_height)
+
+    def record_frame(self):
+        """Record the main pass and overlay pass into a Frame without drawing"""
+        measure = self.profiler.measure_pass if self.profiler else _no_measure
+        previous = set_backend(self.recorder)
+        try:
+            with measure("widgets"):
+                self.draw_widgets()
+            with measure("overlay"):
+                self.draw_overlays()
+                self.tasks.draw()
+        finally:
+            set_backend(previous)
+        # Without a render thread the tracker takes the events when presented
+        threaded = self.render_thread is not None
+        return Frame(
+            self.recorder.take(),
+            self.width,
+            self.height,
+            (self.fb_width, self.fb_height),
+            self.frame,
+            self.time(),
+            self.latency.take_pending() if self.latency and threaded else (),
+        )
+
+    def release_resources(self):
+        """Free cached GPU data of every widget, including hidden pages"""
+        for widget in (*self.widgets, *self.overlays):
+            if hasattr(widget, "release_resources"):
+                widget.release_resources()
+
     def run(self):
         """Start the main application loop"""
         while not glfw.window_should_close(self.window):
-            gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+            profiler = self.profiler
+            section = self.watchdog.section if self.watchdog else _no_section
+            pacer = self.pacer
+            render_thread = self.render_thread
 
-            # Draw all widgets
-            for widget in self.widgets:
-                if hasattr(widget, "visible") and not widget.visible:
-                    continue
-                if hasattr(widget, "draw"):
-                    widget.draw()
+            # In low-latency mode input is polled right before rendering
+            if pacer:
+                pacer.wait()
+            if profiler:
+                profiler.begin_frame()
+            start = time.perf_counter()
+            if pacer:
+                with section("events"):
+                    self.poll_events()
 
-            glfw.swap_buffers(self.window)
-            glfw.poll_events()
+            # Swap is left out, it blocks on vsync and is not a stall
+            with section("frame"):
+                if self.tasks.process(self.invoke_callback):
+                    self.invalidate()
+                if self.bindings.flush():
+                    self.invalidate()
+                self.flush_mouse_move()
+                if render_thread:
+                    frame = self.record_frame()
+                    if self.remote:
+                        self.remote.send(frame)
+                else:
+                    self.render_frame()
+                    if self.capture:
+                        self.capture.read(
+                            self.fb_width, self.fb_height, self.frame, self.time()
+                        )
+            if pacer:
+                pacer.rendered(start)
+
+            if render_thread:
+                # Waits while the render thread is a frame behind, not for vsync
+                render_thread.submit(frame)
+            elif profiler:
+                with profiler.measure_pass("swap"):
+                    glfw.swap_buffers(self.window)
+            else:
+                glfw.swap_buffers(self.window)
+
+            if self.latency and render_thread:
+                for events, presented_at in render_thread.presented():
+                    self.latency.record(events, presented_at)
+            elif self.latency:
+                self.latency.presented()
+            if pacer:
+                pacer.presented()
+            else:
+                with section("events"):
+                    self.poll_events()
+
+            if profiler:
+                profiler.end_frame()
+            self.frame += 1
 
+        self.disable_watchdog()
+        self.stop_render_thread()
+        self.stop_capture()
+        self.stop_remote()
+        self.tasks.shutdown()
+        if self.resolution:
+            self.resolution.release()
         glfw.terminate()
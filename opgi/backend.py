@@ -0,0 +1,514 @@
+import math
+from itertools import pairwise
+
+import numpy as np
+
+try:
+    import OpenGL.GL as gl
+except ImportError:  # Only SoftwareBackend and RecordingBackend work then
+    gl = None
+
+from .text import HELVETICA_18, draw_text, glut_font_size, text_width
+
+
+def _advance(font):
+    """Approximate GLUT character width, the same for every character"""
+    return max(1, round(glut_font_size(font) * 0.55))
+
+
+def _arc(cx, cy, radius, start_angle, end_angle, step):
+    return [
+        (
+            cx + math.cos(math.radians(i)) * radius,
+            cy + math.sin(math.radians(i)) * radius,
+        )
+        for i in range(start_angle, end_angle, step)
+    ]
+
+
+def _rect_points(x, y, width, height):
+    return [(x, y), (x + width, y), (x + width, y + height), (x, y + height)]
+
+
+def _rounded_outline_points(x, y, width, height, radius):
+    return [
+        (x + radius, y),
+        (x + width - radius, y),
+        (x + width, y + radius),
+        (x + width, y + height - radius),
+        (x + width - radius, y + height),
+        (x + radius, y + height),
+        (x, y + height - radius),
+        (x, y + radius),
+    ]
+
+
+class GLBackend:
+    """Draws through OpenGL immediate mode into the current context.
+
+    ``retained`` tells widgets they may keep GPU objects such as display
+    lists and vertex buffers between frames.
+    """
+
+    retained = True
+
+    def __init__(self, app=None):
+        if gl is None:
+            raise ImportError("GLBackend needs PyOpenGL, SoftwareBackend does not")
+        self.app = app
+        self._translucent = False
+
+    def setup(self):
+        """Reset GL state the backend relies on, after context creation"""
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        gl.glDisable(gl.GL_BLEND)
+        self._translucent = False
+
+    # State
+    def set_color(self, r, g, b, a=1.0):
+        # Blending is only switched on while translucent colors are in use
+        translucent = a < 1
+        if translucent != self._translucent:
+            if translucent:
+                gl.glEnable(gl.GL_BLEND)
+                gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+            else:
+                gl.glDisable(gl.GL_BLEND)
+            self._translucent = translucent
+        if translucent:
+            gl.glColor4f(r, g, b, a)
+        else:
+            gl.glColor3f(r, g, b)
+
+    def set_line_width(self, width):
+        gl.glLineWidth(width)
+
+    # Shapes
+    def _vertices(self, mode, points):
+        gl.glBegin(mode)
+        for x, y in points:
+            gl.glVertex2f(x, y)
+        gl.glEnd()
+
+    def rect(self, x, y, width, height):
+        self._vertices(gl.GL_QUADS, _rect_points(x, y, width, height))
+
+    def rect_outline(self, x, y, width, height):
+        self._vertices(gl.GL_LINE_LOOP, _rect_points(x, y, width, height))
+
+    def rounded_rect(self, x, y, width, height, radius):
+        # Center, left and right rectangles
+        self.rect(x + radius, y, width - 2 * radius, height)
+        self.rect(x, y + radius, radius, height - 2 * radius)
+        self.rect(x + width - radius, y + radius, radius, height - 2 * radius)
+
+        # Four corners
+        self.pie(x + radius, y + radius, radius, 180, 270)
+        self.pie(x + width - radius, y + radius, radius, 270, 360)
+        self.pie(x + width - radius, y + height - radius, radius, 0, 90)
+        self.pie(x + radius, y + height - radius, radius, 90, 180)
+
+    def rounded_rect_outline(self, x, y, width, height, radius):
+        self.line_loop(_rounded_outline_points(x, y, width, height, radius))
+
+    def pie(self, cx, cy, radius, start_angle, end_angle):
+        """Filled circle sector between two angles in degrees"""
+        points = [(cx, cy), *_arc(cx, cy, radius, start_angle, end_angle + 1, 5)]
+        self._vertices(gl.GL_TRIANGLE_FAN, points)
+
+    def circle(self, cx, cy, radius):
+        self._vertices(gl.GL_TRIANGLE_FAN, _arc(cx, cy, radius, 0, 360, 10))
+
+    def circle_outline(self, cx, cy, radius):
+        self._vertices(gl.GL_LINE_LOOP, _arc(cx, cy, radius, 0, 360, 10))
+
+    def polygon(self, points):
+        """Filled convex polygon"""
+        self._vertices(gl.GL_POLYGON, points)
+
+    def lines(self, points):
+        """Separate line segments between consecutive pairs of points"""
+        self._vertices(gl.GL_LINES, points)
+
+    def line_strip(self, points):
+        if len(points) < 2:
+            return
+        if isinstance(points, np.ndarray):
+            gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+            gl.glVertexPointer(2, gl.GL_FLOAT, 0, np.ascontiguousarray(points, "f4"))
+            gl.glDrawArrays(gl.GL_LINE_STRIP, 0, len(points))
+            gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
+        else:
+            self._vertices(gl.GL_LINE_STRIP, points)
+
+    def line_loop(self, points):
+        self._vertices(gl.GL_LINE_LOOP, points)
+
+    def quads(self, vertices, colors):
+        """Many colored quads at once.
+
+        vertices is an (n * 4, 2) float32 array of quad corners, colors an
+        (n * 4, 3) or (n * 4, 4) float32 array with one color per corner.
+        Sequences of tuples work as well.
+        """
+        vertices = np.asarray(vertices, dtype=np.float32)
+        colors = np.asarray(colors, dtype=np.float32)
+        translucent = colors.shape[-1] == 4 and not self._translucent
+        if translucent:
+            gl.glEnable(gl.GL_BLEND)
+            gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+        gl.glEnableClientState(gl.GL_COLOR_ARRAY)
+        gl.glVertexPointer(2, gl.GL_FLOAT, 0, vertices)
+        gl.glColorPointer(colors.shape[-1], gl.GL_FLOAT, 0, colors)
+        gl.glDrawArrays(gl.GL_QUADS, 0, len(vertices))
+        gl.glDisableClientState(gl.GL_COLOR_ARRAY)
+        gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
+        if translucent:
+            gl.glDisable(gl.GL_BLEND)
+
+    # Text
+    def text(self, string, x, y, font=HELVETICA_18):
+        draw_text(string, x, y, font)
+
+    def text_width(self, string, font=HELVETICA_18):
+        return text_width(string, font)
+
+    # Clipping
+    def clip(self, x, y, width, height):
+        """Restrict drawing to a rectangle in window coordinates"""
+        gl.glEnable(gl.GL_SCISSOR_TEST)
+        if self.app:
+            gl.glScissor(*self.app.scissor_box(x, y, width, height))
+        else:
+            gl.glScissor(int(x), 0, int(width), int(height))
+
+    def unclip(self):
+        gl.glDisable(gl.GL_SCISSOR_TEST)
+
+
+class SoftwareBackend:
+    """Rasterizes on the CPU into ``pixels``, a height x width x 4 array.
+
+    Needs no GL context, which makes it useful for drawing tests, benchmarks
+    and machines without a display. A pixel is covered when its center is
+    inside a shape, so results are exact and repeatable but not antialiased.
+    Translucent colors are blended like GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA.
+    Text is drawn as one block per character with GLUT-like metrics.
+    """
+
+    retained = False
+
+    def __init__(self, width, height, background=(1, 1, 1, 1)):
+        self.width = width
+        self.height = height
+        self.pixels = np.empty((height, width, 4), dtype=np.float32)
+        self.clear(background)
+        self._color = np.array((0, 0, 0, 1), dtype=np.float32)
+        self._line_width = 1.0
+        self._clip = (0, 0, width, height)
+
+    def setup(self):
+        pass
+
+    def clear(self, color=(1, 1, 1, 1)):
+        self.pixels[:] = color
+
+    def to_uint8(self):
+        """The pixels as an 8-bit RGBA image, top row first"""
+        return (np.clip(self.pixels, 0, 1) * 255 + 0.5).astype(np.uint8)
+
+    def render(self, widgets):
+        """Draw widgets (anything with draw()) with this backend as current"""
+        previous = set_backend(self)
+        try:
+            for widget in widgets:
+                if getattr(widget, "visible", True):
+                    widget.draw()
+        finally:
+            set_backend(previous)
+        return self.pixels
+
+    # State
+    def set_color(self, r, g, b, a=1.0):
+        self._color = np.array((r, g, b, a), dtype=np.float32)
+
+    def set_line_width(self, width):
+        self._line_width = width
+
+    # Rasterization
+    def _fill(self, x0, y0, x1, y1, inside=None, color=None):
+        """Blend the color into pixels whose centers in the box pass inside"""
+        left, top, right, bottom = self._clip
+        # Pixel i is covered when its center i + 0.5 lies in [x0, x1)
+        left = max(left, math.ceil(x0 - 0.5))
+        top = max(top, math.ceil(y0 - 0.5))
+        right = min(right, math.ceil(x1 - 0.5))
+        bottom = min(bottom, math.ceil(y1 - 0.5))
+        if left >= right or top >= bottom:
+            return
+
+        color = self._color if color is None else color
+        region = self.pixels[top:bottom, left:right]
+        if inside is not None:
+            ys, xs = np.mgrid[top:bottom, left:right] + np.float32(0.5)
+            mask = inside(xs, ys)
+            if not mask.any():
+                return
+            region = region[mask]
+        alpha = color[3]
+        blended = region * (1 - alpha)
+        blended[..., :3] += color[:3] * alpha
+        blended[..., 3] += alpha
+        if inside is not None:
+            self.pixels[top:bottom, left:right][mask] = blended
+        else:
+            region[:] = blended
+
+    def _stroke(self, segments):
+        """Draw line segments as one shape, so joints are not blended twice.
+
+        The pen is a square of the line width. It covers the pixels whose
+        center is within [-half, half) of the segment on both axes, so a one
+        pixel line on integer coordinates is one pixel wide.
+        """
+        if not segments:
+            return
+        points = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+        half = max(self._line_width, 1.0) / 2
+        xs = points[:, 0::2]
+        ys = points[:, 1::2]
+
+        def inside(px, py):
+            mask = np.zeros(px.shape, dtype=bool)
+            left, top = px[0, 0] - 0.5, py[0, 0] - 0.5
+            for ax, ay, bx, by in points:
+                # Only test the pixels around this segment
+                cols = slice(
+                    max(0, math.ceil(min(ax, bx) - half - 0.5 - left)),
+                    max(0, math.ceil(max(ax, bx) + half - 0.5 - left)),
+                )
+                rows = slice(
+                    max(0, math.ceil(min(ay, by) - half - 0.5 - top)),
+                    max(0, math.ceil(max(ay, by) + half - 0.5 - top)),
+                )
+                sx, sy = px[rows, cols], py[rows, cols]
+                dx, dy = bx - ax, by - ay
+                length = dx * dx + dy * dy or 1.0
+                t = np.clip(((sx - ax) * dx + (sy - ay) * dy) / length, 0, 1)
+                ex = sx - ax - t * dx
+                ey = sy - ay - t * dy
+                mask[rows, cols] |= (
+                    (-half <= ex) & (ex < half) & (-half <= ey) & (ey < half)
+                )
+            return mask
+
+        self._fill(
+            xs.min() - half, ys.min() - half, xs.max() + half, ys.max() + half, inside
+        )
+
+    def _polygon_fill(self, points, color=None):
+        points = np.asarray(points, dtype=np.float64)
+        if len(points) < 3:
+            return
+        following = np.roll(points, -1, axis=0)
+
+        def inside(px, py):
+            # Even-odd rule: count edges crossed by a ray to the right
+            mask = np.zeros(px.shape, dtype=bool)
+            for (ax, ay), (bx, by) in zip(points, following):
+                if ay == by:
+                    continue
+                spans = (ay > py) != (by > py)
+                mask ^= spans & (px < ax + (py - ay) * (bx - ax) / (by - ay))
+            return mask
+
+        x0, y0 = points.min(axis=0)
+        x1, y1 = points.max(axis=0)
+        self._fill(x0, y0, x1, y1, inside, color)
+
+    # Shapes
+    def rect(self, x, y, width, height):
+        self._fill(x, y, x + width, y + height)
+
+    def rect_outline(self, x, y, width, height):
+        self.line_loop(_rect_points(x, y, width, height))
+
+    def rounded_rect(self, x, y, width, height, radius):
+        radius = max(0.0, min(radius, width / 2, height / 2))
+
+        def inside(px, py):
+            qx = np.clip(px, x + radius, x + width - radius)
+            qy = np.clip(py, y + radius, y + height - radius)
+            return (px - qx) ** 2 + (py - qy) ** 2 <= radius**2
+
+        self._fill(x, y, x + width, y + height, inside)
+
+    def rounded_rect_outline(self, x, y, width, height, radius):
+        self.line_loop(_rounded_outline_points(x, y, width, height, radius))
+
+    def pie(self, cx, cy, radius, start_angle, end_angle):
+        self._polygon_fill(
+            [(cx, cy), *_arc(cx, cy, radius, start_angle, end_angle + 1, 5)]
+        )
+
+    def circle(self, cx, cy, radius):
+        def inside(px, py):
+            return (px - cx) ** 2 + (py - cy) ** 2 <= radius**2
+
+        self._fill(cx - radius, cy - radius, cx + radius, cy + radius, inside)
+
+    def circle_outline(self, cx, cy, radius):
+        self.line_loop(_arc(cx, cy, radius, 0, 360, 10))
+
+    def polygon(self, points):
+        self._polygon_fill(points)
+
+    def lines(self, points):
+        points = list(points)
+        self._stroke([(*a, *b) for a, b in zip(points[0::2], points[1::2])])
+
+    def line_strip(self, points):
+        points = [tuple(point) for point in points]
+        self._stroke([(*a, *b) for a, b in pairwise(points)])
+
+    def line_loop(self, points):
+        points = [tuple(point) for point in points]
+        self._stroke([(*a, *b) for a, b in pairwise(points + points[:1])])
+
+    def quads(self, vertices, colors):
+        # One color per quad, the average of its corners
+        corners = np.asarray(vertices, dtype=np.float64).reshape(-1, 4, 2)
+        colors = np.asarray(colors, dtype=np.float32).reshape(len(corners), 4, -1)
+        colors = colors.mean(axis=1)
+        if colors.shape[1] == 3:
+            colors = np.column_stack((colors, np.ones(len(colors), np.float32)))
+        for quad, color in zip(corners, colors):
+            (x0, y0), (x1, y1) = quad.min(axis=0), quad.max(axis=0)
+            if len({*quad[:, 0]}) <= 2 and len({*quad[:, 1]}) <= 2:
+                self._fill(x0, y0, x1, y1, color=color)  # Axis-aligned
+            else:
+                self._polygon_fill(quad, color)
+
+    # Text
+    def text(self, string, x, y, font=HELVETICA_18):
+        advance = _advance(font)
+        height = round(glut_font_size(font) * 0.7)
+        for i, char in enumerate(string):
+            if not char.isspace():
+                left = x + i * advance
+                self._fill(left, y - height, left + advance - 1, y)
+
+    def text_width(self, string, font=HELVETICA_18):
+        return len(string) * _advance(font)
+
+    # Clipping
+    def clip(self, x, y, width, height):
+        self._clip = (
+            max(0, math.ceil(x - 0.5)),
+            max(0, math.ceil(y - 0.5)),
+            min(self.width, math.ceil(x + width - 0.5)),
+            min(self.height, math.ceil(y + height - 0.5)),
+        )
+
+    def unclip(self):
+        self._clip = (0, 0, self.width, self.height)
+
+
+# Backend methods that draw or change drawing state, see RecordingBackend
+COMMANDS = (
+    "set_color",
+    "set_line_width",
+    "rect",
+    "rect_outline",
+    "rounded_rect",
+    "rounded_rect_outline",
+    "pie",
+    "circle",
+    "circle_outline",
+    "polygon",
+    "lines",
+    "line_strip",
+    "line_loop",
+    "quads",
+    "text",
+    "clip",
+    "unclip",
+)
+
+
+def _freeze(value):
+    if isinstance(value, np.ndarray):
+        value = value.copy()
+        value.flags.writeable = False
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class RecordingBackend:
+    """Records drawing calls into a command list instead of drawing.
+
+    Every call is stored as ``(name, args)``. Lists become tuples and arrays
+    are copied read-only, so a taken list stays the same while widgets keep
+    changing and can be replayed on another thread. Text is still measured
+    right away, since widgets lay out text while drawing: with ``measure``,
+    usually the text_width() of the backend that replays the commands, or
+    else with the approximate metrics of SoftwareBackend.
+    """
+
+    retained = False
+
+    def __init__(self, measure=None):
+        self._commands = []
+        self._measure = measure
+
+    def setup(self):
+        pass
+
+    def __getattr__(self, name):
+        if name not in COMMANDS:
+            raise AttributeError(name)
+
+        def record(*args):
+            self._commands.append((name, _freeze(args)))
+
+        # Cache the recorder so later lookups skip __getattr__
+        setattr(self, name, record)
+        return record
+
+    def text_width(self, string, font=HELVETICA_18):
+        if self._measure is not None:
+            return self._measure(string, font)
+        return len(string) * _advance(font)
+
+    def take(self):
+        """Return the commands recorded so far as a tuple and start over"""
+        commands = tuple(self._commands)
+        self._commands = []
+        return commands
+
+
+def replay(commands, backend):
+    """Draw a command list from a RecordingBackend with backend"""
+    for name, args in commands:
+        getattr(backend, name)(*args)
+
+
+_current = None
+
+
+def current():
+    """The backend widgets draw through, a GLBackend unless set otherwise"""
+    global _current
+    if _current is None:
+        _current = GLBackend()
+    return _current
+
+
+def set_backend(backend):
+    """Make widgets draw through backend; returns the previous backend"""
+    global _current
+    previous, _current = _current, backend
+    return previous
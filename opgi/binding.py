@@ -0,0 +1,283 @@
+import threading
+
+
+class BindingScheduler:
+    """Collects changed observables and notifies their subscribers in batches.
+
+    Changing an observable only marks it dirty; flush() then notifies every
+    dirty observable once, with its final state. App.run flushes once per
+    frame, so any number of updates within a frame cost a single widget
+    update and a single redraw.
+    """
+
+    def __init__(self):
+        self._dirty = {}  # Insertion ordered set of observables
+        self._lock = threading.Lock()
+
+    def mark(self, observable):
+        with self._lock:
+            self._dirty[observable] = None
+
+    def flush(self):
+        """Notify subscribers of everything changed since the last flush.
+
+        Returns True if any subscriber was notified.
+        """
+        notified = False
+        # Subscribers may change observables again; those go to the next pass
+        for _ in range(10):
+            with self._lock:
+                dirty, self._dirty = self._dirty, {}
+            if not dirty:
+                break
+            for observable in dirty:
+                notified = observable._notify() or notified
+        return notified
+
+
+default_scheduler = BindingScheduler()
+
+
+class Observable:
+    """A value that widgets can be bound to.
+
+    Subscribers are called with the new value during the next flush, and
+    only if it differs (by ==) from the value they were last given.
+    """
+
+    __slots__ = ("_delivered", "_scheduler", "_subscribers", "_value")
+
+    _UNSET = object()
+
+    def __init__(self, value=None, scheduler=None):
+        self._value = value
+        self._delivered = self._UNSET
+        self._subscribers = []
+        self._scheduler = scheduler or default_scheduler
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+        self._scheduler.mark(self)
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self.value = value
+
+    def subscribe(self, callback, initial=True):
+        """Call callback(value) on every batched change, and now if initial"""
+        self._subscribers.append(callback)
+        if initial:
+            self._delivered = self._value
+            callback(self._value)
+        return callback
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def _notify(self):
+        value = self._value
+        if value is self._delivered or value == self._delivered:
+            return False
+        self._delivered = value
+        for callback in list(self._subscribers):
+            callback(value)
+        return True
+
+
+class ListChange:
+    """One contiguous change to an ObservableList.
+
+    ``kind`` is "insert" (items were inserted at index), "remove" (count
+    items were removed at index) or "replace" (items overwrote the ones at
+    index).
+    """
+
+    __slots__ = ("count", "index", "items", "kind")
+
+    def __init__(self, kind, index, items=(), count=0):
+        self.kind = kind
+        self.index = index
+        self.items = list(items)
+        self.count = count if kind == "remove" else len(self.items)
+
+    def merge(self, other):
+        """Fold other into this change if they touch adjacent ranges"""
+        if other.kind != self.kind:
+            return False
+        if self.kind in ("insert", "replace"):
+            if other.index == self.index + self.count:
+                self.items.extend(other.items)
+                self.count = len(self.items)
+                return True
+            return False
+        # Removing forwards (delete) or backwards (backspace) from a range
+        if other.index == self.index:
+            self.count += other.count
+            return True
+        if other.index + other.count == self.index:
+            self.index = other.index
+            self.count += other.count
+            return True
+        return False
+
+    def __repr__(self):
+        if self.kind == "remove":
+            return f"ListChange(remove, {self.index}, count={self.count})"
+        return f"ListChange({self.kind}, {self.index}, {self.items!r})"
+
+
+class ObservableList:
+    """A list that reports batched range changes instead of full replacement.
+
+    Subscribers are called during flush with the list of ListChange objects
+    recorded since the last flush, already merged where ranges touch, e.g.
+    1,000 appends arrive as one insert.
+    """
+
+    __slots__ = ("_changes", "_items", "_scheduler", "_subscribers")
+
+    def __init__(self, items=(), scheduler=None):
+        self._items = list(items)
+        self._changes = []
+        self._subscribers = []
+        self._scheduler = scheduler or default_scheduler
+
+    def _record(self, change):
+        if not self._changes or not self._changes[-1].merge(change):
+            self._changes.append(change)
+        self._scheduler.mark(self)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __setitem__(self, index, item):
+        index = range(len(self._items))[index]
+        self._items[index] = item
+        self._record(ListChange("replace", index, [item]))
+
+    def __delitem__(self, index):
+        index = range(len(self._items))[index]
+        del self._items[index]
+        self._record(ListChange("remove", index, count=1))
+
+    def append(self, item):
+        self.insert(len(self._items), item)
+
+    def extend(self, items):
+        self.insert_range(len(self._items), items)
+
+    def insert(self, index, item):
+        self.insert_range(index, [item])
+
+    def insert_range(self, index, items):
+        items = list(items)
+        if not items:
+            return
+        index = max(0, min(index, len(self._items)))
+        self._items[index:index] = items
+        self._record(ListChange("insert", index, items))
+
+    def remove_range(self, index, count):
+        count = min(count, len(self._items) - index)
+        if count <= 0:
+            return
+        del self._items[index : index + count]
+        self._record(ListChange("remove", index, count=count))
+
+    def pop(self, index=-1):
+        index = range(len(self._items))[index]
+        item = self._items[index]
+        self.remove_range(index, 1)
+        return item
+
+    def remove(self, item):
+        self.remove_range(self._items.index(item), 1)
+
+    def clear(self):
+        self.remove_range(0, len(self._items))
+
+    def subscribe(self, callback, initial=True):
+        """Call callback(changes) on every batch; initially as one insert"""
+        # The snapshot already contains pending changes, so deliver those to
+        # the existing subscribers now instead of to the new one again later
+        self._notify()
+        self._subscribers.append(callback)
+        if initial and self._items:
+            callback([ListChange("insert", 0, self._items)])
+        return callback
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def _notify(self):
+        changes, self._changes = self._changes, []
+        if not changes:
+            return False
+        for callback in list(self._subscribers):
+            callback(changes)
+        return True
+
+
+class Binding:
+    """A subscription that keeps a widget in sync; unbind() stops it"""
+
+    __slots__ = ("callback", "source")
+
+    def __init__(self, source, callback):
+        self.source = source
+        self.callback = callback
+
+    def unbind(self):
+        self.source.unsubscribe(self.callback)
+
+
+def bind(widget, attribute, observable, transform=None):
+    """Keep widget.<attribute> equal to observable.value.
+
+    Uses the widget's set_<attribute>() method when it has one, e.g.
+    ProgressBar.set_value, so clamping and animation still apply.
+    """
+    setter = getattr(widget, f"set_{attribute}", None)
+
+    def update(value):
+        if transform is not None:
+            value = transform(value)
+        if setter is not None:
+            setter(value)
+        else:
+            setattr(widget, attribute, value)
+
+    return Binding(observable, observable.subscribe(update))
+
+
+def bind_items(widget, observable_list):
+    """Mirror an ObservableList into a List widget by applying its diffs.
+
+    The widget gets its own copy of the items; each batch is applied as
+    range insertions and removals, so the selection stays on its item.
+    """
+    widget.clear()
+
+    def update(changes):
+        for change in changes:
+            if change.kind == "insert":
+                widget.insert_items(change.index, change.items)
+            elif change.kind == "remove":
+                widget.remove_items(change.index, change.count)
+            else:
+                widget.replace_items(change.index, change.items)
+
+    return Binding(observable_list, observable_list.subscribe(update))
@@ -0,0 +1,262 @@
+import ctypes
+import logging
+import queue
+import subprocess
+import threading
+from collections import deque
+
+import numpy as np
+
+try:
+    import OpenGL.GL as gl
+except ImportError:  # Sinks work without PyOpenGL, FrameCapture does not
+    gl = None
+
+logger = logging.getLogger("opgi.capture")
+
+
+class RawFileSink:
+    """Writes frames as raw RGBA bytes, top row first, one after another.
+
+    Play back with e.g.
+    ``ffplay -f rawvideo -pixel_format rgba -video_size WxH file``.
+    Frames of a different size than the first are skipped. close() must be
+    called when done, which a with block or App.stop_capture() does.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.size = None
+        self.frames = 0
+        # Written frame by frame from the capture thread until close()
+        self._file = open(path, "wb")  # noqa: SIM115
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, frame, index, timestamp):
+        size = frame.shape[1], frame.shape[0]
+        if self.size is None:
+            self.size = size
+        elif size != self.size:
+            return
+        self._file.write(frame.data)
+        self.frames += 1
+
+    def close(self):
+        self._file.close()
+
+
+class FFmpegSink:
+    """Pipes frames into an ffmpeg process that encodes them to path.
+
+    ffmpeg is started with the size of the first frame; frames of a
+    different size are skipped. ``output_args`` go before the output path,
+    the default encodes H.264 in a pixel format most players accept.
+    """
+
+    def __init__(
+        self, path, fps=60, ffmpeg="ffmpeg", output_args=("-pix_fmt", "yuv420p")
+    ):
+        self.path = path
+        self.fps = fps
+        self.ffmpeg = ffmpeg
+        self.output_args = list(output_args)
+        self.size = None
+        self.frames = 0
+        self._process = None
+
+    def write(self, frame, index, timestamp):
+        size = frame.shape[1], frame.shape[0]
+        if self._process is None:
+            self.size = size
+            self._process = subprocess.Popen(
+                [
+                    self.ffmpeg,
+                    "-loglevel",
+                    "error",
+                    "-y",
+                    "-f",
+                    "rawvideo",
+                    "-pix_fmt",
+                    "rgba",
+                    "-s",
+                    f"{size[0]}x{size[1]}",
+                    "-r",
+                    str(self.fps),
+                    "-i",
+                    "-",
+                    *self.output_args,
+                    self.path,
+                ],
+                stdin=subprocess.PIPE,
+            )
+        elif size != self.size:
+            return
+        self._process.stdin.write(frame.data)
+        self.frames += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._process is not None:
+            self._process.stdin.close()
+            self._process.wait()
+            self._process = None
+
+
+class _CallbackSink:
+    def __init__(self, callback):
+        self.callback = callback
+
+    def write(self, frame, index, timestamp):
+        self.callback(frame, index, timestamp)
+
+    def close(self):
+        pass
+
+
+class _Slot:
+    __slots__ = ("buffer", "fence", "frame", "size", "time")
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.size = None
+        self.fence = None
+        self.frame = 0
+        self.time = 0.0
+
+
+class FrameCapture:
+    """Reads rendered frames back without stalling the GPU.
+
+    Each captured frame is copied into the next of ``ring`` pixel buffer
+    objects, which the GPU does asynchronously. Buffers are mapped into
+    NumPy arrays only once their fence has signaled, usually one or two
+    frames later, and handed to the sink on a separate thread. The sink
+    gets ``(frame, index, timestamp)`` with frame as a height x width x 4
+    uint8 RGBA array, top row first.
+
+    Frames are skipped rather than waited for: when every buffer is still
+    in flight the new frame is not read (``skipped``), and when the sink
+    is more than ``max_queue`` frames behind the new frame is not queued
+    (``dropped``). With ``every`` only every n-th frame is captured.
+    """
+
+    def __init__(self, sink, ring=3, max_queue=8, every=1):
+        if ring < 1:
+            raise ValueError("FrameCapture needs at least one buffer")
+        self.sink = sink if hasattr(sink, "write") else _CallbackSink(sink)
+        self.every = every
+        self.captured = 0
+        self.skipped = 0
+        self.dropped = 0
+        self.failed = False
+        # glGenBuffers() returns a scalar for a single buffer
+        buffers = np.atleast_1d(gl.glGenBuffers(ring))
+        self._slots = [_Slot(int(buffer)) for buffer in buffers]
+        self._next = 0
+        self._pending = deque()  # Slots read into but not mapped, oldest first
+        self._queue = queue.Queue(max_queue)
+        self._thread = threading.Thread(
+            target=self._consume, name="opgi-capture", daemon=True
+        )
+        self._thread.start()
+
+    def read(self, width, height, frame, timestamp):
+        """Start reading back the frame in the current back buffer"""
+        self._collect()
+        if frame % self.every:
+            return
+        slot = self._slots[self._next]
+        if slot.fence is not None:
+            self.skipped += 1
+            return
+
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, slot.buffer)
+        if slot.size != (width, height):
+            gl.glBufferData(
+                gl.GL_PIXEL_PACK_BUFFER, width * height * 4, None, gl.GL_STREAM_READ
+            )
+            slot.size = (width, height)
+        gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+        gl.glReadPixels(
+            0, 0, width, height, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, ctypes.c_void_p(0)
+        )
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+
+        slot.fence = gl.glFenceSync(gl.GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        slot.frame = frame
+        slot.time = timestamp
+        self._pending.append(slot)
+        self._next = (self._next + 1) % len(self._slots)
+
+    def _collect(self, timeout_ns=0):
+        """Map every finished buffer, in the order they were read into"""
+        while self._pending:
+            slot = self._pending[0]
+            status = gl.glClientWaitSync(
+                slot.fence, gl.GL_SYNC_FLUSH_COMMANDS_BIT, timeout_ns
+            )
+            if status not in (gl.GL_ALREADY_SIGNALED, gl.GL_CONDITION_SATISFIED):
+                return
+            self._pending.popleft()
+            gl.glDeleteSync(slot.fence)
+            slot.fence = None
+            self._deliver(self._map(slot), slot.frame, slot.time)
+
+    def _map(self, slot):
+        width, height = slot.size
+        size = width * height * 4
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, slot.buffer)
+        address = gl.glMapBufferRange(
+            gl.GL_PIXEL_PACK_BUFFER, 0, size, gl.GL_MAP_READ_BIT
+        )
+        data = ctypes.cast(address, ctypes.POINTER(ctypes.c_ubyte * size)).contents
+        pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)
+        # GL rows start at the bottom; the copy also detaches from the mapping
+        frame = np.ascontiguousarray(pixels[::-1])
+        gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        return frame
+
+    def _deliver(self, frame, index, timestamp):
+        if self.failed:
+            return
+        try:
+            self._queue.put_nowait((frame, index, timestamp))
+            self.captured += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def _consume(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if self.failed:
+                continue
+            try:
+                self.sink.write(*item)
+            except Exception:
+                # A broken sink (e.g. ffmpeg exited) would fail every frame
+                logger.exception("Capture sink failed, dropping further frames")
+                self.failed = True
+
+    def stop(self):
+        """Deliver the frames still in flight, then close the sink"""
+        self._collect(timeout_ns=1_000_000_000)
+        for slot in self._pending:
+            gl.glDeleteSync(slot.fence)
+        self._pending.clear()
+        gl.glDeleteBuffers(len(self._slots), [slot.buffer for slot in self._slots])
+        self._queue.put(None)
+        self._thread.join()
+        self.sink.close()
@@ -0,0 +1,287 @@
+import numpy as np
+
+from .widgets import Widget
+
+
+class CellView:
+    """Lightweight view of a single cell stored inside a CellGrid.
+
+    Views expose the usual widget attributes (x, y, width, height, visible)
+    but read and write straight through to the grid arrays, so creating one
+    is cheap and nothing is duplicated per cell.
+    """
+
+    __slots__ = ("grid", "index")
+
+    def __init__(self, grid, index):
+        self.grid = grid
+        self.index = index
+
+    @property
+    def x(self):
+        return float(self.grid.xs[self.index])
+
+    @x.setter
+    def x(self, value):
+        self.grid.xs[self.index] = value
+
+    @property
+    def y(self):
+        return float(self.grid.ys[self.index])
+
+    @y.setter
+    def y(self, value):
+        self.grid.ys[self.index] = value
+
+    @property
+    def width(self):
+        return float(self.grid.widths[self.index])
+
+    @width.setter
+    def width(self, value):
+        self.grid.widths[self.index] = value
+
+    @property
+    def height(self):
+        return float(self.grid.heights[self.index])
+
+    @height.setter
+    def height(self, value):
+        self.grid.heights[self.index] = value
+
+    @property
+    def value(self):
+        return float(self.grid.values[self.index])
+
+    @value.setter
+    def value(self, value):
+        self.grid.set_value(self.index, value)
+
+    @property
+    def color(self):
+        return tuple(float(c) for c in self.grid.colors[self.index])
+
+    @color.setter
+    def color(self, color):
+        self.grid.colors[self.index] = color
+
+    @property
+    def visible(self):
+        return bool(self.grid.visible_mask[self.index])
+
+    @visible.setter
+    def visible(self, visible):
+        self.grid.visible_mask[self.index] = visible
+
+    @property
+    def app(self):
+        return self.grid.app
+
+    def contains(self, x, y):
+        return (
+            self.x <= x <= self.x + self.width and self.y <= y <= self.y + self.height
+        )
+
+
+class CellGrid(Widget):
+    """Array-backed grid of simple colored cells (heatmaps, status grids).
+
+    Geometry and state of every cell live in NumPy arrays instead of one
+    Python object per cell. Placement, hit-testing and culling are computed
+    vectorized and all visible cells are drawn with a single glDrawArrays call.
+    Use ``grid[i]`` to get a CellView for the regular widget-style API.
+    """
+
+    __slots__ = (
+        "_layout_slots",
+        "border_color",
+        "colors",
+        "cols",
+        "heights",
+        "high_color",
+        "low_color",
+        "on_cell_click",
+        "padding",
+        "rows",
+        "selected_index",
+        "spacing",
+        "values",
+        "visible_mask",
+        "widths",
+        "xs",
+        "ys",
+    )
+
+    def __init__(self, x=0, y=0, width=100, height=100, rows=2, cols=2, count=None):
+        super().__init__(x, y, width, height)
+        self.rows = rows
+        self.cols = cols
+        self.padding = 5
+        self.spacing = 1
+        self.selected_index = -1
+        self.on_cell_click = None
+
+        # Heatmap colors used by set_values
+        self.low_color = (0.26, 0.52, 0.96)
+        self.high_color = (0.96, 0.32, 0.26)
+        self.border_color = (0.82, 0.82, 0.84)
+
+        self._layout_slots = 0  # rows * cols of the last layout
+        self._allocate(rows * cols if count is None else count)
+        self.update_layout()
+
+    def _allocate(self, count):
+        self.xs = np.zeros(count, dtype=np.float32)
+        self.ys = np.zeros(count, dtype=np.float32)
+        self.widths = np.zeros(count, dtype=np.float32)
+        self.heights = np.zeros(count, dtype=np.float32)
+        self.values = np.zeros(count, dtype=np.float32)
+        self.colors = np.empty((count, 3), dtype=np.float32)
+        self.colors[:] = self.low_color
+        self.visible_mask = np.ones(count, dtype=bool)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError("cell index out of range")
+        return CellView(self, index % len(self))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield CellView(self, i)
+
+    def resize(self, count):
+        """Change the number of cells, keeping the state of existing ones"""
+        old = len(self)
+        keep = min(old, count)
+        arrays = (
+            self.values[:keep].copy(),
+            self.colors[:keep].copy(),
+            self.visible_mask[:keep].copy(),
+        )
+        self._allocate(count)
+        self.values[:keep], self.colors[:keep], self.visible_mask[:keep] = arrays
+        if self.selected_index >= count:
+            self.selected_index = -1
+        self.update_layout()
+
+    def set_value(self, index, value, low=0.0, high=1.0):
+        """Set a single cell value and update its heatmap color"""
+        self.values[index] = value
+        self.colors[index] = self._map_colors(np.float32(value), low, high)
+
+    def set_values(self, values, low=0.0, high=1.0):
+        """Set all cell values at once and map them to heatmap colors"""
+        self.values[:] = values
+        self.colors[:] = self._map_colors(self.values, low, high)
+
+    def _map_colors(self, values, low, high):
+        span = (high - low) or 1.0
+        factor = np.clip((values - low) / span, 0.0, 1.0)[..., None]
+        low_color = np.asarray(self.low_color, dtype=np.float32)
+        high_color = np.asarray(self.high_color, dtype=np.float32)
+        return low_color + (high_color - low_color) * factor
+
+    def update_layout(self):
+        """Place every cell on the grid in one vectorized pass"""
+        if not len(self) or self.rows <= 0 or self.cols <= 0:
+            return
+
+        total_row_spacing = self.spacing * (self.rows - 1)
+        total_col_spacing = self.spacing * (self.cols - 1)
+
+        cell_width = (self.width - total_col_spacing - (self.padding * 2)) / self.cols
+        cell_height = (self.height - total_row_spacing - (self.padding * 2)) / self.rows
+
+        index = np.arange(len(self))
+        row = index // self.cols
+        col = index % self.cols
+
+        self.xs[:] = self.x + self.padding + col * (cell_width + self.spacing)
+        self.ys[:] = self.y + self.padding + row * (cell_height + self.spacing)
+        self.widths[:] = cell_width
+        self.heights[:] = cell_height
+
+        # Cells beyond rows * cols have no slot, same as GridLayout. When the
+        # grid grows, the cells an earlier layout hid get their slot back.
+        slots = self.rows * self.cols
+        if slots > self._layout_slots:
+            self.visible_mask[self._layout_slots : slots] = True
+        self.visible_mask[slots:] = False
+        self._layout_slots = slots
+
+    def hit_test(self, x, y):
+        """Return the index of the visible cell under (x, y), or -1"""
+        hits = np.flatnonzero(
+            self.visible_mask
+            & (self.xs <= x)
+            & (x <= self.xs + self.widths)
+            & (self.ys <= y)
+            & (y <= self.ys + self.heights)
+        )
+        return int(hits[0]) if len(hits) else -1
+
+    def visible_indices(self, left=None, top=None, right=None, bottom=None):
+        """Return indices of visible cells intersecting the given rectangle.
+
+        The rectangle defaults to the application window.
+        """
+        if left is None:
+            left = 0
+        if top is None:
+            top = 0
+        if right is None:
+            right = self.app.width if self.app else self.x + self.width
+        if bottom is None:
+            bottom = self.app.height if self.app else self.y + self.height
+
+        return np.flatnonzero(
+            self.visible_mask
+            & (self.xs + self.widths >= left)
+            & (self.xs <= right)
+            & (self.ys + self.heights >= top)
+            & (self.ys <= bottom)
+        )
+
+    def draw(self):
+        indices = self.visible_indices()
+        if not len(indices):
+            return
+
+        x0 = self.xs[indices]
+        y0 = self.ys[indices]
+        x1 = x0 + self.widths[indices]
+        y1 = y0 + self.heights[indices]
+
+        # Four corners per cell, laid out as consecutive GL_QUADS vertices
+        vertices = np.empty((len(indices), 4, 2), dtype=np.float32)
+        vertices[:, 0] = np.column_stack((x0, y0))
+        vertices[:, 1] = np.column_stack((x1, y0))
+        vertices[:, 2] = np.column_stack((x1, y1))
+        vertices[:, 3] = np.column_stack((x0, y1))
+        colors = np.repeat(self.colors[indices], 4, axis=0)
+
+        self._draw_quads(vertices.reshape(-1, 2), colors)
+
+        # Outline of the selected cell
+        if (
+            0 <= self.selected_index < len(self)
+            and self.visible_mask[self.selected_index]
+        ):
+            cell = self[self.selected_index]
+            self._set_color(*self.border_color)
+            self._set_line_width(2)
+            self._draw_rect_outline(cell.x, cell.y, cell.width, cell.height)
+
+    def on_click(self):
+        x, y = self.app.cursor_x, self.app.cursor_y
+        index = self.hit_test(x, y)
+        if index < 0:
+            return False
+
+        self.selected_index = index
+        if self.on_cell_click:
+            self._invoke(self.on_cell_click, index)
+        return True
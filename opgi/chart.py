@@ -0,0 +1,330 @@
+import numpy as np
+
+try:
+    import OpenGL.GL as gl
+except ImportError:  # Vertex buffers are only used with GLBackend
+    gl = None
+
+from .backend import current
+from .text import HELVETICA_12
+from .widgets import Widget
+
+LEGEND_FONT = HELVETICA_12
+
+
+class Series:
+    """Fixed-size ring buffer of (time, value) points for one chart line.
+
+    Appending never allocates; once the buffer is full the oldest points are
+    overwritten. Points must be appended in increasing time order.
+    """
+
+    __slots__ = (
+        "_chart",
+        "_decimated",
+        "_decimated_key",
+        "_drawn_version",
+        "_vbo",
+        "_vertex_count",
+        "_vertices",
+        "color",
+        "count",
+        "name",
+        "start",
+        "times",
+        "values",
+        "version",
+    )
+
+    def __init__(self, name, capacity=100_000, color=(0.26, 0.52, 0.96)):
+        self.name = name
+        self.color = color
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.start = 0
+        self.count = 0
+        self.version = 0  # Bumped on every change so charts know to re-decimate
+        self._vbo = None
+        self._vertices = None  # Last decimated line strip, for non-GL backends
+        self._vertex_count = 0
+        self._drawn_version = -1
+        self._decimated = None  # (columns_x, lows, highs) for _decimated_key
+        self._decimated_key = None
+        self._chart = None  # Set by Chart.add_series()
+
+    @property
+    def capacity(self):
+        return len(self.times)
+
+    def __len__(self):
+        return self.count
+
+    def append(self, t, value):
+        end = (self.start + self.count) % self.capacity
+        self.times[end] = t
+        self.values[end] = value
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+        self._changed()
+
+    def extend(self, times, values):
+        """Append many points at once without a Python loop"""
+        times = np.asarray(times, dtype=np.float64)[-self.capacity :]
+        values = np.asarray(values, dtype=np.float64)[-self.capacity :]
+        n = len(times)
+        if not n:
+            return
+
+        end = (self.start + self.count) % self.capacity
+        first = min(n, self.capacity - end)
+        self.times[end : end + first] = times[:first]
+        self.values[end : end + first] = values[:first]
+        self.times[: n - first] = times[first:]
+        self.values[: n - first] = values[first:]
+
+        overflow = max(0, self.count + n - self.capacity)
+        self.count = min(self.capacity, self.count + n)
+        self.start = (self.start + overflow) % self.capacity
+        self._changed()
+
+    def clear(self):
+        self.start = 0
+        self.count = 0
+        self._changed()
+
+    def _changed(self):
+        self.version += 1
+        if self._chart is not None:
+            self._chart.invalidate()  # Redraw, also below an open overlay
+
+    def data(self):
+        """Return (times, values) in chronological order"""
+        end = self.start + self.count
+        if end <= self.capacity:
+            return self.times[self.start : end], self.values[self.start : end]
+        wrap = end - self.capacity
+        return (
+            np.concatenate((self.times[self.start :], self.times[:wrap])),
+            np.concatenate((self.values[self.start :], self.values[:wrap])),
+        )
+
+
+def decimate_min_max(times, values, t0, t1, columns):
+    """Reduce points to at most one min/max pair per horizontal pixel column.
+
+    Returns ``(columns_x, lows, highs)`` where columns_x is the pixel column
+    of every non-empty bucket.
+    """
+    # Times are sorted, so the window is a slice found by binary search and
+    # the whole buffer is used as is when it already lies inside
+    if len(times) and (times[0] < t0 or times[-1] > t1):
+        lo = np.searchsorted(times, t0, side="left")
+        hi = np.searchsorted(times, t1, side="right")
+        times = times[lo:hi]
+        values = values[lo:hi]
+    if not len(times):
+        return np.empty(0), np.empty(0), np.empty(0)
+
+    span = (t1 - t0) or 1.0
+    buckets = ((times - t0) / span * (columns - 1)).astype(np.int64)
+    buckets = np.clip(buckets, 0, columns - 1)
+
+    # Times are sorted, so every bucket is a contiguous run of points
+    starts = np.flatnonzero(np.diff(buckets, prepend=-1))
+    lows = np.minimum.reduceat(values, starts)
+    highs = np.maximum.reduceat(values, starts)
+    return buckets[starts], lows, highs
+
+
+class Chart(Widget):
+    """Streaming time-series chart.
+
+    Every series keeps its points in a ring buffer. Before drawing, points
+    are decimated to one min/max pair per horizontal pixel and uploaded to a
+    vertex buffer, so drawing cost depends on the chart width and not on
+    the number or rate of points. Decimation is skipped on frames where no
+    series changed and the view did not move, and otherwise only the series
+    that changed are decimated again. Backends without retained GPU state
+    draw the decimated line strips directly.
+    """
+
+    __slots__ = (
+        "_layout_key",
+        "bg_color",
+        "grid_color",
+        "line_width",
+        "series",
+        "time_span",
+        "y_max",
+        "y_min",
+    )
+
+    def __init__(self, x, y, width, height, time_span=None, y_min=None, y_max=None):
+        super().__init__(x, y, width, height)
+        self.series = {}
+        self.time_span = time_span  # Seconds shown, None shows the whole buffer
+        self.y_min = y_min  # None means autoscale
+        self.y_max = y_max
+        self.bg_color = (1, 1, 1)
+        self.grid_color = (0.92, 0.92, 0.94)
+        self.line_width = 1.5
+        self._layout_key = None
+
+    def add_series(self, name, capacity=100_000, color=(0.26, 0.52, 0.96)):
+        series = Series(name, capacity, color)
+        series._chart = self
+        self.series[name] = series
+        return series
+
+    def append(self, name, value, t=None):
+        """Append a point to a series, using the current time by default"""
+        self.series[name].append(self._time() if t is None else t, value)
+
+    def extend(self, name, times, values):
+        self.series[name].extend(times, values)
+
+    def _time_range(self):
+        t1 = max(
+            (
+                s.times[(s.start + s.count - 1) % s.capacity]
+                for s in self.series.values()
+                if s.count
+            ),
+            default=0.0,
+        )
+        if self.time_span is not None:
+            return t1 - self.time_span, t1
+        t0 = min(
+            (s.times[s.start] for s in self.series.values() if s.count),
+            default=0.0,
+        )
+        return t0, t1
+
+    def _value_range(self, decimated):
+        y_min, y_max = self.y_min, self.y_max
+        if y_min is None:
+            y_min = min(
+                (lows.min() for _, lows, _ in decimated if len(lows)), default=0.0
+            )
+        if y_max is None:
+            y_max = max(
+                (highs.max() for _, _, highs in decimated if len(highs)), default=1.0
+            )
+        if y_max == y_min:
+            y_max = y_min + 1.0
+        return y_min, y_max
+
+    def draw(self):
+        # Background and grid
+        self._set_color(*self.bg_color)
+        self._draw_rect(self.x, self.y, self.width, self.height)
+
+        self._set_color(*self.grid_color)
+        for i in range(1, 4):
+            self._draw_rect(self.x, self.y + self.height * i / 4, self.width, 1)
+
+        columns = max(1, int(self.width))
+        t0, t1 = self._time_range()
+
+        # Re-decimate only when data, time window, size or backend changed
+        layout_key = (
+            columns,
+            self.height,
+            self.x,
+            self.y,
+            t0,
+            t1,
+            self.y_min,
+            self.y_max,
+            current().retained,
+        )
+        if layout_key != self._layout_key or any(
+            s.version != s._drawn_version for s in self.series.values()
+        ):
+            self._upload(t0, t1, columns)
+            self._layout_key = layout_key
+
+        self._set_line_width(self.line_width)
+        if current().retained:
+            self._draw_buffers()
+        else:
+            for s in self.series.values():
+                if s._vertex_count >= 2:
+                    self._set_color(*s.color)
+                    self._draw_line_strip(s._vertices)
+
+        # Border and legend
+        self._set_color(0.82, 0.82, 0.84)
+        self._set_line_width(1)
+        self._draw_rect_outline(self.x, self.y, self.width, self.height)
+
+        legend_x = self.x + 8
+        for s in self.series.values():
+            self._set_color(*s.color)
+            self._draw_text(s.name, legend_x, self.y + 16, LEGEND_FONT)
+            legend_x += self._text_width(s.name, LEGEND_FONT) + 12
+
+    def _draw_buffers(self):
+        gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+        for s in self.series.values():
+            if s._vertex_count < 2:
+                continue
+            self._set_color(*s.color)
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, s._vbo)
+            gl.glVertexPointer(2, gl.GL_FLOAT, 0, None)
+            gl.glDrawArrays(gl.GL_LINE_STRIP, 0, s._vertex_count)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+        gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
+
+    def release_resources(self):
+        for s in self.series.values():
+            if s._vbo is not None:
+                gl.glDeleteBuffers(1, [s._vbo])
+                s._vbo = None
+            s._vertices = None
+            s._vertex_count = 0
+            s._drawn_version = -1
+            s._decimated = None
+            s._decimated_key = None
+        self._layout_key = None
+
+    def _upload(self, t0, t1, columns):
+        """Decimate every series and upload the line strips to their buffers.
+
+        Backends without retained GPU state only keep the vertices.
+        """
+        retained = current().retained
+        decimated = []
+        for s in self.series.values():
+            # Series that did not change keep their buckets from last time
+            key = (s.version, t0, t1, columns)
+            if key != s._decimated_key:
+                s._decimated = decimate_min_max(*s.data(), t0, t1, columns)
+                s._decimated_key = key
+            decimated.append(s._decimated)
+        y_min, y_max = self._value_range(decimated)
+        scale = self.height / (y_max - y_min)
+
+        for s, (xs, lows, highs) in zip(self.series.values(), decimated):
+            # Each bucket contributes its min and max point to the strip
+            vertices = np.empty((len(xs) * 2, 2), dtype=np.float32)
+            vertices[0::2, 0] = vertices[1::2, 0] = self.x + xs
+            vertices[0::2, 1] = self.y + self.height - (lows - y_min) * scale
+            vertices[1::2, 1] = self.y + self.height - (highs - y_min) * scale
+            np.clip(vertices[:, 1], self.y, self.y + self.height, out=vertices[:, 1])
+
+            s._vertices = vertices
+            s._vertex_count = len(vertices)
+            s._drawn_version = s.version
+            if not retained:
+                continue
+            if s._vbo is None:
+                s._vbo = gl.glGenBuffers(1)
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, s._vbo)
+            gl.glBufferData(
+                gl.GL_ARRAY_BUFFER, vertices.nbytes, vertices, gl.GL_STREAM_DRAW
+            )
+        if retained:
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
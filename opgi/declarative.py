@@ -0,0 +1,252 @@
+import inspect
+
+from .layouts import Layout
+
+# Constructor arguments that may be left out; layouts position children
+GEOMETRY_DEFAULTS = {"x": 0, "y": 0, "width": 0, "height": 0}
+
+
+class Element:
+    """Description of a widget or layout in a declarative UI tree.
+
+    ``props`` are constructor arguments and attributes; a prop is applied
+    through the widget's set_<name>() method when it has one, e.g.
+    ``on_click`` through Button.set_on_click. ``key`` identifies an element
+    among its siblings so it keeps its widget when the order changes.
+    """
+
+    __slots__ = ("children", "key", "props", "type")
+
+    def __init__(self, type, props=None, children=(), key=None):
+        self.type = type
+        self.props = props or {}
+        self.children = [to_element(child) for child in children]
+        self.key = key
+
+    def __repr__(self):
+        return f"Element({self.type.__name__}, key={self.key!r})"
+
+
+def h(type, *children, key=None, **props):
+    """Shorthand for Element: h(VerticalLayout, h(Label, text="Hi"), x=10)"""
+    return Element(type, props, children, key)
+
+
+def to_element(node):
+    """Accept an Element or a dict with type, props, children and key"""
+    if isinstance(node, Element):
+        return node
+    return Element(
+        node["type"], node.get("props"), node.get("children", ()), node.get("key")
+    )
+
+
+_constructor_params = {}
+
+
+def _create(element):
+    """Build a widget, passing props its constructor accepts as arguments"""
+    params = _constructor_params.get(element.type)
+    if params is None:
+        signature = inspect.signature(element.type.__init__)
+        params = _constructor_params[element.type] = [
+            p
+            for p in list(signature.parameters.values())[1:]
+            if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)
+        ]
+
+    kwargs = {}
+    for param in params:
+        if param.name in element.props:
+            kwargs[param.name] = element.props[param.name]
+        elif param.default is param.empty and param.name in GEOMETRY_DEFAULTS:
+            kwargs[param.name] = GEOMETRY_DEFAULTS[param.name]
+
+    widget = element.type(**kwargs)
+    for name, value in element.props.items():
+        if name not in kwargs:
+            _set_prop(widget, name, value)
+    return widget
+
+
+def _splice(widgets, old, new):
+    """Replace the old widgets in a widget list by new, keeping all others.
+
+    The new widgets go where the first old one was, or at the end.
+    """
+    owned = {id(widget) for widget in old}
+    start = next(
+        (i for i, widget in enumerate(widgets) if id(widget) in owned), len(widgets)
+    )
+    others = [widget for widget in widgets if id(widget) not in owned]
+    widgets[:] = others[:start] + new + others[start:]
+
+
+def _set_prop(widget, name, value):
+    setter = getattr(widget, f"set_{name}", None)
+    if setter is not None:
+        setter(value)
+    else:
+        setattr(widget, name, value)
+
+
+class _Mounted:
+    """A live widget together with the element it was last rendered from"""
+
+    __slots__ = ("children", "element", "widget")
+
+    def __init__(self, widget, element):
+        self.widget = widget
+        self.element = element
+        self.children = []
+
+
+class Reconciler:
+    """Keeps a live widget tree in sync with a declarative description.
+
+    Every render() diffs the new elements against the ones rendered last
+    time and applies only the differences: changed props are set on the
+    existing widgets, new elements are created and missing ones removed.
+    Widgets that survive keep their focus, hover, scroll and cached render
+    data. Props are compared with the previous element and not with the
+    widget, so state the user changed (typed text, a dragged slider) is left
+    alone while its prop stays the same.
+
+    Props dropped from an element keep their last value on the widget.
+    Widgets added to the container by other code are left in place.
+    """
+
+    def __init__(self, app, container=None):
+        self.app = app
+        self.container = container if container is not None else app
+        self._mounted = []
+
+    def render(self, elements):
+        """Update the container's widgets to match elements"""
+        if isinstance(elements, (Element, dict)):
+            elements = [elements]
+        elements = [to_element(element) for element in elements]
+
+        old_widgets = {id(mounted.widget) for mounted in self._mounted}
+        self._mounted = self._reconcile(self.container, self._mounted, elements)
+
+        # Newly added top-level layouts need their first layout pass
+        for mounted in self._mounted:
+            widget = mounted.widget
+            if id(widget) not in old_widgets and hasattr(
+                widget, "update_from_window_size"
+            ):
+                widget.update_from_window_size(self.app.width, self.app.height)
+        self.app.invalidate()
+
+    def widget(self, key):
+        """Return the live widget rendered from the element with this key"""
+        stack = list(self._mounted)
+        while stack:
+            mounted = stack.pop()
+            if mounted.element.key == key:
+                return mounted.widget
+            stack.extend(mounted.children)
+        return None
+
+    def _reconcile(self, container, old, elements):
+        # Keyed elements match by key, the rest by type in order
+        keyed = {}
+        unkeyed = {}
+        for mounted in old:
+            if mounted.element.key is not None:
+                keyed[mounted.element.key] = mounted
+            else:
+                unkeyed.setdefault(mounted.element.type, []).append(mounted)
+        for queue in unkeyed.values():
+            queue.reverse()
+
+        result = []
+        changed = len(old) != len(elements)
+        for index, element in enumerate(elements):
+            if element.key is not None:
+                mounted = keyed.pop(element.key, None)
+                if mounted is not None and mounted.element.type is not element.type:
+                    keyed[element.key] = mounted
+                    mounted = None
+            else:
+                queue = unkeyed.get(element.type)
+                mounted = queue.pop() if queue else None
+
+            if mounted is None:
+                mounted = _Mounted(_create(element), element)
+                if isinstance(mounted.widget, Layout):
+                    mounted.children = self._reconcile(
+                        mounted.widget, [], element.children
+                    )
+                changed = True
+            else:
+                self._update(mounted, element)
+                if index >= len(old) or old[index] is not mounted:
+                    changed = True
+            result.append(mounted)
+
+        removed = list(keyed.values())
+        for queue in unkeyed.values():
+            removed.extend(queue)
+        for mounted in removed:
+            self._unmount(mounted)
+
+        if changed or removed:
+            widgets = [mounted.widget for mounted in result]
+            attached = {id(widget) for widget in container.widgets}
+            for widget in widgets:
+                if id(widget) not in attached:
+                    self._attach(container, widget)
+            _splice(container.widgets, [mounted.widget for mounted in old], widgets)
+            if container is not self.app and hasattr(container, "update_layout"):
+                container.update_layout()
+        return result
+
+    def _update(self, mounted, element):
+        """Apply the props that changed since the last render"""
+        widget = mounted.widget
+        old_props = mounted.element.props
+        changed = False
+        for name, value in element.props.items():
+            if name in old_props and (
+                old_props[name] is value or old_props[name] == value
+            ):
+                continue
+            _set_prop(widget, name, value)
+            changed = True
+        mounted.element = element
+
+        if isinstance(widget, Layout):
+            before = list(widget.widgets)
+            mounted.children = self._reconcile(
+                widget, mounted.children, element.children
+            )
+            # A changed child list already triggered a layout pass
+            if changed and before == widget.widgets:
+                widget.update_layout()
+
+    def _attach(self, container, widget):
+        app = container if container is self.app else container.app
+        if hasattr(widget, "set_app"):
+            widget.set_app(app)
+        else:
+            widget.app = app
+
+    def _unmount(self, mounted):
+        self._detach(mounted)
+        # Layouts release their children as well
+        widget = mounted.widget
+        if hasattr(widget, "release_resources"):
+            widget.release_resources()
+
+    def _detach(self, mounted):
+        for child in mounted.children:
+            self._detach(child)
+        widget = mounted.widget
+        app = self.app
+        if app.focused_widget is widget:
+            app.focused_widget = None
+        if app.captured_widget is widget:
+            app.captured_widget = None
+        app.close_overlay(widget)
@@ -0,0 +1,109 @@
+import json
+import time
+
+try:
+    import glfw
+    import OpenGL.GL as gl
+except ImportError:  # Only App tracks presents, which needs glfw and PyOpenGL
+    glfw = gl = None
+
+from .profiling import RollingStats
+
+
+class LatencyTracker:
+    """Measures input-to-present latency per kind of input event.
+
+    Input callbacks call stamp() as soon as GLFW hands them an event and the
+    app calls presented() right after the buffer swap that shows the result,
+    so every event is counted from arrival to the first swap after it. GLFW
+    does not timestamp events, so time spent in the OS queue before
+    poll_events() is not included.
+
+    swap_buffers() usually returns before the frame is on screen. With
+    ``sync`` the app calls glFinish() after the swap so the measurement ends
+    when the GPU is done, at the price of stalling the pipeline every frame.
+    """
+
+    def __init__(self, window=300, sync=False):
+        self.window = window
+        self.sync = sync
+        self.latencies = {}  # kind -> RollingStats in milliseconds
+        self._pending = []
+
+    def stamp(self, kind):
+        """Record the arrival of an input event of the given kind"""
+        self._pending.append((kind, time.perf_counter()))
+
+    def presented(self):
+        """Close out every event that arrived before this swap"""
+        if self.sync:
+            gl.glFinish()
+        if self._pending:
+            self.record(self.take_pending(), time.perf_counter())
+
+    def take_pending(self):
+        """Remove and return the events stamped so far, see record()"""
+        pending, self._pending = self._pending, []
+        return pending
+
+    def record(self, events, presented_at):
+        """Close out events from take_pending() shown at perf_counter() time"""
+        for kind, arrived in events:
+            stats = self.latencies.get(kind)
+            if stats is None:
+                stats = self.latencies[kind] = RollingStats(self.window)
+            stats.add((presented_at - arrived) * 1000)
+
+    def reset(self):
+        self.latencies.clear()
+        self._pending.clear()
+
+    def stats(self):
+        """Latency distribution per event kind, e.g. "click" and "key" """
+        return {kind: stats.summary() for kind, stats in self.latencies.items()}
+
+    def dump_json(self, path=None):
+        text = json.dumps(self.stats(), indent=2)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+
+def _refresh_rate(default=60):
+    monitor = glfw.get_primary_monitor()
+    mode = glfw.get_video_mode(monitor) if monitor else None
+    return getattr(mode, "refresh_rate", 0) or default
+
+
+class FramePacer:
+    """Delays input polling until just before the frame has to be rendered.
+
+    After a swap the pacer sleeps until the next vsync minus the expected
+    render time and a safety margin, so the events polled afterwards are as
+    fresh as possible when the frame is drawn. The expected render time is a
+    high percentile of recent frames.
+    """
+
+    def __init__(self, refresh_rate=None, margin_ms=2.0, window=120):
+        self.period = 1 / (refresh_rate or _refresh_rate())
+        self.margin = margin_ms / 1000
+        self.render_times = RollingStats(window)
+        self._last_present = None
+
+    def wait(self):
+        """Sleep until it is time to poll input for the next frame"""
+        if self._last_present is None:
+            return
+        render = self.render_times.percentile(95) / 1000
+        deadline = self._last_present + self.period - render - self.margin
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    def rendered(self, start):
+        """Record a frame whose input and drawing began at perf_counter() start"""
+        self.render_times.add((time.perf_counter() - start) * 1000)
+
+    def presented(self):
+        self._last_present = time.perf_counter()
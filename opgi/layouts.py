@@ -1,3 +1,124 @@
+from collections import OrderedDict
+from collections.abc import MutableSequence
+from itertools import islice
+
+from .widgets import draw_spinner
+
+
+class ChildList(MutableSequence):
+    """Ordered children of a layout with O(1) append, remove and raise.
+
+    Children are kept in an ordered dict keyed by identity, so removing a
+    widget from the middle of a large layout does not shift the rest the
+    way list.remove() does. The full list API works; indexing walks from
+    the nearer end, and insert() or slice assignment in the middle rebuild
+    the list in O(n).
+    """
+
+    __slots__ = ("_children",)
+
+    def __init__(self, widgets=()):
+        self._children = OrderedDict((id(widget), widget) for widget in widgets)
+
+    def __iter__(self):
+        return iter(self._children.values())
+
+    def __reversed__(self):
+        return reversed(self._children.values())
+
+    def __len__(self):
+        return len(self._children)
+
+    def __contains__(self, widget):
+        return id(widget) in self._children
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("child index out of range")
+        if index > len(self) // 2:
+            return next(islice(reversed(self), len(self) - 1 - index, None))
+        return next(islice(self, index, None))
+
+    def __setitem__(self, index, value):
+        if index == slice(None):
+            self._children = OrderedDict((id(widget), widget) for widget in value)
+            return
+        children = list(self)
+        children[index] = value
+        self[:] = children
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            children = list(self)
+            del children[index]
+            self[:] = children
+        else:
+            self.remove(self[index])
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"ChildList({list(self)!r})"
+
+    def append(self, widget):
+        self._children[id(widget)] = widget
+
+    def insert(self, index, widget):
+        if index >= len(self):
+            self.append(widget)
+            return
+        children = list(self)
+        children.insert(index, widget)
+        self[:] = children
+
+    def pop(self, index=-1):
+        if not self._children:
+            raise IndexError("pop from empty ChildList")
+        if index in (-1, len(self) - 1):
+            return self._children.popitem(last=True)[1]
+        if index == 0:
+            return self._children.popitem(last=False)[1]
+        widget = self[index]
+        self.remove(widget)
+        return widget
+
+    def remove(self, widget):
+        del self._children[id(widget)]
+
+    def discard(self, widget):
+        self._children.pop(id(widget), None)
+
+    def clear(self):
+        self._children.clear()
+
+    def index(self, widget, start=0, stop=None):
+        for i, child in enumerate(islice(self, start, stop), start):
+            if child is widget:
+                return i
+        raise ValueError("widget is not a child")
+
+    def count(self, widget):
+        return int(widget in self)
+
+    def reverse(self):
+        self[:] = list(reversed(self))
+
+    def move_to_end(self, widget, last=True):
+        """Move a child to the back (drawn last) or, with last=False, the front"""
+        self._children.move_to_end(id(widget), last)
+
+    def move(self, widget, index):
+        """Move a child to position index; O(n), prefer move_to_end"""
+        children = [child for child in self if child is not widget]
+        children.insert(index, widget)
+        self[:] = children
+
+
 class Layout:
     """Base class for all layout managers"""
 
@@ -6,11 +127,12 @@ class Layout:
         self.y = y
         self.width = width
         self.height = height
-        self.widgets = []
+        self.widgets = ChildList()
         self.padding = 5
         self.spacing = 5
         self.app = None
         self.visible = True
+        self.busy = False  # A Background callback of this layout is running
 
         # Relative positioning/sizing
         self.relative_x = None
@@ -18,6 +140,17 @@ class Layout:
         self.relative_width = None
         self.relative_height = None
 
+    @property
+    def widgets(self):
+        return self._widgets
+
+    @widgets.setter
+    def widgets(self, widgets):
+        # Plain lists assigned by user code are wrapped to keep O(1) removal
+        self._widgets = (
+            widgets if isinstance(widgets, ChildList) else ChildList(widgets)
+        )
+
     def set_relative_position(self, rel_x, rel_y):
         """Set position as percentage of window size (0.0 to 1.0)"""
         self.relative_x = rel_x
@@ -41,21 +174,45 @@ class Layout:
 
         self.update_layout()
 
+    def set_app(self, app):
+        """Set the application reference for the layout and its children"""
+        self.app = app
+        for widget in self.widgets:
+            if hasattr(widget, "set_app"):
+                widget.set_app(app)
+            else:
+                widget.app = app
+
     def add_widget(self, widget):
         self.widgets.append(widget)
-        widget.app = self.app
+        if hasattr(widget, "set_app"):
+            widget.set_app(self.app)
+        else:
+            widget.app = self.app
         return widget
 
     def remove_widget(self, widget):
-        if widget in self.widgets:
-            self.widgets.remove(widget)
+        self.widgets.discard(widget)
 
     def clear(self):
         self.widgets.clear()
 
+    def release_resources(self):
+        """Free cached GPU data of all children"""
+        for widget in self.widgets:
+            if hasattr(widget, "release_resources"):
+                widget.release_resources()
+
     def update_layout(self):
         pass
 
+    def draw_busy(self):
+        """Draw a spinner while a Background callback, e.g. of a Stack, runs"""
+        t = self.app.time() if self.app is not None else 0.0
+        draw_spinner(self.x, self.y, self.width, self.height, t)
+        if self.app is not None:
+            self.app.invalidate()  # Keep spinning
+
     def draw(self):
         if not self.visible:
             return
@@ -71,6 +228,17 @@ class Layout:
             self.x <= x <= self.x + self.width and self.y <= y <= self.y + self.height
         )
 
+    def widget_at(self, x, y):
+        """Return the child widget under (x, y), descending into nested layouts"""
+        for widget in self.widgets:
+            if hasattr(widget, "visible") and not widget.visible:
+                continue
+            if hasattr(widget, "contains") and widget.contains(x, y):
+                if hasattr(widget, "widget_at"):
+                    return widget.widget_at(x, y) or widget
+                return widget
+        return None
+
 
 class VerticalLayout(Layout):
     def __init__(self, x=0, y=0, width=100, height=100):
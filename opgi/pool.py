@@ -0,0 +1,58 @@
+class WidgetPool:
+    """Recycles widget instances per type instead of allocating new ones.
+
+    acquire() hands out a released widget of the requested type after
+    calling its _pool_reset() hook with the constructor arguments, or
+    constructs a new one when none is free. release() frees the widget's GPU
+    resources and keeps it for reuse, up to ``max_per_type`` widgets per
+    type.
+    Widgets under heavy churn then stop producing garbage for the cycle
+    collector.
+    """
+
+    def __init__(self, max_per_type=256):
+        self.max_per_type = max_per_type
+        self._free = {}  # type -> released widgets
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, cls, *args, **kwargs):
+        free = self._free.get(cls)
+        if free:
+            widget = free.pop()
+            widget._pool_reset(*args, **kwargs)
+            self.reused += 1
+            return widget
+        self.created += 1
+        return cls(*args, **kwargs)
+
+    def release(self, widget):
+        """Return a widget that is no longer shown to the pool"""
+        app = widget.app
+        if app is not None:
+            # Don't leave app state pointing at a recycled widget
+            if app.focused_widget is widget:
+                app.focused_widget = None
+            if app.captured_widget is widget:
+                app.captured_widget = None
+            app.close_overlay(widget)
+        widget.release_resources()
+        widget.app = None
+
+        free = self._free.setdefault(type(widget), [])
+        if len(free) < self.max_per_type:
+            free.append(widget)
+
+    def remove(self, layout, widget):
+        """Remove a widget from a layout and release it"""
+        layout.remove_widget(widget)
+        self.release(widget)
+
+    def clear(self, layout):
+        """Remove and release all children of a layout"""
+        for widget in list(layout.widgets):
+            self.release(widget)
+        layout.clear()
+
+    def free_count(self, cls):
+        return len(self._free.get(cls, ()))
@@ -0,0 +1,436 @@
+import bisect
+import json
+import sys
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import OpenGL.GL as gl
+    from OpenGL import GLUT as glut
+    from OpenGL.error import NullFunctionError
+except ImportError:  # Widget timings still work, GPU timers and the HUD do not
+    gl = glut = None
+    NullFunctionError = AttributeError
+
+from .layouts import Layout
+from .text import HELVETICA_12
+
+# Upper bucket edges in milliseconds for the rolling histograms
+HISTOGRAM_EDGES = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, float("inf"))
+
+
+class RollingStats:
+    """Keeps the last N samples of a timing and summarizes them"""
+
+    __slots__ = ("samples",)
+
+    def __init__(self, window=300):
+        self.samples = deque(maxlen=window)
+
+    def add(self, value):
+        self.samples.append(value)
+
+    def __len__(self):
+        return len(self.samples)
+
+    @property
+    def last(self):
+        return self.samples[-1] if self.samples else 0.0
+
+    @property
+    def mean(self):
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    @property
+    def max(self):
+        return max(self.samples, default=0.0)
+
+    def percentile(self, p):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def histogram(self):
+        """Sample counts per bucket of HISTOGRAM_EDGES"""
+        counts = [0] * len(HISTOGRAM_EDGES)
+        for value in self.samples:
+            counts[bisect.bisect_left(HISTOGRAM_EDGES, value)] += 1
+        return counts
+
+    def summary(self):
+        return {
+            "count": len(self.samples),
+            "last": self.last,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": self.max,
+            "histogram": self.histogram(),
+        }
+
+
+class _CountingModule:
+    """Stand-in for the gl/glut modules that counts every function call"""
+
+    def __init__(self, module, profiler):
+        self._module = module
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if not callable(attr) or not name.startswith("gl"):
+            return attr
+
+        profiler = self._profiler
+
+        def counted(*args):
+            profiler.gl_calls += 1
+            return attr(*args)
+
+        # Cache the wrapper so later lookups skip __getattr__
+        setattr(self, name, counted)
+        return counted
+
+
+class GpuTimer:
+    """GL_TIMESTAMP queries around each render pass.
+
+    Every pass owns a pair of timestamp queries per buffered frame. Unlike
+    GL_TIME_ELAPSED queries, timestamps may overlap, so passes can be timed
+    inside a span that another timer measures, e.g. the frame timed by
+    DynamicResolution. Results are read back one frame late and only once
+    the driver reports them available, so reading them never stalls the
+    pipeline. Results that are not ready in time are dropped and counted in
+    ``dropped``.
+    """
+
+    def __init__(self, profiler, buffers=2):
+        self.profiler = profiler
+        self.buffers = buffers
+        self.frame = 0
+        self.dropped = 0
+        self._queries = [{} for _ in range(buffers)]
+        self._issued = [[] for _ in range(buffers)]
+        self._active = []
+        self._result = np.zeros(1, dtype=np.uint64)
+        self._available = np.zeros(1, dtype=np.int32)
+
+    @staticmethod
+    def supported():
+        """Whether the current context provides timer queries"""
+        try:
+            return bool(gl.glQueryCounter) and bool(gl.glGetQueryObjectui64v)
+        except (AttributeError, NullFunctionError):
+            return False
+
+    def begin(self, name):
+        queries = self._queries[self.frame % self.buffers]
+        pair = queries.get(name)
+        if pair is None:
+            pair = queries[name] = (gl.glGenQueries(1), gl.glGenQueries(1))
+        gl.glQueryCounter(pair[0], gl.GL_TIMESTAMP)
+        self._issued[self.frame % self.buffers].append(name)
+        self._active.append(pair[1])
+
+    def end(self):
+        if self._active:
+            gl.glQueryCounter(self._active.pop(), gl.GL_TIMESTAMP)
+
+    def _read(self, query):
+        gl.glGetQueryObjectiv(query, gl.GL_QUERY_RESULT_AVAILABLE, self._available)
+        if not self._available[0]:
+            return None
+        gl.glGetQueryObjectui64v(query, gl.GL_QUERY_RESULT, self._result)
+        return int(self._result[0])
+
+    def end_frame(self):
+        """Advance to the next query set, collecting its previous results"""
+        self.frame += 1
+        slot = self.frame % self.buffers
+        queries = self._queries[slot]
+
+        for name in self._issued[slot]:
+            start_query, end_query = queries[name]
+            end = self._read(end_query)
+            start = self._read(start_query) if end is not None else None
+            if start is None:
+                self.dropped += 1
+                continue
+            self.profiler.record_gpu_pass(name, (end - start) / 1e6)
+        self._issued[slot] = []
+
+
+class Profiler:
+    """Per-frame instrumentation for App.run.
+
+    Records CPU frame time, time spent in each render pass, draw time and GL
+    call count per widget class and per widget instance, and the time spent
+    in event handlers. All numbers are in milliseconds and kept as rolling
+    windows of the most recent frames.
+    """
+
+    def __init__(self, window=300, top_n=5):
+        self.window = window
+        self.top_n = top_n
+        self.hud_visible = False
+        self.gpu_timer = None
+        self._patched = []
+        self.reset()
+
+    def reset(self):
+        """Drop all collected statistics"""
+        window = self.window
+        self.frame_times = RollingStats(window)
+        self.pass_times = {}
+        self.class_draw_times = {}
+        self.class_gl_calls = {}
+        # Keyed by the widget itself so removed widgets drop out
+        self.instance_draw_times = weakref.WeakKeyDictionary()
+        self.instance_labels = weakref.WeakKeyDictionary()
+        self.event_times = {}
+        self.gpu_pass_times = {}
+
+        self.gl_calls = 0
+        self.frame_gl_calls = RollingStats(window)
+        self._frame_start = None
+        self._frame_class_times = {}
+        self._frame_class_calls = {}
+
+    def _stats(self, table, key):
+        stats = table.get(key)
+        if stats is None:
+            stats = table[key] = RollingStats(self.window)
+        return stats
+
+    # GL call counting
+    def install(self):
+        """Route gl/glut calls of all opgi drawing modules through counters"""
+        if self._patched:
+            return
+        counting = {gl: _CountingModule(gl, self), glut: _CountingModule(glut, self)}
+        for name, module in list(sys.modules.items()):
+            # The HUD in this module should not count towards the frame
+            if not name.startswith("opgi.") or name == __name__ or module is None:
+                continue
+            for attr in ("gl", "glut"):
+                original = getattr(module, attr, None)
+                if original in counting:
+                    setattr(module, attr, counting[original])
+                    self._patched.append((module, attr, original))
+
+    def uninstall(self):
+        for module, attr, original in self._patched:
+            setattr(module, attr, original)
+        self._patched = []
+
+    # Frame recording
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+        self._frame_class_times = {}
+        self._frame_class_calls = {}
+        self.gl_calls = 0
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        if self.gpu_timer:
+            self.gpu_timer.end_frame()
+        self.frame_times.add((time.perf_counter() - self._frame_start) * 1000)
+        self.frame_gl_calls.add(self.gl_calls)
+        for name, elapsed in self._frame_class_times.items():
+            self._stats(self.class_draw_times, name).add(elapsed)
+        for name, calls in self._frame_class_calls.items():
+            self._stats(self.class_gl_calls, name).add(calls)
+        self._frame_start = None
+
+    def record_pass(self, name, elapsed_ms):
+        self._stats(self.pass_times, name).add(elapsed_ms)
+
+    def mark_pass(self, name, start):
+        """Record a pass that began at perf_counter() value start.
+
+        Returns the current perf_counter() value so consecutive passes can be
+        chained.
+        """
+        now = time.perf_counter()
+        self.record_pass(name, (now - start) * 1000)
+        return now
+
+    def record_gpu_pass(self, name, elapsed_ms):
+        self._stats(self.gpu_pass_times, name).add(elapsed_ms)
+
+    def enable_gpu_timing(self, buffers=2):
+        """Time render passes on the GPU as well; needs a current GL context"""
+        if GpuTimer.supported():
+            self.gpu_timer = GpuTimer(self, buffers)
+        return self.gpu_timer is not None
+
+    @contextmanager
+    def measure_pass(self, name):
+        """Time a render pass on the CPU and, if enabled, on the GPU"""
+        gpu = self.gpu_timer
+        if gpu:
+            gpu.begin(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.mark_pass(name, start)
+            if gpu:
+                gpu.end()
+
+    def draw_widget(self, widget):
+        """Draw a widget while timing it and counting its GL calls"""
+        # Time layout children individually instead of the layout as a whole
+        if isinstance(widget, Layout) and type(widget).draw is Layout.draw:
+            for child in widget.widgets:
+                if hasattr(child, "visible") and not child.visible:
+                    continue
+                if hasattr(child, "draw"):
+                    self.draw_widget(child)
+            return
+
+        calls = self.gl_calls
+        start = time.perf_counter()
+        widget.draw()
+        elapsed = (time.perf_counter() - start) * 1000
+        calls = self.gl_calls - calls
+
+        name = type(widget).__name__
+        self._frame_class_times[name] = self._frame_class_times.get(name, 0) + elapsed
+        self._frame_class_calls[name] = self._frame_class_calls.get(name, 0) + calls
+
+        self._stats(self.instance_draw_times, widget).add(elapsed)
+        if widget not in self.instance_labels:
+            self.instance_labels[widget] = f"{name}@{int(widget.x)},{int(widget.y)}"
+
+    def call_handler(self, widget, handler, *args):
+        """Call widget.<handler>(*args) and record how long it took"""
+        start = time.perf_counter()
+        try:
+            return getattr(widget, handler)(*args)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            key = f"{type(widget).__name__}.{handler}"
+            self._stats(self.event_times, key).add(elapsed)
+
+    # Reporting
+    @property
+    def fps(self):
+        mean = self.frame_times.mean
+        return 1000 / mean if mean else 0.0
+
+    def top_widgets(self, n=None):
+        """Most expensive widget instances as (label, mean draw ms)"""
+        ranked = sorted(
+            (
+                (self.instance_labels[key], stats.mean)
+                for key, stats in self.instance_draw_times.items()
+            ),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        return ranked[: n or self.top_n]
+
+    def stats(self):
+        """All collected statistics as plain Python data"""
+
+        def summarize(table):
+            return {str(key): stats.summary() for key, stats in table.items()}
+
+        return {
+            "fps": self.fps,
+            "frame_ms": self.frame_times.summary(),
+            "frame_gl_calls": self.frame_gl_calls.summary(),
+            "pass_ms": summarize(self.pass_times),
+            "gpu_pass_ms": summarize(self.gpu_pass_times),
+            "gpu_dropped_results": self.gpu_timer.dropped if self.gpu_timer else 0,
+            "class_draw_ms": summarize(self.class_draw_times),
+            "class_gl_calls": summarize(self.class_gl_calls),
+            "instance_draw_ms": {
+                self.instance_labels[key]: stats.summary()
+                for key, stats in self.instance_draw_times.items()
+            },
+            "event_ms": summarize(self.event_times),
+            "histogram_edges_ms": [str(edge) for edge in HISTOGRAM_EDGES],
+        }
+
+    def dump_json(self, path=None):
+        """Return the statistics as JSON, also writing them to path if given"""
+        text = json.dumps(self.stats(), indent=2)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    # On-screen HUD
+    def draw_hud(self, app):
+        """Draw FPS, a frame time graph and the most expensive widgets"""
+        font = HELVETICA_12
+        top = self.top_widgets()
+        width = 260
+        height = 126 + 16 * len(top)
+        x = app.width - width - 10
+        y = 10
+
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        gl.glColor4f(0, 0, 0, 0.75)
+        _rect(x, y, width, height)
+        gl.glDisable(gl.GL_BLEND)
+
+        gl.glColor3f(1, 1, 1)
+        _text(
+            f"{self.fps:5.1f} FPS  {self.frame_times.last:5.2f} ms"
+            f"  {self.frame_gl_calls.last:.0f} GL calls",
+            x + 8,
+            y + 16,
+            font,
+        )
+
+        gpu_ms = sum(stats.last for stats in self.gpu_pass_times.values())
+        cpu_ms = sum(
+            stats.last for name, stats in self.pass_times.items() if name != "swap"
+        )
+        _text(f"CPU {cpu_ms:5.2f} ms  GPU {gpu_ms:5.2f} ms", x + 8, y + 32, font)
+
+        # Frame time graph, the line marks the 16.7 ms budget
+        graph_y = y + 42
+        graph_height = 60
+        budget_y = graph_y + graph_height - graph_height * 16.7 / 33.4
+        samples = list(self.frame_times.samples)[-(width - 16) :]
+        for i, value in enumerate(samples):
+            bar = min(graph_height, graph_height * value / 33.4)
+            if value > 16.7:
+                gl.glColor3f(0.96, 0.32, 0.26)
+            else:
+                gl.glColor3f(0.36, 0.82, 0.46)
+            _rect(x + 8 + i, graph_y + graph_height - bar, 1, bar)
+        gl.glColor3f(0.9, 0.9, 0.2)
+        _rect(x + 8, budget_y, width - 16, 1)
+
+        gl.glColor3f(1, 1, 1)
+        line_y = graph_y + graph_height + 18
+        for label, mean in top:
+            _text(f"{mean:6.2f} ms  {label}", x + 8, line_y, font)
+            line_y += 16
+
+
+def _rect(x, y, width, height):
+    gl.glBegin(gl.GL_QUADS)
+    gl.glVertex2f(x, y)
+    gl.glVertex2f(x + width, y)
+    gl.glVertex2f(x + width, y + height)
+    gl.glVertex2f(x, y + height)
+    gl.glEnd()
+
+
+def _text(text, x, y, font):
+    gl.glRasterPos2f(x, y)
+    for char in text:
+        glut.glutBitmapCharacter(font, ord(char))
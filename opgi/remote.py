@@ -0,0 +1,398 @@
+import queue
+import socket
+import struct
+import sys
+import threading
+
+import numpy as np
+
+from . import text
+from .backend import COMMANDS, current
+from .widgets import Widget
+
+# A frame is a list of backend draw commands, see opgi.backend. Each command
+# is its index in COMMANDS and fixed float32 arguments; point lists carry a
+# count and float32 (x, y) pairs, quads their colors as well, and text its
+# position, font and UTF-8 bytes.
+OPCODES = {name: op for op, name in enumerate(COMMANDS)}
+POINT_COMMANDS = ("polygon", "lines", "line_strip", "line_loop")
+FIXED = {
+    "set_color": struct.Struct("<B4f"),  # r, g, b, a
+    "set_line_width": struct.Struct("<Bf"),
+    "rect": struct.Struct("<B4f"),  # x, y, width, height
+    "rect_outline": struct.Struct("<B4f"),
+    "rounded_rect": struct.Struct("<B5f"),  # x, y, width, height, radius
+    "rounded_rect_outline": struct.Struct("<B5f"),
+    "pie": struct.Struct("<B5f"),  # cx, cy, radius, start and end angle
+    "circle": struct.Struct("<B3f"),  # cx, cy, radius
+    "circle_outline": struct.Struct("<B3f"),
+    "clip": struct.Struct("<B4f"),  # x, y, width, height
+    "unclip": struct.Struct("<B"),
+}
+POINTS = struct.Struct("<BI")  # point count
+QUADS = struct.Struct("<BIB")  # vertex count, color components
+TEXT = struct.Struct("<B2fBH")  # x, y, index into FONTS, byte length
+LAYOUTS = tuple(
+    FIXED.get(name)
+    or (POINTS if name in POINT_COMMANDS else QUADS if name == "quads" else TEXT)
+    for name in COMMANDS
+)
+FONTS = tuple(font for font, _ in text.GLUT_FONT_SIZES)
+DEFAULT_FONT = FONTS.index(text.HELVETICA_18)
+
+# Frames do not include the clear, viewers fill with the app's clear color
+CLEAR_COLOR = (0.95, 0.95, 0.95)
+
+# Messages: kind and payload length, then the payload. A FRAME keeps the
+# first and last commands of the previous frame and replaces the rest.
+MESSAGE = struct.Struct("<BI")
+SIZE, FRAME = 1, 2
+SIZE_PAYLOAD = struct.Struct("<HH")  # window width, height
+FRAME_PAYLOAD = struct.Struct("<III")  # frame, kept prefix, kept suffix
+
+
+def encode(name, args):
+    """Encode one recorded (name, args) backend command"""
+    op = OPCODES[name]
+    layout = LAYOUTS[op]
+    if name in FIXED:
+        if name == "set_color" and len(args) == 3:
+            args = (*args, 1.0)
+        return layout.pack(op, *args)
+    if name == "text":
+        string, x, y, *font = args
+        font = font[0] if font else None
+        data = string.encode()
+        font_index = FONTS.index(font) if font in FONTS else DEFAULT_FONT
+        return layout.pack(op, x, y, font_index, len(data)) + data
+    if name == "quads":
+        vertices = np.asarray(args[0], dtype="<f4").reshape(-1, 2)
+        colors = np.asarray(args[1], dtype="<f4")
+        components = colors.shape[-1] if colors.size else 0
+        header = layout.pack(op, len(vertices), components)
+        return header + vertices.tobytes() + colors.tobytes()
+    points = np.asarray(args[0], dtype="<f4").reshape(-1, 2)
+    return layout.pack(op, len(points)) + points.tobytes()
+
+
+def split_commands(data):
+    """Split encoded commands into a list of one bytes object per command"""
+    commands = []
+    offset = 0
+    while offset < len(data):
+        op = data[offset]
+        layout = LAYOUTS[op]
+        end = offset + layout.size
+        if layout is TEXT:
+            end += layout.unpack_from(data, offset)[-1]
+        elif layout is QUADS:
+            _, count, components = layout.unpack_from(data, offset)
+            end += count * (2 + components) * 4
+        elif layout is POINTS:
+            end += layout.unpack_from(data, offset)[1] * 8
+        commands.append(data[offset:end])
+        offset = end
+    return commands
+
+
+def decode(command):
+    """Return the (name, args) backend call of one encoded command"""
+    op = command[0]
+    name = COMMANDS[op]
+    layout = LAYOUTS[op]
+    args = layout.unpack_from(command)[1:]
+    if layout is TEXT:
+        x, y, font, _ = args
+        args = (bytes(command[layout.size :]).decode(), x, y, FONTS[font])
+    elif layout is QUADS:
+        count, components = args
+        data = np.frombuffer(command, dtype="<f4", offset=layout.size)
+        vertices = data[: count * 2].reshape(count, 2)
+        args = (vertices, data[count * 2 :].reshape(count, components))
+    elif layout is POINTS:
+        data = np.frombuffer(command, dtype="<f4", offset=layout.size)
+        args = (data.reshape(args[0], 2),)
+    return name, args
+
+
+class _Viewer:
+    """One connected viewer, fed by its own sending thread"""
+
+    def __init__(self, connection, max_queue):
+        self.connection = connection
+        self.queue = queue.Queue(max_queue)
+        self.needs_full_frame = True
+        self.closed = False
+        self.thread = threading.Thread(
+            target=self._send_loop, name="opgi-remote", daemon=True
+        )
+        self.thread.start()
+
+    def send(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            # Too far behind for deltas: drop what is queued, resync later
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            self.needs_full_frame = True
+
+    def _send_loop(self):
+        while True:
+            message = self.queue.get()
+            if message is None:
+                break
+            try:
+                self.connection.sendall(message)
+            except OSError:
+                self.closed = True
+                break
+        self.connection.close()
+
+    def close(self):
+        self.closed = True
+        try:
+            self.queue.put_nowait(None)
+        except queue.Full:
+            self.connection.close()
+
+
+def _message(kind, payload):
+    return MESSAGE.pack(kind, len(payload)) + payload
+
+
+class RemoteServer:
+    """Streams the draw commands of every frame to viewers over TCP.
+
+    While serving, the app records its layers with App.record_frame(), the
+    same as for the render thread, and passes each Frame to send(). Viewers
+    get exactly what the window shows, minus the profiler HUD. Each frame is
+    sent as a delta against the previous one: the commands both frames
+    start and end with are kept and only the part in between is sent, so a
+    frame that did not change costs nothing. A new viewer, or one more than
+    ``max_queue`` frames behind, gets the whole next frame. Use port 0 to
+    pick a free port, see ``address``.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, max_queue=4):
+        self.max_queue = max_queue
+        self.viewers = []
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self._previous = []
+        self._size = None
+        self._socket = socket.create_server((host, port))
+        self._socket.setblocking(False)
+        self.address = self._socket.getsockname()
+
+    def send(self, frame):
+        """Send the commands of a recorded Frame to every viewer"""
+        commands = [encode(name, args) for name, args in frame.commands]
+        self._accept()
+        self.viewers = [viewer for viewer in self.viewers if not viewer.closed]
+
+        size = (int(frame.width), int(frame.height))
+        size_message = None
+        if size != self._size:
+            self._size = size
+            size_message = _message(SIZE, SIZE_PAYLOAD.pack(*size))
+
+        previous = self._previous
+        changed = commands != previous
+        self._previous = commands
+        delta = None
+        for viewer in self.viewers:
+            if viewer.needs_full_frame:
+                viewer.needs_full_frame = False
+                message = _message(SIZE, SIZE_PAYLOAD.pack(*size)) + _frame_message(
+                    frame.index, 0, 0, commands
+                )
+            elif changed or size_message:
+                if delta is None:
+                    delta = _delta(frame.index, previous, commands)
+                message = (size_message or b"") + delta
+            else:
+                continue
+            viewer.send(message)
+            self.frames_sent += 1
+            self.bytes_sent += len(message)
+
+    def _accept(self):
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except BlockingIOError:
+                return
+            connection.setblocking(True)
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.viewers.append(_Viewer(connection, self.max_queue))
+
+    def close(self):
+        for viewer in self.viewers:
+            viewer.close()
+        self.viewers = []
+        self._socket.close()
+
+
+def _frame_message(frame, prefix, suffix, middle):
+    payload = FRAME_PAYLOAD.pack(frame, prefix, suffix) + b"".join(middle)
+    return _message(FRAME, payload)
+
+
+def _delta(frame, previous, commands):
+    limit = min(len(previous), len(commands))
+    prefix = 0
+    while prefix < limit and previous[prefix] == commands[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < limit - prefix
+        and previous[len(previous) - 1 - suffix] == commands[len(commands) - 1 - suffix]
+    ):
+        suffix += 1
+    return _frame_message(
+        frame, prefix, suffix, commands[prefix : len(commands) - suffix]
+    )
+
+
+class RemoteClient:
+    """Receives a RemoteServer stream and keeps the latest frame.
+
+    ``commands`` is the current frame as a list of (op, args) tuples, see
+    decode(). ``on_frame(client)`` is called on the receiving thread after
+    every frame. Needs no GL, so it also works in tests.
+    """
+
+    def __init__(self, host, port, on_frame=None):
+        self.on_frame = on_frame
+        self.size = None
+        self.frame = -1
+        self.frames_received = 0
+        self.bytes_received = 0
+        self.commands = []
+        self.closed = False
+        self._raw = []
+        self._decoded = []
+        self._lock = threading.Lock()
+        self._socket = socket.create_connection((host, port))
+        self._thread = threading.Thread(
+            target=self._receive_loop, name="opgi-remote-client", daemon=True
+        )
+        self._thread.start()
+
+    def _read(self, count):
+        data = bytearray()
+        while len(data) < count:
+            chunk = self._socket.recv(count - len(data))
+            if not chunk:
+                raise ConnectionError("server closed the stream")
+            data += chunk
+        return bytes(data)
+
+    def _receive_loop(self):
+        try:
+            while True:
+                kind, length = MESSAGE.unpack(self._read(MESSAGE.size))
+                payload = self._read(length)
+                self.bytes_received += MESSAGE.size + length
+                if kind == SIZE:
+                    self.size = SIZE_PAYLOAD.unpack(payload)
+                elif kind == FRAME:
+                    self._apply(payload)
+        except (OSError, ConnectionError):
+            pass
+        self.closed = True
+
+    def _apply(self, payload):
+        frame, prefix, suffix = FRAME_PAYLOAD.unpack_from(payload)
+        middle = split_commands(payload[FRAME_PAYLOAD.size :])
+        raw, decoded = self._raw, self._decoded
+        end = len(raw) - suffix
+        self._raw = raw[:prefix] + middle + raw[end:]
+        commands = decoded[:prefix] + [decode(command) for command in middle]
+        commands += decoded[end:]
+        self._decoded = commands
+        with self._lock:
+            self.commands = commands
+            self.frame = frame
+        self.frames_received += 1
+        if self.on_frame:
+            self.on_frame(self)
+
+    def snapshot(self):
+        """Return (frame, commands) of the latest complete frame"""
+        with self._lock:
+            return self.frame, self.commands
+
+    def close(self):
+        # shutdown() wakes the receiving thread, close() alone does not
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+        self._thread.join()
+
+
+class RemoteView(Widget):
+    """Draws the frames of a RemoteClient at the widget's position"""
+
+    __slots__ = ("client",)
+
+    def __init__(self, x, y, width, height, client):
+        super().__init__(x, y, width, height)
+        self.client = client
+
+    def draw(self):
+        _, commands = self.client.snapshot()
+        backend = current()
+        x, y, width, height = self.x, self.y, self.width, self.height
+
+        backend.set_color(*CLEAR_COLOR)
+        backend.rect(x, y, width, height)
+        backend.clip(x, y, width, height)
+        for name, args in commands:
+            if name == "unclip":
+                backend.clip(x, y, width, height)  # Stay inside the view
+            else:
+                getattr(backend, name)(*_offset(name, args, x, y))
+        backend.unclip()
+
+
+def _offset(name, args, dx, dy):
+    """Move the arguments of a decoded command by (dx, dy)"""
+    if name in ("set_color", "set_line_width") or not (dx or dy):
+        return args
+    if name == "text":
+        string, x, y, font = args
+        return string, x + dx, y + dy, font
+    if name == "quads":
+        return args[0] + (dx, dy), args[1]
+    if name in POINT_COMMANDS:
+        return (args[0] + (dx, dy),)
+    return (args[0] + dx, args[1] + dy, *args[2:])
+
+
+def view(host="127.0.0.1", port=7070):
+    """Open a window showing the app served at host:port"""
+    from .app import App
+
+    client = RemoteClient(host, port)
+    while client.size is None and not client.closed:
+        threading.Event().wait(0.01)
+    width, height = client.size or (800, 600)
+    app = App(width, height, title=f"OPGI remote {host}:{port}")
+    app.add_widget(RemoteView(0, 0, width, height, client))
+    try:
+        app.run()
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    # python -m opgi.remote [host] port
+    *address, port = sys.argv[1:] or ["7070"]
+    view(address[0] if address else "127.0.0.1", int(port))
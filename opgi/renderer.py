@@ -0,0 +1,126 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+try:
+    import glfw
+    import OpenGL.GL as gl
+except ImportError:  # Only App starts a render thread, which needs both
+    glfw = gl = None
+
+from .backend import replay
+
+logger = logging.getLogger("opgi.renderer")
+
+
+class Frame:
+    """A recorded frame and what the render thread needs to present it"""
+
+    __slots__ = ("commands", "events", "fb_size", "height", "index", "time", "width")
+
+    def __init__(self, commands, width, height, fb_size, index, time, events=()):
+        self.commands = commands  # Tuple from RecordingBackend.take()
+        self.width = width
+        self.height = height
+        self.fb_size = fb_size
+        self.index = index
+        self.time = time
+        self.events = events  # Input events from LatencyTracker.take_pending()
+
+
+class RenderThread:
+    """Submits recorded frames to GL on a thread that owns the context.
+
+    The UI thread draws the widget tree into the app's ``recorder``, which
+    turns every drawing call into an immutable command list, and hands the
+    list over with submit(). The render thread replays it with the app's GLBackend
+    and swaps buffers while the UI thread already handles input and records
+    the next frame. At most one frame waits besides the one being drawn, so
+    submit() blocks when the UI thread gets two frames ahead.
+
+    Widgets only run on the UI thread; the render thread sees nothing but
+    copies of what they drew. Dynamic resolution and frame capture run on
+    the render thread along with the frames.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.backend = app.backend
+        self.frames = 0  # Frames presented
+        self.failed = False
+        self._queue = queue.Queue(1)
+        self._presented = deque()  # (events, time) for the UI thread's tracker
+        self._projection = None
+        self._thread = threading.Thread(
+            target=self._run, name="opgi-render", daemon=True
+        )
+
+    def start(self):
+        """Hand the GL context over to the render thread"""
+        glfw.make_context_current(None)
+        self._thread.start()
+
+    def submit(self, frame):
+        """Queue a frame, waiting while the previous one is still queued"""
+        if self.failed:
+            raise RuntimeError("The render thread failed, see the log")
+        self._queue.put(frame)
+
+    def presented(self):
+        """Take the (events, time) pairs of frames presented since last call"""
+        presented = []
+        while self._presented:
+            presented.append(self._presented.popleft())
+        return presented
+
+    def stop(self):
+        """Present the queued frame, then make the context current here again"""
+        self._queue.put(None)
+        self._thread.join()
+        glfw.make_context_current(self.app.window)
+
+    def _run(self):
+        glfw.make_context_current(self.app.window)
+        try:
+            while True:
+                frame = self._queue.get()
+                if frame is None:
+                    break
+                self._draw(frame)
+        except Exception:
+            logger.exception("Render thread failed, frames are no longer drawn")
+            self.failed = True
+            # Keep taking frames so submit() and stop() do not block
+            while self._queue.get() is not None:
+                pass
+        finally:
+            glfw.make_context_current(None)
+
+    def _draw(self, frame):
+        app = self.app
+        size = (frame.width, frame.height, *frame.fb_size)
+        if size != self._projection:
+            app.apply_projection(*size)
+            self._projection = size
+
+        resolution = app.resolution
+        if resolution:
+            app.target_size = resolution.begin(*frame.fb_size)
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+        self.backend.setup()
+        replay(frame.commands, self.backend)
+        if resolution:
+            resolution.end()
+            app.target_size = frame.fb_size
+        if app.capture:
+            app.capture.read(*frame.fb_size, frame.index, frame.time)
+
+        glfw.swap_buffers(app.window)
+        latency = app.latency
+        if latency:
+            if latency.sync:
+                gl.glFinish()
+            self._presented.append((frame.events, time.perf_counter()))
+        self.frames += 1
@@ -0,0 +1,216 @@
+import struct
+
+try:
+    import glfw
+except ImportError:  # Recordings can be read and written without a window
+    glfw = None
+
+# File layout: header, then one record per event. Each record is the frame
+# it arrived in, its time on the app clock and its kind, followed by the
+# arguments of the matching App handler.
+MAGIC = b"OPGI"
+VERSION = 1
+HEADER = struct.Struct("<4sHHH")  # magic, version, window width, height
+RECORD = struct.Struct("<IfB")  # frame, time, kind
+
+CLICK, MOVE, KEY, CHAR, RESIZE, SCROLL = range(6)
+
+PAYLOADS = {
+    CLICK: struct.Struct("<hhh"),  # button, action, mods
+    MOVE: struct.Struct("<ff"),  # x, y
+    KEY: struct.Struct("<hhhh"),  # key, scancode, action, mods
+    CHAR: struct.Struct("<I"),  # codepoint
+    RESIZE: struct.Struct("<HH"),  # width, height
+    SCROLL: struct.Struct("<ff"),  # dx, dy
+}
+
+
+def read_trace(path):
+    """Return (width, height, events) where events are (frame, time, kind, args)"""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    magic, version, width, height = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not an opgi input trace")
+
+    events = []
+    offset = HEADER.size
+    while offset < len(data):
+        frame, t, kind = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        payload = PAYLOADS[kind]
+        events.append((frame, t, kind, payload.unpack_from(data, offset)))
+        offset += payload.size
+    return width, height, events
+
+
+class InputRecorder:
+    """Writes the input events an App receives to a compact binary trace.
+
+    Recording sits between GLFW and the App handlers, so the trace holds
+    exactly the arguments on_mouse_click, on_mouse_move, on_key_press,
+    on_char_input, on_window_resize and on_scroll were called with, plus the
+    frame they arrived in. Used as a context manager it records until the
+    block ends, e.g. ``with InputRecorder(app, path): app.run()``.
+    """
+
+    def __init__(self, app, path):
+        self.app = app
+        self.path = path
+        self._file = None
+        self._start_frame = 0
+
+    def start(self):
+        app = self.app
+        # Stays open across frames until stop(), so no with block here
+        self._file = open(self.path, "wb")  # noqa: SIM115
+        self._file.write(HEADER.pack(MAGIC, VERSION, app.width, app.height))
+        self._start_frame = app.frame
+
+        # Replays start from the cursor position at the start of recording
+        x, y = glfw.get_cursor_pos(app.window)
+        self._write(MOVE, x, y)
+
+        window = app.window
+        glfw.set_mouse_button_callback(window, self._on_mouse_click)
+        glfw.set_key_callback(window, self._on_key_press)
+        glfw.set_char_callback(window, self._on_char_input)
+        glfw.set_window_size_callback(window, self._on_window_resize)
+        glfw.set_cursor_pos_callback(window, self._on_mouse_move)
+        glfw.set_scroll_callback(window, self._on_scroll)
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        # The block usually wraps app.run(), after which the window is gone
+        self.stop(reconnect=False)
+
+    def stop(self, reconnect=True):
+        """Close the trace; pass reconnect=False once the app has terminated"""
+        if self._file is None:
+            return
+        if reconnect:
+            self.app.connect_input()
+        self._file.close()
+        self._file = None
+
+    def _write(self, kind, *args):
+        app = self.app
+        self._file.write(
+            RECORD.pack(app.frame - self._start_frame, app.time(), kind)
+            + PAYLOADS[kind].pack(*args)
+        )
+
+    def _on_mouse_click(self, window, button, action, mods):
+        self._write(CLICK, button, action, mods)
+        self.app.on_mouse_click(window, button, action, mods)
+
+    def _on_mouse_move(self, window, x, y):
+        self._write(MOVE, x, y)
+        self.app.on_mouse_move(window, x, y)
+
+    def _on_key_press(self, window, key, scancode, action, mods):
+        self._write(KEY, key, scancode, action, mods)
+        self.app.on_key_press(window, key, scancode, action, mods)
+
+    def _on_char_input(self, window, char):
+        self._write(CHAR, char)
+        self.app.on_char_input(window, char)
+
+    def _on_window_resize(self, window, width, height):
+        self._write(RESIZE, width, height)
+        self.app.on_window_resize(window, width, height)
+
+    def _on_scroll(self, window, dx, dy):
+        self._write(SCROLL, dx, dy)
+        self.app.on_scroll(window, dx, dy)
+
+
+class InputReplayer:
+    """Feeds a recorded trace back into an App, frame by frame.
+
+    Events are delivered in the frame they were recorded in, and the app
+    clock advances by exactly 1 / fps per frame. Cursor blinking, animations
+    and chart timestamps then come out the same on every run, whatever the
+    real frame rate. Live input is ignored during the replay, and the window
+    closes a few frames after the last event.
+
+    For headless runs create the app with ``App(visible=False)``. ``fast``
+    turns off vsync so the trace plays back as fast as the app can render.
+    Combine with App.enable_profiling() to compare frame statistics between
+    releases.
+    """
+
+    def __init__(self, app, path, fps=60, fast=True, tail_frames=2):
+        self.app = app
+        self.fps = fps
+        self.fast = fast
+        self.tail_frames = tail_frames
+        self.width, self.height, self.events = read_trace(path)
+        self.frame = 0
+        self._next = 0
+        self._end_frame = (self.events[-1][0] if self.events else 0) + tail_frames
+
+    def clock(self):
+        return self.frame / self.fps
+
+    def start(self):
+        app = self.app
+        app.connect_input(False)
+        app.input_replay = self
+        app.clock = self.clock
+        if self.fast:
+            glfw.swap_interval(0)
+        if (app.width, app.height) != (self.width, self.height):
+            self._resize(self.width, self.height)
+        return self
+
+    def stop(self):
+        app = self.app
+        app.input_replay = None
+        app.clock = glfw.get_time
+        app.connect_input()
+        if self.fast:
+            glfw.swap_interval(1)
+
+    @property
+    def done(self):
+        return self.frame > self._end_frame
+
+    def poll(self):
+        """Deliver this frame's events; called by App.run instead of polling"""
+        glfw.poll_events()  # Keep the window responsive
+
+        events = self.events
+        while self._next < len(events) and events[self._next][0] <= self.frame:
+            _, _, kind, args = events[self._next]
+            self._next += 1
+            self._deliver(kind, args)
+
+        self.frame += 1
+        if self.done:
+            glfw.set_window_should_close(self.app.window, True)
+
+    def _deliver(self, kind, args):
+        app = self.app
+        window = app.window
+        if kind == CLICK:
+            app.on_mouse_click(window, *args)
+        elif kind == MOVE:
+            app.on_mouse_move(window, *args)
+        elif kind == KEY:
+            app.on_key_press(window, *args)
+        elif kind == CHAR:
+            app.on_char_input(window, *args)
+        elif kind == RESIZE:
+            self._resize(*args)
+        elif kind == SCROLL:
+            app.on_scroll(window, *args)
+
+    def _resize(self, width, height):
+        # The size callback is disconnected, so tell the app directly
+        glfw.set_window_size(self.app.window, width, height)
+        self.app.on_window_resize(self.app.window, width, height)
@@ -0,0 +1,163 @@
+import time
+
+try:
+    import OpenGL.GL as gl
+except ImportError:  # Only App scales its rendering, which needs PyOpenGL
+    gl = None
+
+from .profiling import GpuTimer, RollingStats
+
+
+class DynamicResolution:
+    """Lowers the render resolution while frames are over budget.
+
+    Below full scale the app draws into an offscreen framebuffer of
+    ``scale`` times the window's pixel size, which is then stretched onto
+    the window with linear filtering. The cost of a frame is its GPU time
+    when timer queries are available and its CPU render time otherwise.
+    Frames over ``budget_ms`` step the scale down to at most ``min_scale``;
+    after ``recover_frames`` frames in a row below ``headroom`` times the
+    budget it steps back up, until the window is drawn directly again.
+    After every change the next ``settle_frames`` frames are not judged,
+    since the GPU results of older frames still describe the old scale.
+
+    GLUT bitmap text keeps its pixel size in the smaller buffer, so after
+    the blit it is stretched by 1 / scale. FreeType and SDF text (see
+    use_font and use_sdf_font) is laid out in window coordinates and only
+    loses sharpness.
+    """
+
+    def __init__(
+        self,
+        budget_ms=12.0,
+        min_scale=0.5,
+        step=0.125,
+        headroom=0.6,
+        recover_frames=60,
+        settle_frames=10,
+    ):
+        self.budget_ms = budget_ms
+        self.min_scale = min_scale
+        self.step = step
+        self.headroom = headroom
+        self.recover_frames = recover_frames
+        self.settle_frames = settle_frames
+        self.scale = 1.0
+        self.frame_times = RollingStats(settle_frames)
+        self.gpu_timer = GpuTimer(self) if GpuTimer.supported() else None
+        self._gpu_ms = None
+        self._calm_frames = 0
+        self._settle = settle_frames
+        self._start = 0.0
+        self._framebuffer = None
+        self._renderbuffer = None
+        self._buffer_size = None
+        self._window_size = None
+        self._size = None
+
+    def begin(self, width, height):
+        """Start a frame for a window of width x height pixels.
+
+        Returns the pixel size of the buffer the frame is drawn into.
+        """
+        self._start = time.perf_counter()
+        self._window_size = (width, height)
+        if self.scale < 1:
+            size = (max(1, int(width * self.scale)), max(1, int(height * self.scale)))
+            self._bind(size)
+        else:
+            size = None
+        self._size = size
+        if self.gpu_timer:
+            self.gpu_timer.begin("frame")
+        return size or (width, height)
+
+    def end(self):
+        """Finish the frame; returns True when the scale changed"""
+        if self.gpu_timer:
+            self.gpu_timer.end()
+        if self._size is not None:
+            width, height = self._size
+            gl.glBindFramebuffer(gl.GL_READ_FRAMEBUFFER, self._framebuffer)
+            gl.glBindFramebuffer(gl.GL_DRAW_FRAMEBUFFER, 0)
+            gl.glBlitFramebuffer(
+                0,
+                0,
+                width,
+                height,
+                0,
+                0,
+                *self._window_size,
+                gl.GL_COLOR_BUFFER_BIT,
+                gl.GL_LINEAR,
+            )
+            gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, 0)
+            gl.glViewport(0, 0, *self._window_size)
+
+        self.frame_times.add((time.perf_counter() - self._start) * 1000)
+        if self.gpu_timer:
+            self.gpu_timer.end_frame()  # Reports an older frame, see record_gpu_pass
+        return self._adjust()
+
+    def record_gpu_pass(self, name, elapsed_ms):
+        # Called by the GpuTimer with results that are a frame or two old
+        self._gpu_ms = elapsed_ms
+
+    def _adjust(self):
+        if self._settle > 0:
+            self._settle -= 1
+            return False
+        cost = self._gpu_ms if self._gpu_ms is not None else self.frame_times.mean
+
+        if cost > self.budget_ms:
+            scale = max(self.min_scale, self.scale - self.step)
+        elif cost < self.budget_ms * self.headroom and self.scale < 1:
+            self._calm_frames += 1
+            if self._calm_frames < self.recover_frames:
+                return False
+            scale = min(1.0, self.scale + self.step)
+        else:
+            self._calm_frames = 0
+            return False
+
+        self._calm_frames = 0
+        if scale == self.scale:
+            return False
+        self.scale = scale
+        self._settle = self.settle_frames
+        self._gpu_ms = None
+        self.frame_times.samples.clear()
+        return True
+
+    def set_scale(self, scale):
+        """Force a scale, e.g. 1.0 to return to full resolution now"""
+        self.scale = max(self.min_scale, min(1.0, scale))
+        self._settle = self.settle_frames
+        self._calm_frames = 0
+
+    def _bind(self, size):
+        if self._framebuffer is None:
+            self._framebuffer = gl.glGenFramebuffers(1)
+            self._renderbuffer = gl.glGenRenderbuffers(1)
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, self._framebuffer)
+        if self._buffer_size != size:
+            gl.glBindRenderbuffer(gl.GL_RENDERBUFFER, self._renderbuffer)
+            gl.glRenderbufferStorage(gl.GL_RENDERBUFFER, gl.GL_RGBA8, *size)
+            gl.glFramebufferRenderbuffer(
+                gl.GL_FRAMEBUFFER,
+                gl.GL_COLOR_ATTACHMENT0,
+                gl.GL_RENDERBUFFER,
+                self._renderbuffer,
+            )
+            gl.glBindRenderbuffer(gl.GL_RENDERBUFFER, 0)
+            self._buffer_size = size
+        gl.glViewport(0, 0, *size)
+
+    def release(self):
+        """Delete the offscreen buffer; it is created again when needed"""
+        if self._framebuffer is not None:
+            gl.glDeleteFramebuffers(1, [self._framebuffer])
+            gl.glDeleteRenderbuffers(1, [self._renderbuffer])
+        self._framebuffer = None
+        self._renderbuffer = None
+        self._buffer_size = None
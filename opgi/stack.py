@@ -0,0 +1,241 @@
+import time
+
+try:
+    import glfw
+except ImportError:  # Pages can still be drawn with SoftwareBackend
+    glfw = None
+
+from .backend import current
+from .layouts import Layout
+from .text import HELVETICA_12
+from .widgets import Style
+
+TAB_STYLE = Style(
+    bar_color=(0.92, 0.92, 0.94),
+    tab_color=(0.92, 0.92, 0.94),
+    active_tab_color=(1, 1, 1),
+    border_color=(0.82, 0.82, 0.84),
+    accent_color=(0.26, 0.52, 0.96),
+    text_color=(0.2, 0.2, 0.2),
+    font=HELVETICA_12,
+)
+
+
+class Stack(Layout):
+    """Shows one of several pages, building each page on first show.
+
+    Pages are added as factories that return a widget or layout. Only the
+    current page is in ``widgets``, so hidden pages cost nothing in layout,
+    hit-testing or drawing. With ``release_after`` a page hidden for that
+    many seconds has release_resources() called on its widgets, and with
+    ``discard_hidden`` it is dropped completely and rebuilt by its factory
+    the next time it is shown.
+    """
+
+    def __init__(
+        self, x=0, y=0, width=100, height=100, release_after=None, discard_hidden=False
+    ):
+        super().__init__(x, y, width, height)
+        self.padding = 0
+        self.pages = {}  # name -> factory, in tab order
+        self.titles = {}
+        self.built = {}  # name -> page widget, for pages built so far
+        self.current = None
+        self.release_after = release_after
+        self.discard_hidden = discard_hidden
+        self.on_page_change = None
+        self._hidden_since = {}
+
+    def add_page(self, name, factory, title=None):
+        """Register a page; the first page added is shown right away"""
+        self.pages[name] = factory
+        self.titles[name] = title if title is not None else str(name)
+        if self.current is None:
+            self.show(name)
+
+    def remove_page(self, name):
+        if self.current == name:
+            self.widgets.clear()
+            self.current = None
+        self.release(name, discard=True)
+        del self.pages[name]
+        del self.titles[name]
+
+    def page(self, name):
+        """Return the page widget, building it if needed"""
+        page = self.built.get(name)
+        if page is None:
+            page = self.built[name] = self.pages[name]()
+            if hasattr(page, "set_app"):
+                page.set_app(self.app)
+            else:
+                page.app = self.app
+        return page
+
+    def set_app(self, app):
+        self.app = app
+        for page in self.built.values():
+            if hasattr(page, "set_app"):
+                page.set_app(app)
+            else:
+                page.app = app
+
+    def show(self, name):
+        if name == self.current:
+            return
+        previous = self.current
+        page = self.page(name)
+        self.current = name
+        self.widgets[:] = [page]
+        self._hidden_since.pop(name, None)
+
+        if previous is not None:
+            self._hidden_since[previous] = self._time()
+            self._drop_focus(self.built.get(previous))
+        self.update_layout()
+        if self.app:
+            self.app.invalidate()
+        if self.on_page_change:
+            if self.app is not None:
+                self.app.invoke_callback(self, self.on_page_change, name)
+            else:
+                self.on_page_change(name)
+
+    def release(self, name, discard=None):
+        """Free a built page's GPU data, or drop the page when discarding"""
+        page = self.built.get(name)
+        if page is None:
+            return
+        if hasattr(page, "release_resources"):
+            page.release_resources()
+        if self.discard_hidden if discard is None else discard:
+            del self.built[name]
+        self._hidden_since.pop(name, None)
+
+    def release_resources(self):
+        """Free cached GPU data of every built page, shown or hidden"""
+        for page in self.built.values():
+            if hasattr(page, "release_resources"):
+                page.release_resources()
+
+    def _time(self):
+        if self.app is not None:
+            return self.app.time()
+        return glfw.get_time() if glfw is not None else time.perf_counter()
+
+    def _drop_focus(self, page):
+        app = self.app
+        if app is None or page is None:
+            return
+        for attr in ("focused_widget", "captured_widget"):
+            widget = getattr(app, attr)
+            if widget is not None and _contains_widget(page, widget):
+                setattr(app, attr, None)
+
+    def _release_idle(self):
+        now = self._time()
+        for name, since in list(self._hidden_since.items()):
+            if now - since >= self.release_after:
+                self.release(name)
+
+    def _content_rect(self):
+        return self.x, self.y, self.width, self.height
+
+    def update_layout(self):
+        if not self.widgets:
+            return
+        page = self.widgets[0]
+        page.x, page.y, page.width, page.height = self._content_rect()
+        if hasattr(page, "update_layout"):
+            page.update_layout()
+
+    def draw(self):
+        if not self.visible:
+            return
+        if self.release_after is not None and self._hidden_since:
+            self._release_idle()
+        super().draw()
+
+
+class TabView(Stack):
+    """A Stack with a row of tabs above the pages"""
+
+    def __init__(
+        self,
+        x=0,
+        y=0,
+        width=100,
+        height=100,
+        release_after=None,
+        discard_hidden=False,
+        style=None,
+    ):
+        super().__init__(x, y, width, height, release_after, discard_hidden)
+        self.tab_height = 30
+        self.style = style or TAB_STYLE
+
+    def _content_rect(self):
+        return (
+            self.x,
+            self.y + self.tab_height,
+            self.width,
+            self.height - self.tab_height,
+        )
+
+    def _tab_width(self):
+        return self.width / max(1, len(self.pages))
+
+    def draw(self):
+        if not self.visible:
+            return
+        super().draw()
+        self._draw_tabs()
+
+    def _draw_tabs(self):
+        style = self.style
+        backend = current()
+        tab_width = self._tab_width()
+        bottom = self.y + self.tab_height
+
+        backend.set_color(*style.bar_color)
+        backend.rect(self.x, self.y, self.width, self.tab_height)
+
+        for i, name in enumerate(self.pages):
+            x = self.x + i * tab_width
+            active = name == self.current
+            backend.set_color(*(style.active_tab_color if active else style.tab_color))
+            backend.rect(x, self.y, tab_width, self.tab_height)
+            if active:
+                backend.set_color(*style.accent_color)
+                backend.rect(x, bottom - 3, tab_width, 3)
+            backend.set_color(*style.border_color)
+            backend.rect(x + tab_width - 1, self.y + 6, 1, self.tab_height - 12)
+
+            title = self.titles[name]
+            title_x = x + (tab_width - backend.text_width(title, style.font)) / 2
+            backend.set_color(*style.text_color)
+            backend.text(title, title_x, self.y + self.tab_height / 2 + 4, style.font)
+
+        backend.set_color(*style.border_color)
+        backend.rect(self.x, bottom - 1, self.width, 1)
+
+    def widget_at(self, x, y):
+        # The tab bar belongs to the TabView itself, see on_click
+        if y < self.y + self.tab_height:
+            return None
+        return super().widget_at(x, y)
+
+    def on_click(self):
+        x, y = self.app.cursor_x, self.app.cursor_y
+        if not self.pages or y >= self.y + self.tab_height:
+            return False
+        index = min(int((x - self.x) // self._tab_width()), len(self.pages) - 1)
+        self.show(list(self.pages)[index])
+        return True
+
+
+def _contains_widget(root, widget):
+    if root is widget:
+        return True
+    children = getattr(root, "widgets", ())
+    return any(_contains_widget(child, widget) for child in children)
@@ -0,0 +1,395 @@
+import numpy as np
+
+try:
+    import OpenGL.GL as gl
+except ImportError:  # Display lists are only used with GLBackend
+    gl = None
+
+from .backend import current
+from .text import prepare_text, text_generation
+from .widgets import Widget
+
+
+class Table(Widget):
+    """Virtualized multi-column table for large result sets.
+
+    ``data`` maps column names to columns. A column can be a NumPy array,
+    anything with ``to_numpy()`` (Arrow arrays, pandas series) or a plain
+    sequence. Sorting and filtering only rearrange an index array, the
+    columns themselves are never reordered.
+
+    Only the rows and columns inside the viewport are drawn. Every visible
+    cell is compiled into its own display list keyed by data row and column,
+    so scrolling only builds the cells that became visible and resizing a
+    column only rebuilds the cells of that column. Backends without retained
+    GPU state draw every visible cell directly instead.
+    """
+
+    __slots__ = (
+        "_arrays",
+        "_cell_lists",
+        "_data",
+        "_filtered",
+        "_order",
+        "_resizing_column",
+        "_row_count",
+        "_text_cache",
+        "_text_generation",
+        "column_widths",
+        "columns",
+        "formatters",
+        "header_height",
+        "min_column_width",
+        "on_selection_change",
+        "row_height",
+        "scroll_row",
+        "scroll_x",
+        "selected_row",
+        "sort_ascending",
+        "sort_column",
+        "text_cache_size",
+    )
+
+    def __init__(self, x, y, width, height, data=None, column_widths=None):
+        super().__init__(x, y, width, height)
+        self.formatters = {}
+        self.row_height = 30
+        self.header_height = 30
+        self.scroll_row = 0
+        self.scroll_x = 0
+        self.selected_row = -1  # Index into the data, not the view
+        self.sort_column = None
+        self.sort_ascending = True
+        self.on_selection_change = None
+        self.min_column_width = 30
+        self.text_cache_size = 20000
+
+        self._text_cache = {}
+        self._cell_lists = {}
+        self._text_generation = text_generation()
+        self._resizing_column = -1
+
+        self.set_data(data or {}, column_widths)
+
+    # Data handling
+    def set_data(self, data, column_widths=None):
+        """Replace the table data, dropping all cached cells"""
+        self._data = data
+        self.columns = list(data)
+        self.column_widths = list(column_widths or [120] * len(self.columns))
+        self._arrays = {}
+        self._row_count = len(next(iter(data.values()))) if data else 0
+        self._filtered = np.arange(self._row_count)
+        self._order = self._filtered
+        self.scroll_row = 0
+        self.selected_row = -1
+        self._text_cache.clear()
+        self._release_cells(set(self._cell_lists))
+
+        if self.sort_column in self.columns:
+            self.sort_by(self.sort_column, self.sort_ascending)
+        else:
+            self.sort_column = None
+
+    def column_array(self, name):
+        """Return a column as a NumPy array, converting it once"""
+        array = self._arrays.get(name)
+        if array is None:
+            column = self._data[name]
+            if hasattr(column, "to_numpy"):
+                array = column.to_numpy()
+            else:
+                array = np.asarray(column)
+            self._arrays[name] = array
+        return array
+
+    def invalidate_rows(self, rows):
+        """Drop cached cells of the given data rows after their values changed"""
+        rows = set(rows)
+        self._arrays.clear()
+        for key in [key for key in self._text_cache if key[0] in rows]:
+            del self._text_cache[key]
+        self._release_cells({key for key in self._cell_lists if key[0] in rows})
+
+    @property
+    def row_count(self):
+        """Number of rows left after filtering"""
+        return len(self._order)
+
+    def sort_by(self, column, ascending=True):
+        """Sort the view by a column through an argsort of the filtered rows"""
+        values = self.column_array(column)[self._filtered]
+        if ascending:
+            order = np.argsort(values, kind="stable")
+        else:
+            # Sort the reversed column and flip back so equal keys keep
+            # their original order, which works for any dtype
+            last = len(values) - 1
+            order = last - np.argsort(values[::-1], kind="stable")[::-1]
+        self._order = self._filtered[order]
+        self.sort_column = column
+        self.sort_ascending = ascending
+
+    def set_filter(self, column=None, predicate=None):
+        """Only show rows where ``predicate(column_array)`` is true.
+
+        The predicate receives the whole column and must return a boolean
+        mask, e.g. ``lambda values: values > 10``. Call without arguments to
+        remove the filter.
+        """
+        if column is None:
+            self._filtered = np.arange(self._row_count)
+        else:
+            mask = np.asarray(predicate(self.column_array(column)), dtype=bool)
+            self._filtered = np.flatnonzero(mask)
+
+        if self.sort_column is not None:
+            self.sort_by(self.sort_column, self.sort_ascending)
+        else:
+            self._order = self._filtered
+        self.scroll_row = min(self.scroll_row, self._max_scroll_row())
+
+    def cell_text(self, row, col):
+        """Formatted text of a cell, addressed by data row and column index"""
+        key = (row, col)
+        text = self._text_cache.get(key)
+        if text is None:
+            name = self.columns[col]
+            value = self.column_array(name)[row]
+            formatter = self.formatters.get(name, str)
+            text = formatter(value.item() if hasattr(value, "item") else value)
+
+            # Forget the oldest entries once the cache is full
+            if len(self._text_cache) >= self.text_cache_size:
+                del self._text_cache[next(iter(self._text_cache))]
+            self._text_cache[key] = text
+        return text
+
+    # Geometry
+    @property
+    def visible_rows(self):
+        return max(0, int((self.height - self.header_height) // self.row_height))
+
+    def _max_scroll_row(self):
+        return max(0, self.row_count - self.visible_rows)
+
+    def _column_edges(self):
+        """Left edge of every column plus the right edge of the last one"""
+        return np.concatenate(([0], np.cumsum(self.column_widths)))
+
+    def _visible_columns(self, edges):
+        first = max(0, int(np.searchsorted(edges, self.scroll_x, side="right")) - 1)
+        last = int(np.searchsorted(edges, self.scroll_x + self.width, side="left"))
+        return range(first, min(last, len(self.columns)))
+
+    def set_column_width(self, col, width):
+        """Resize a column, rebuilding only the cells of that column"""
+        width = max(self.min_column_width, width)
+        if width != self.column_widths[col]:
+            self.column_widths[col] = width
+            self._release_cells({key for key in self._cell_lists if key[1] == col})
+
+    def scroll(self, rows=0, pixels=0):
+        """Scroll by a number of rows and/or horizontal pixels"""
+        self.scroll_row = max(0, min(self.scroll_row + rows, self._max_scroll_row()))
+        max_scroll_x = max(0, sum(self.column_widths) - self.width)
+        self.scroll_x = max(0, min(self.scroll_x + pixels, max_scroll_x))
+
+    # Drawing
+    def draw(self):
+        # Background
+        self._set_color(1, 1, 1)
+        self._draw_rect(self.x, self.y, self.width, self.height)
+
+        # Clip cells to the table area
+        backend = current()
+        backend.clip(self.x, self.y, self.width, self.height)
+
+        edges = self._column_edges()
+        columns = self._visible_columns(edges)
+        self._draw_header(edges, columns)
+        self._draw_rows(edges, columns)
+
+        backend.unclip()
+
+        # Border
+        self._set_color(0.82, 0.82, 0.84)
+        self._set_line_width(1)
+        self._draw_rect_outline(self.x, self.y, self.width, self.height)
+
+    def _draw_header(self, edges, columns):
+        self._set_color(0.92, 0.92, 0.94)
+        self._draw_rect(self.x, self.y, self.width, self.header_height)
+
+        for col in columns:
+            cell_x = self.x + edges[col] - self.scroll_x
+            title = self.columns[col]
+            if title == self.sort_column:
+                title += " ^" if self.sort_ascending else " v"
+
+            self._set_color(0.2, 0.2, 0.2)
+            self._draw_text(
+                self._fit_text(title, self.column_widths[col]),
+                cell_x + 6,
+                self.y + self.header_height // 2 + 5,
+            )
+
+            # Column separator, also the handle for resizing
+            self._set_color(0.82, 0.82, 0.84)
+            self._draw_rect(
+                cell_x + self.column_widths[col] - 1, self.y, 1, self.height
+            )
+
+    def _draw_rows(self, edges, columns):
+        first = self.scroll_row
+        last = min(first + self.visible_rows + 1, self.row_count)
+        visible = set()
+        self._check_text_generation()
+        retained = current().retained
+
+        for view_row in range(first, last):
+            row = int(self._order[view_row])
+            row_y = self.y + self.header_height + (view_row - first) * self.row_height
+
+            if row == self.selected_row:
+                self._set_color(0.85, 0.9, 1.0)
+                self._draw_rect(self.x, row_y, self.width, self.row_height)
+
+            for col in columns:
+                key = (row, col)
+                cell_x = self.x + edges[col] - self.scroll_x
+                if not retained:
+                    width = self.column_widths[col]
+                    self._draw_cell(self._cell_text(key), width, cell_x, row_y)
+                    continue
+
+                visible.add(key)
+                gl.glPushMatrix()
+                gl.glTranslatef(cell_x, row_y, 0)
+                gl.glCallList(self._cell_list(key))
+                gl.glPopMatrix()
+
+        # Free cells that scrolled out of view
+        self._release_cells(set(self._cell_lists) - visible)
+
+    def _cell_list(self, key):
+        cell_list = self._cell_lists.get(key)
+        if cell_list is not None:
+            return cell_list
+
+        text = self._cell_text(key)
+
+        # Glyphs must be in the atlas before recording
+        prepare_text(text)
+        self._check_text_generation()
+
+        cell_list = gl.glGenLists(1)
+        gl.glNewList(cell_list, gl.GL_COMPILE)
+        self._draw_cell(text, self.column_widths[key[1]], 0, 0)
+        gl.glEndList()
+
+        self._cell_lists[key] = cell_list
+        return cell_list
+
+    def _cell_text(self, key):
+        row, col = key
+        return self._fit_text(self.cell_text(row, col), self.column_widths[col])
+
+    def _draw_cell(self, text, width, x, y):
+        """Draw a cell at (x, y), into a display list or directly"""
+        self._set_color(0.2, 0.2, 0.2)
+        self._draw_text(text, x + 6, y + self.row_height // 2 + 5)
+        self._set_color(0.92, 0.92, 0.92)
+        self._draw_rect(x, y + self.row_height - 1, width, 1)
+
+    def _check_text_generation(self):
+        # Cells refer to atlas places of their glyphs, which a font change or
+        # reuse of an atlas page invalidates
+        if self._text_generation != text_generation():
+            self._text_generation = text_generation()
+            self._release_cells(set(self._cell_lists))
+
+    def _release_cells(self, keys):
+        for key in keys:
+            gl.glDeleteLists(self._cell_lists.pop(key), 1)
+
+    def release_resources(self):
+        self._release_cells(set(self._cell_lists))
+        self._text_cache.clear()
+
+    def _fit_text(self, text, width):
+        """Cut text so that it fits into a column of the given width"""
+        available = width - 12
+        used = 0
+        for i, char in enumerate(text):
+            used += self._text_width(char)
+            if used > available:
+                return text[:i]
+        return text
+
+    # Events
+    def _column_at(self, x):
+        """Index of the column under window x, or -1"""
+        edges = self._column_edges()
+        col = int(np.searchsorted(edges, x - self.x + self.scroll_x, side="right")) - 1
+        return col if 0 <= col < len(self.columns) else -1
+
+    def _resize_handle_at(self, x):
+        """Index of the column whose right border is under window x, or -1"""
+        edges = self._column_edges()[1:] - self.scroll_x + self.x
+        near = np.flatnonzero(np.abs(edges - x) <= 4)
+        return int(near[0]) if len(near) else -1
+
+    def on_click(self):
+        x, y = self.app.cursor_x, self.app.cursor_y
+        if not self.contains(x, y):
+            return False
+
+        if y < self.y + self.header_height:
+            handle = self._resize_handle_at(x)
+            if handle >= 0:
+                self._resizing_column = handle
+                return True
+
+            col = self._column_at(x)
+            if col >= 0:
+                name = self.columns[col]
+                ascending = not (self.sort_column == name and self.sort_ascending)
+                self.sort_by(name, ascending)
+            return True
+
+        view_row = self.scroll_row + int(
+            (y - self.y - self.header_height) // self.row_height
+        )
+        if 0 <= view_row < self.row_count:
+            self.selected_row = int(self._order[view_row])
+            if self.on_selection_change:
+                self._invoke(self.on_selection_change)
+        return True
+
+    def on_mouse_move(self, x, y):
+        if self._resizing_column < 0:
+            return False
+
+        col = self._resizing_column
+        left = self.x + self._column_edges()[col] - self.scroll_x
+        self.set_column_width(col, x - left)
+        return True
+
+    def on_mouse_release(self):
+        if self._resizing_column >= 0:
+            self._resizing_column = -1
+            return True
+        return False
+
+    def on_scroll(self, dx, dy):
+        self.scroll(rows=-int(dy), pixels=-int(dx * 20))
+        return True
+
+    def get_selected_row(self):
+        """Return the selected row as a dict of column values, or None"""
+        if self.selected_row < 0:
+            return None
+        return {
+            name: self.column_array(name)[self.selected_row] for name in self.columns
+        }
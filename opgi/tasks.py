@@ -0,0 +1,152 @@
+import logging
+import queue
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+logger = logging.getLogger("opgi.tasks")
+
+
+class Background:
+    """Marks a widget callback to run off the UI thread.
+
+    Wrap a callback before passing it to a widget::
+
+        button.set_on_click(Background(fetch, on_done=show_result))
+
+    ``executor`` is "thread" for I/O bound work or "process" for CPU bound
+    work; process callbacks, their arguments and results must be picklable,
+    so use plain functions rather than widget methods. ``on_done(result)``
+    and ``on_error(exception)`` run on the UI thread in the frame after the
+    callback finishes.
+
+    ``while_busy`` decides what happens when the widget fires the same task
+    again before the previous call finished; other tasks of the widget do
+    not count: "latest" keeps only the newest arguments and
+    runs them afterwards (good for sliders), "drop" ignores the call and
+    "parallel" submits it anyway.
+    """
+
+    __slots__ = ("callback", "executor", "on_done", "on_error", "while_busy")
+
+    def __init__(
+        self,
+        callback,
+        executor="thread",
+        on_done=None,
+        on_error=None,
+        while_busy="latest",
+    ):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor: {executor!r}")
+        if while_busy not in ("latest", "drop", "parallel"):
+            raise ValueError(f"Unknown while_busy policy: {while_busy!r}")
+        self.callback = callback
+        self.executor = executor
+        self.on_done = on_done
+        self.on_error = on_error
+        self.while_busy = while_busy
+
+    @property
+    def name(self):
+        return getattr(self.callback, "__qualname__", repr(self.callback))
+
+    def __call__(self, *args):
+        # Called directly when the widget is not attached to an app
+        return self.callback(*args)
+
+
+class TaskRunner:
+    """Runs Background callbacks in pools and hands results to the UI thread.
+
+    Worker threads only put finished futures on a queue; results, errors and
+    busy state changes are all applied by process() on the UI thread.
+    """
+
+    def __init__(self, max_threads=None, max_processes=None):
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self.busy_widgets = {}  # widget -> number of calls in flight
+        self._running = {}  # (widget, task) -> number of calls in flight
+        self._executors = {}
+        self._pending = {}  # (widget, task) -> latest arguments while busy
+        self._done = queue.SimpleQueue()
+
+    def _executor(self, kind):
+        executor = self._executors.get(kind)
+        if executor is None:
+            if kind == "process":
+                executor = ProcessPoolExecutor(self.max_processes)
+            else:
+                executor = ThreadPoolExecutor(
+                    self.max_threads, thread_name_prefix="opgi-task"
+                )
+            self._executors[kind] = executor
+        return executor
+
+    def submit(self, widget, task, *args):
+        """Start task for widget unless its busy policy defers or drops it"""
+        key = (widget, task)
+        if key in self._running and task.while_busy != "parallel":
+            if task.while_busy == "latest":
+                self._pending[key] = args
+            return
+
+        future = self._executor(task.executor).submit(task.callback, *args)
+        self._running[key] = self._running.get(key, 0) + 1
+        self.busy_widgets[widget] = self.busy_widgets.get(widget, 0) + 1
+        widget.busy = True
+        future.add_done_callback(lambda future: self._done.put((widget, task, future)))
+
+    def process(self, dispatch):
+        """Apply finished calls, return True if any finished.
+
+        dispatch(widget, callback, *args) runs the result handlers, so they
+        are watched and profiled like any other callback.
+        """
+        finished = False
+        while True:
+            try:
+                widget, task, future = self._done.get_nowait()
+            except queue.Empty:
+                return finished
+            finished = True
+
+            key = (widget, task)
+            running = self._running[key] - 1
+            if running:
+                self._running[key] = running
+            else:
+                del self._running[key]
+            remaining = self.busy_widgets[widget] - 1
+            if remaining:
+                self.busy_widgets[widget] = remaining
+            else:
+                del self.busy_widgets[widget]
+                widget.busy = False
+
+            error = future.exception()
+            if error is None:
+                if task.on_done:
+                    dispatch(widget, task.on_done, future.result())
+            elif task.on_error:
+                dispatch(widget, task.on_error, error)
+            else:
+                logger.error(
+                    "%s failed",
+                    task.name,
+                    exc_info=(type(error), error, error.__traceback__),
+                )
+
+            args = self._pending.pop(key, None)
+            if args is not None:
+                self.submit(widget, task, *args)
+
+    def draw(self):
+        """Draw a busy indicator over every widget with calls in flight"""
+        for widget in self.busy_widgets:
+            if widget.visible:
+                widget.draw_busy()
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
@@ -0,0 +1,787 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    import OpenGL.GL as gl
+    from OpenGL import GLUT as glut
+except ImportError:  # Only SoftwareBackend can draw text then
+    gl = glut = None
+
+try:
+    import freetype
+except ImportError:  # Optional, see use_font()
+    freetype = None
+
+
+def _glut_font(name):
+    # Without PyOpenGL the name stands in for the font handle
+    return getattr(glut, name) if glut is not None else name
+
+
+# The GLUT bitmap fonts widgets pass to _draw_text
+HELVETICA_10 = _glut_font("GLUT_BITMAP_HELVETICA_10")
+HELVETICA_12 = _glut_font("GLUT_BITMAP_HELVETICA_12")
+HELVETICA_18 = _glut_font("GLUT_BITMAP_HELVETICA_18")
+TIMES_ROMAN_10 = _glut_font("GLUT_BITMAP_TIMES_ROMAN_10")
+TIMES_ROMAN_24 = _glut_font("GLUT_BITMAP_TIMES_ROMAN_24")
+FIXED_8_BY_13 = _glut_font("GLUT_BITMAP_8_BY_13")
+FIXED_9_BY_15 = _glut_font("GLUT_BITMAP_9_BY_15")
+
+# Pixel sizes of the fonts, as pairs since freeglut font handles are
+# unhashable ctypes pointers
+GLUT_FONT_SIZES = (
+    (HELVETICA_10, 10),
+    (HELVETICA_12, 12),
+    (HELVETICA_18, 18),
+    (TIMES_ROMAN_10, 10),
+    (TIMES_ROMAN_24, 24),
+    (FIXED_8_BY_13, 13),
+    (FIXED_9_BY_15, 15),
+)
+
+REPLACEMENT = "?"
+
+# Characters every SDF atlas holds: printable ASCII and Latin-1
+SDF_CHARSET = "".join(map(chr, [*range(32, 127), *range(160, 256)]))
+
+SDF_VERTEX_SHADER = """
+void main() {
+    gl_Position = ftransform();
+    gl_TexCoord[0] = gl_MultiTexCoord0;
+    gl_FrontColor = gl_Color;
+}
+"""
+
+# The outline is where the field crosses 0.5; fwidth() keeps the edge about
+# one pixel wide at any text size or zoom
+SDF_FRAGMENT_SHADER = """
+uniform sampler2D atlas;
+
+void main() {
+    float distance = texture2D(atlas, gl_TexCoord[0].st).a;
+    float width = max(fwidth(distance), 1e-4);
+    float alpha = smoothstep(0.5 - width, 0.5 + width, distance);
+    gl_FragColor = vec4(gl_Color.rgb, gl_Color.a * alpha);
+}
+"""
+
+# Bumped whenever atlas pages are reused or the font changes, so code that
+# keeps drawn text around (e.g. Table's display lists) knows to redraw it
+_generation = 0
+
+
+class Glyph:
+    __slots__ = ("height", "left", "page", "top", "u0", "u1", "v0", "v1", "width")
+
+    def __init__(self, page, u0, v0, u1, v1, width, height, left, top):
+        self.page = page
+        self.u0 = u0
+        self.v0 = v0
+        self.u1 = u1
+        self.v1 = v1
+        self.width = width
+        self.height = height
+        self.left = left
+        self.top = top
+
+
+class AtlasPage:
+    """One alpha texture that glyphs are packed into shelf by shelf"""
+
+    __slots__ = (
+        "codepoints",
+        "last_used",
+        "shelf_height",
+        "shelf_x",
+        "shelf_y",
+        "size",
+        "texture",
+    )
+
+    def __init__(self, size):
+        self.size = size
+        self.texture = gl.glGenTextures(1)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
+        for param in (gl.GL_TEXTURE_MIN_FILTER, gl.GL_TEXTURE_MAG_FILTER):
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, param, gl.GL_LINEAR)
+        gl.glTexImage2D(
+            gl.GL_TEXTURE_2D,
+            0,
+            gl.GL_ALPHA,
+            size,
+            size,
+            0,
+            gl.GL_ALPHA,
+            gl.GL_UNSIGNED_BYTE,
+            None,
+        )
+        self.last_used = 0
+        self.clear()
+
+    def clear(self):
+        self.shelf_x = 0
+        self.shelf_y = 0
+        self.shelf_height = 0
+        self.codepoints = []
+
+    def place(self, width, height):
+        """Reserve a width x height cell, return its corner or None if full"""
+        pad = 1
+        if self.shelf_x + width + pad > self.size:
+            self.shelf_y += self.shelf_height + pad
+            self.shelf_x = 0
+            self.shelf_height = 0
+        if self.shelf_y + height + pad > self.size or width + pad > self.size:
+            return None
+        x, y = self.shelf_x, self.shelf_y
+        self.shelf_x += width + pad
+        self.shelf_height = max(self.shelf_height, height)
+        return x, y
+
+    def delete(self):
+        gl.glDeleteTextures(1, [self.texture])
+
+
+class GlyphAtlas:
+    """Rasterized glyphs of one font size on up to max_pages textures.
+
+    Every lookup marks the glyph's page as used. When a new glyph fits on
+    no page and no page may be added, the least recently used page is
+    cleared and reused; its glyphs are rasterized again if they are needed
+    later. ``before_evict`` is called first so pending quads that still
+    sample that page can be drawn.
+    """
+
+    def __init__(self, faces, pixel_size, page_size=512, max_pages=4):
+        self.faces = faces
+        self.pixel_size = pixel_size
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages = []
+        self.glyphs = OrderedDict()  # codepoint -> Glyph, oldest first
+        self.advances = {}
+        self.evictions = 0
+        self.before_evict = None
+        self._tick = 0
+
+    def _face_for(self, codepoint):
+        for face in self.faces:
+            if face.get_char_index(codepoint):
+                return face
+        return self.faces[0]
+
+    def advance(self, codepoint):
+        advance = self.advances.get(codepoint)
+        if advance is None:
+            face = self._face_for(codepoint)
+            face.load_char(codepoint, freetype.FT_LOAD_DEFAULT)
+            advance = self.advances[codepoint] = face.glyph.advance.x / 64
+        return advance
+
+    def glyph(self, codepoint):
+        self._tick += 1
+        glyph = self.glyphs.get(codepoint)
+        if glyph is not None:
+            self.glyphs.move_to_end(codepoint)
+            if glyph.page is not None:
+                glyph.page.last_used = self._tick
+            return glyph
+        glyph = self._rasterize(codepoint)
+        self.glyphs[codepoint] = glyph
+        return glyph
+
+    def _rasterize(self, codepoint):
+        face = self._face_for(codepoint)
+        face.load_char(codepoint, freetype.FT_LOAD_RENDER)
+        slot = face.glyph
+        bitmap = slot.bitmap
+        width, height = bitmap.width, bitmap.rows
+        self.advances[codepoint] = slot.advance.x / 64
+        if not width or not height:
+            # Spaces and other blank glyphs only advance the pen
+            return Glyph(None, 0, 0, 0, 0, 0, 0, 0, 0)
+
+        pixels = np.array(bitmap.buffer, dtype=np.uint8).reshape(height, bitmap.pitch)
+        pixels = np.ascontiguousarray(pixels[:, :width])
+
+        page, (x, y) = self._allocate(width, height)
+        page.codepoints.append(codepoint)
+        page.last_used = self._tick
+        gl.glBindTexture(gl.GL_TEXTURE_2D, page.texture)
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+        gl.glTexSubImage2D(
+            gl.GL_TEXTURE_2D,
+            0,
+            x,
+            y,
+            width,
+            height,
+            gl.GL_ALPHA,
+            gl.GL_UNSIGNED_BYTE,
+            pixels,
+        )
+        size = page.size
+        return Glyph(
+            page,
+            x / size,
+            y / size,
+            (x + width) / size,
+            (y + height) / size,
+            width,
+            height,
+            slot.bitmap_left,
+            slot.bitmap_top,
+        )
+
+    def _allocate(self, width, height):
+        for page in self.pages:
+            spot = page.place(width, height)
+            if spot is not None:
+                return page, spot
+        if len(self.pages) < self.max_pages:
+            page = AtlasPage(self.page_size)
+            self.pages.append(page)
+        else:
+            page = min(self.pages, key=lambda page: page.last_used)
+            self._evict(page)
+        spot = page.place(width, height)
+        if spot is None:
+            raise ValueError(f"Glyph of {width}x{height} does not fit a page")
+        return page, spot
+
+    def _evict(self, page):
+        global _generation
+        if self.before_evict:
+            self.before_evict()
+        for codepoint in page.codepoints:
+            self.glyphs.pop(codepoint, None)
+        page.clear()
+        self.evictions += 1
+        _generation += 1
+
+    def release(self):
+        for page in self.pages:
+            page.delete()
+        self.pages = []
+        self.glyphs.clear()
+
+
+class FontRenderer:
+    """Draws text of one pixel size from a GlyphAtlas"""
+
+    def __init__(self, faces, pixel_size, page_size=512, max_pages=4):
+        self.atlas = GlyphAtlas(faces, pixel_size, page_size, max_pages)
+        self._quads = []
+        self._page = None
+
+    def width(self, text):
+        return sum(self.atlas.advance(ord(char)) for char in text)
+
+    def prepare(self, text):
+        for char in text:
+            self.atlas.glyph(ord(char))
+
+    def draw(self, text, x, y):
+        """Draw text with its baseline at y, in the current color"""
+        atlas = self.atlas
+        blend = gl.glIsEnabled(gl.GL_BLEND)
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        gl.glEnable(gl.GL_TEXTURE_2D)
+
+        atlas.before_evict = self._flush
+        pen = x
+        for char in text:
+            codepoint = ord(char)
+            glyph = atlas.glyph(codepoint)
+            if glyph.page is not None:
+                if glyph.page is not self._page:
+                    self._flush()
+                    self._page = glyph.page
+                gx = round(pen) + glyph.left
+                gy = round(y) - glyph.top
+                self._quads.append((glyph, gx, gy))
+            pen += atlas.advance(codepoint)
+        self._flush()
+        atlas.before_evict = None
+
+        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+        gl.glDisable(gl.GL_TEXTURE_2D)
+        if not blend:
+            gl.glDisable(gl.GL_BLEND)
+        return pen - x
+
+    def _flush(self):
+        """Draw the queued quads, which all sample the same page"""
+        if not self._quads:
+            self._page = None
+            return
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self._page.texture)
+        gl.glBegin(gl.GL_QUADS)
+        for glyph, gx, gy in self._quads:
+            gl.glTexCoord2f(glyph.u0, glyph.v0)
+            gl.glVertex2f(gx, gy)
+            gl.glTexCoord2f(glyph.u1, glyph.v0)
+            gl.glVertex2f(gx + glyph.width, gy)
+            gl.glTexCoord2f(glyph.u1, glyph.v1)
+            gl.glVertex2f(gx + glyph.width, gy + glyph.height)
+            gl.glTexCoord2f(glyph.u0, glyph.v1)
+            gl.glVertex2f(gx, gy + glyph.height)
+        gl.glEnd()
+        self._quads = []
+        self._page = None
+
+
+class SDFGlyph:
+    """Place of a glyph in an SDFAtlas; sizes are in atlas pixels"""
+
+    __slots__ = ("advance", "height", "left", "top", "u0", "u1", "v0", "v1", "width")
+
+    def __init__(self, u0, v0, u1, v1, left, top, width, height, advance):
+        self.u0 = u0
+        self.v0 = v0
+        self.u1 = u1
+        self.v1 = v1
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.advance = advance
+
+
+class SDFAtlas:
+    """Signed distance fields of a font's glyphs in one texture.
+
+    Each texel stores the distance to the glyph outline, 0.5 on the outline
+    and rising inside, over ``spread`` pixels of the ``glyph_size`` the
+    fields were made at. Bilinear filtering of a distance keeps the outline
+    sharp when scaled, so one atlas serves every text size. Build one with
+    generate() and keep it with save()/load().
+    """
+
+    def __init__(self, pixels, glyphs, glyph_size, spread):
+        self.pixels = pixels
+        self.glyphs = glyphs  # codepoint -> SDFGlyph
+        self.glyph_size = glyph_size
+        self.spread = spread
+        self.texture = None
+        self.program = None
+
+    @classmethod
+    def generate(
+        cls, path, fallbacks=(), chars="", glyph_size=48, spread=6, atlas_width=1024
+    ):
+        """Rasterize SDF_CHARSET plus chars from a font file (needs freetype)"""
+        if freetype is None:
+            raise ImportError("SDF atlas generation needs the freetype-py package")
+        faces = [freetype.Face(font) for font in (path, *fallbacks)]
+        for face in faces:
+            face.set_pixel_sizes(0, glyph_size)
+
+        fields = []
+        for codepoint in sorted({ord(c) for c in SDF_CHARSET + chars + REPLACEMENT}):
+            face = next((f for f in faces if f.get_char_index(codepoint)), None)
+            if face is None:
+                continue
+            face.load_char(codepoint, freetype.FT_LOAD_RENDER)
+            slot = face.glyph
+            bitmap = slot.bitmap
+            coverage = np.array(bitmap.buffer, dtype=np.uint8).reshape(
+                bitmap.rows, bitmap.pitch
+            )[:, : bitmap.width]
+            field = _distance_field(coverage, spread) if coverage.size else None
+            left, top = slot.bitmap_left - spread, slot.bitmap_top + spread
+            fields.append((codepoint, field, left, top, slot.advance.x / 64))
+
+        # Shelf packing into rows of atlas_width
+        places = []
+        x = y = shelf_height = 0
+        for _, field, *_ in fields:
+            if field is None:
+                places.append(None)
+                continue
+            height, width = field.shape
+            if x + width > atlas_width:
+                x, y, shelf_height = 0, y + shelf_height + 1, 0
+            places.append((x, y))
+            x += width + 1
+            shelf_height = max(shelf_height, height)
+        atlas_height = 1 << max(0, y + shelf_height - 1).bit_length()
+
+        pixels = np.zeros((atlas_height, atlas_width), dtype=np.uint8)
+        glyphs = {}
+        for (codepoint, field, left, top, advance), place in zip(fields, places):
+            if field is None:
+                glyphs[codepoint] = SDFGlyph(0, 0, 0, 0, 0, 0, 0, 0, advance)
+                continue
+            (x, y), (height, width) = place, field.shape
+            pixels[y : y + height, x : x + width] = field
+            glyphs[codepoint] = SDFGlyph(
+                x / atlas_width,
+                y / atlas_height,
+                (x + width) / atlas_width,
+                (y + height) / atlas_height,
+                left,
+                top,
+                width,
+                height,
+                advance,
+            )
+        return cls(pixels, glyphs, glyph_size, spread)
+
+    def save(self, path):
+        metrics = np.array(
+            [
+                (codepoint, *(getattr(glyph, name) for name in SDFGlyph.__slots__))
+                for codepoint, glyph in self.glyphs.items()
+            ],
+            dtype=np.float64,
+        )
+        # Write next to the target and rename, so a crash leaves no half file
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "wb") as file:
+            np.savez_compressed(
+                file,
+                pixels=self.pixels,
+                metrics=metrics,
+                info=np.array([self.glyph_size, self.spread]),
+            )
+        os.replace(temp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            glyph_size, spread = (int(value) for value in data["info"])
+            glyphs = {
+                int(row[0]): SDFGlyph(*(float(value) for value in row[1:]))
+                for row in data["metrics"]
+            }
+            return cls(data["pixels"], glyphs, glyph_size, spread)
+
+    def bind(self):
+        """Make the atlas texture and the SDF shader current"""
+        if self.program is None:
+            self.program = _compile_program(SDF_VERTEX_SHADER, SDF_FRAGMENT_SHADER)
+        gl.glUseProgram(self.program)
+        if self.texture is None:
+            height, width = self.pixels.shape
+            self.texture = gl.glGenTextures(1)
+            gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
+            for param in (gl.GL_TEXTURE_MIN_FILTER, gl.GL_TEXTURE_MAG_FILTER):
+                gl.glTexParameteri(gl.GL_TEXTURE_2D, param, gl.GL_LINEAR)
+            gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+            gl.glTexImage2D(
+                gl.GL_TEXTURE_2D,
+                0,
+                gl.GL_ALPHA,
+                width,
+                height,
+                0,
+                gl.GL_ALPHA,
+                gl.GL_UNSIGNED_BYTE,
+                np.ascontiguousarray(self.pixels),
+            )
+        else:
+            gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
+
+    def release(self):
+        if self.texture is not None:
+            gl.glDeleteTextures(1, [self.texture])
+            self.texture = None
+        if self.program is not None:
+            gl.glDeleteProgram(self.program)
+            self.program = None
+
+
+def _distance_field(coverage, spread):
+    """Signed distance to the outline of a coverage bitmap, as 0..255"""
+    inside = np.pad(coverage >= 128, spread)
+    # Pixels on either side of the outline: those with a 4-neighbour that is
+    # on the other side. The padding keeps np.roll from wrapping anything in.
+    neighbours = [np.roll(inside, shift, axis) for shift in (1, -1) for axis in (0, 1)]
+    crosses = np.logical_or.reduce([n != inside for n in neighbours])
+    points = np.indices(inside.shape).reshape(2, -1).T
+    flat = inside.ravel()
+
+    distance = np.empty(flat.shape)
+    for side in (True, False):
+        # Distance of pixels on one side to the nearest edge pixel on the other
+        targets = np.argwhere(crosses & (inside != side))
+        distance[flat == side] = _nearest(points[flat == side], targets)
+    signed = np.where(flat, distance - 0.5, 0.5 - distance)
+    field = np.clip(0.5 + signed / (2 * spread), 0, 1)
+    return np.round(field * 255).astype(np.uint8).reshape(inside.shape)
+
+
+def _nearest(points, targets, chunk=1024):
+    if not len(targets):
+        return np.full(len(points), np.inf)
+    nearest = np.empty(len(points))
+    for start in range(0, len(points), chunk):
+        offsets = points[start : start + chunk, None, :] - targets[None, :, :]
+        nearest[start : start + chunk] = np.sqrt((offsets**2).sum(-1).min(1))
+    return nearest
+
+
+def _compile_program(vertex_source, fragment_source):
+    program = gl.glCreateProgram()
+    for kind, source in (
+        (gl.GL_VERTEX_SHADER, vertex_source),
+        (gl.GL_FRAGMENT_SHADER, fragment_source),
+    ):
+        shader = gl.glCreateShader(kind)
+        gl.glShaderSource(shader, source)
+        gl.glCompileShader(shader)
+        if not gl.glGetShaderiv(shader, gl.GL_COMPILE_STATUS):
+            raise RuntimeError(f"Shader error: {gl.glGetShaderInfoLog(shader)}")
+        gl.glAttachShader(program, shader)
+        gl.glDeleteShader(shader)  # Freed together with the program
+    gl.glLinkProgram(program)
+    if not gl.glGetProgramiv(program, gl.GL_LINK_STATUS):
+        raise RuntimeError(f"Shader error: {gl.glGetProgramInfoLog(program)}")
+    return program
+
+
+class SDFRenderer:
+    """Draws text of one pixel size from a shared SDFAtlas"""
+
+    def __init__(self, atlas, pixel_size):
+        self.atlas = atlas
+        self.scale = pixel_size / atlas.glyph_size
+        self._fallback = atlas.glyphs.get(ord(REPLACEMENT))
+
+    def _glyphs(self, text):
+        glyphs = self.atlas.glyphs
+        for char in text:
+            glyph = glyphs.get(ord(char), self._fallback)
+            if glyph is not None:
+                yield glyph
+
+    def width(self, text):
+        return sum(glyph.advance for glyph in self._glyphs(text)) * self.scale
+
+    def prepare(self, text):
+        pass  # Every glyph is in the atlas already
+
+    def draw(self, text, x, y):
+        """Draw text with its baseline at y, in the current color"""
+        scale = self.scale
+        blend = gl.glIsEnabled(gl.GL_BLEND)
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        gl.glEnable(gl.GL_TEXTURE_2D)
+        self.atlas.bind()
+
+        pen = x
+        gl.glBegin(gl.GL_QUADS)
+        for glyph in self._glyphs(text):
+            if glyph.width:
+                gx = pen + glyph.left * scale
+                gy = y - glyph.top * scale
+                gw, gh = glyph.width * scale, glyph.height * scale
+                gl.glTexCoord2f(glyph.u0, glyph.v0)
+                gl.glVertex2f(gx, gy)
+                gl.glTexCoord2f(glyph.u1, glyph.v0)
+                gl.glVertex2f(gx + gw, gy)
+                gl.glTexCoord2f(glyph.u1, glyph.v1)
+                gl.glVertex2f(gx + gw, gy + gh)
+                gl.glTexCoord2f(glyph.u0, glyph.v1)
+                gl.glVertex2f(gx, gy + gh)
+            pen += glyph.advance * scale
+        gl.glEnd()
+
+        gl.glUseProgram(0)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+        gl.glDisable(gl.GL_TEXTURE_2D)
+        if not blend:
+            gl.glDisable(gl.GL_BLEND)
+        return pen - x
+
+
+class _FontConfig:
+    def __init__(self, paths, page_size, max_pages):
+        self.paths = paths
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.renderers = {}  # pixel size -> FontRenderer
+
+    def renderer(self, pixel_size):
+        renderer = self.renderers.get(pixel_size)
+        if renderer is None:
+            # Each size gets its own faces since FreeType faces hold one size
+            faces = [freetype.Face(path) for path in self.paths]
+            for face in faces:
+                face.set_pixel_sizes(0, pixel_size)
+            renderer = self.renderers[pixel_size] = FontRenderer(
+                faces, pixel_size, self.page_size, self.max_pages
+            )
+        return renderer
+
+    def release(self):
+        for renderer in self.renderers.values():
+            renderer.atlas.release()
+
+
+class _SDFConfig:
+    def __init__(self, atlas):
+        self.atlas = atlas
+        self.renderers = {}  # pixel size -> SDFRenderer
+
+    def renderer(self, pixel_size):
+        renderer = self.renderers.get(pixel_size)
+        if renderer is None:
+            renderer = self.renderers[pixel_size] = SDFRenderer(self.atlas, pixel_size)
+        return renderer
+
+    def release(self):
+        self.atlas.release()
+
+
+_config = None
+_scale = 1.0
+
+# Widgets measure text on the UI thread while a RenderThread draws it, and
+# FreeType faces and atlases are not safe to share between threads
+_lock = threading.RLock()
+
+
+def use_font(path, fallbacks=(), page_size=512, max_pages=4):
+    """Draw all widget text with a FreeType font instead of GLUT bitmaps.
+
+    GLUT bitmap fonts only cover Latin-1; with a font file any Unicode text
+    can be drawn. Glyphs are rasterized on first use into atlas pages per
+    text size, and when all pages are full the least recently used page is
+    cleared and reused, so texture memory stays bounded. Characters are
+    placed one after another without shaping or bidi reordering.
+
+    ``fallbacks`` are further font files searched for characters the main
+    font lacks, e.g. a CJK or Arabic script font. Each text size keeps at
+    most ``max_pages`` atlas pages of ``page_size`` squared bytes.
+    """
+    global _config
+    if freetype is None:
+        raise ImportError("use_font() needs the freetype-py package")
+    use_glut()
+    _config = _FontConfig([path, *fallbacks], page_size, max_pages)
+
+
+def use_sdf_font(path, fallbacks=(), chars="", glyph_size=48, spread=6, cache_dir=None):
+    """Draw all widget text from a signed distance field atlas.
+
+    Unlike use_font(), text of any size and at any zoom is drawn from the
+    same texture with one shader, so set_text_scale() or a scaled
+    projection never rasterizes glyphs again. ``path`` is either a font
+    file or an atlas saved with SDFAtlas.save(), e.g. one built offline.
+    The atlas of a font file is generated on first use, which takes a few
+    seconds, and cached in ``cache_dir`` (default ~/.cache/opgi).
+
+    The atlas holds Latin-1 plus ``chars``; other characters show as "?".
+    """
+    global _config
+    if path.endswith(".npz"):
+        atlas = SDFAtlas.load(path)
+    else:
+        cache = _sdf_cache_path(path, fallbacks, chars, glyph_size, spread, cache_dir)
+        if os.path.exists(cache):
+            atlas = SDFAtlas.load(cache)
+        else:
+            atlas = SDFAtlas.generate(path, fallbacks, chars, glyph_size, spread)
+            try:
+                os.makedirs(os.path.dirname(cache), exist_ok=True)
+                atlas.save(cache)
+            except OSError:
+                pass  # Only costs the generation again next time
+    use_glut()
+    _config = _SDFConfig(atlas)
+
+
+def _sdf_cache_path(path, fallbacks, chars, glyph_size, spread, cache_dir):
+    # Keyed by the font files and their modification times, so an updated
+    # font gets a new atlas
+    fonts = [
+        (os.path.abspath(font), os.stat(font).st_mtime_ns)
+        for font in (path, *fallbacks)
+    ]
+    key = repr((fonts, sorted(set(chars)), glyph_size, spread)).encode()
+    name = f"sdf-{hashlib.sha1(key).hexdigest()[:16]}.npz"
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "opgi")
+    return os.path.join(cache_dir, name)
+
+
+def use_glut():
+    """Go back to GLUT bitmap fonts, freeing any glyph atlases"""
+    global _config, _generation
+    if _config is not None:
+        _config.release()
+    _config = None
+    _generation += 1
+
+
+def set_text_scale(scale):
+    """Scale all text, e.g. 2.0 for HiDPI. GLUT bitmap fonts do not scale."""
+    global _scale, _generation
+    _scale = scale
+    _generation += 1
+
+
+def text_generation():
+    """Changes whenever previously drawn text may no longer be valid"""
+    return _generation
+
+
+def glut_font_size(font, default=12):
+    """Pixel size of a GLUT font constant"""
+    for glut_font, size in GLUT_FONT_SIZES:
+        if glut_font is font or glut_font == font:
+            return size
+    return default
+
+
+def font_renderer(font):
+    """The FontRenderer used for a GLUT font constant, or None for GLUT"""
+    if _config is None:
+        return None
+    size = glut_font_size(font) * _scale
+    # FreeType rasterizes per size, so it only gets whole pixel sizes
+    return _config.renderer(size if isinstance(_config, _SDFConfig) else round(size))
+
+
+def prepare_text(text, font=HELVETICA_18):
+    """Rasterize the glyphs of text ahead of drawing.
+
+    Call this before recording text into a display list, since texture
+    uploads inside glNewList() are recorded instead of executed.
+    """
+    with _lock:
+        renderer = font_renderer(font)
+        if renderer is not None:
+            renderer.prepare(text)
+
+
+def _latin1(text):
+    return "".join(c if ord(c) < 256 else REPLACEMENT for c in text)
+
+
+def draw_text(text, x, y, font=HELVETICA_18):
+    """Draw text with its baseline at (x, y) in the current color"""
+    with _lock:
+        renderer = font_renderer(font)
+        if renderer is not None:
+            renderer.draw(text, x, y)
+            return
+    gl.glRasterPos2f(x, y)
+    for char in _latin1(text):
+        glut.glutBitmapCharacter(font, ord(char))
+
+
+def text_width(text, font=HELVETICA_18):
+    with _lock:
+        renderer = font_renderer(font)
+        if renderer is not None:
+            return renderer.width(text)
+    return sum(glut.glutBitmapWidth(font, ord(char)) for char in _latin1(text))
@@ -0,0 +1,285 @@
+try:
+    import glfw
+except ImportError:  # Only needed for key constants when handling input
+    glfw = None
+
+from .tasks import Background
+from .widgets import List
+
+
+class TreeNode:
+    """One node of a TreeView.
+
+    ``children`` stays None until the node is first expanded and its
+    children are loaded. ``has_children`` tells the view whether to draw an
+    expander before that.
+    """
+
+    __slots__ = (
+        "children",
+        "data",
+        "depth",
+        "expanded",
+        "has_children",
+        "label",
+        "loading",
+        "parent",
+    )
+
+    def __init__(self, label, has_children=False, data=None):
+        self.label = label
+        self.data = data
+        self.has_children = has_children
+        self.children = None
+        self.parent = None
+        self.depth = 0
+        self.expanded = False
+        self.loading = False
+
+    def set_children(self, children):
+        self.children = list(children)
+        self.has_children = bool(self.children)
+        for child in self.children:
+            child.parent = self
+            child.depth = self.depth + 1
+
+    def __str__(self):
+        return str(self.label)
+
+    def __repr__(self):
+        return f"TreeNode({self.label!r})"
+
+
+class TreeView(List):
+    """Tree of lazily loaded nodes, shown as a List of its visible rows.
+
+    ``loader(node)`` returns the children of a node as TreeNodes, and is
+    called with None for the top level. It runs the first time a node is
+    expanded, on a worker thread when ``async_loading`` is set. ``items`` is
+    the flattened list of visible rows. Expanding or collapsing a node
+    inserts or removes that node's visible descendants with one slice
+    operation, so only the rows after it are shifted and no other part of
+    the tree is walked. row_of() keeps a node to row index that stays valid
+    for the rows above the last change and is extended on demand. Only rows
+    in the viewport are drawn, and selection and scrolling work as in List.
+    """
+
+    __slots__ = (
+        "_rows",
+        "_rows_valid",
+        "async_loading",
+        "indent",
+        "loader",
+        "on_expand",
+        "roots",
+    )
+
+    def __init__(self, x, y, width, height, loader, async_loading=False, style=None):
+        # node -> visible row, only trusted for rows above _rows_valid
+        self._rows = {}
+        self._rows_valid = 0
+        super().__init__(x, y, width, height, style=style)
+        self.loader = loader
+        self.async_loading = async_loading
+        self.indent = 18
+        self.on_expand = None
+        self.roots = []
+        self.set_roots(loader(None))
+
+    def set_roots(self, nodes):
+        self.roots = list(nodes)
+        for node in self.roots:
+            node.parent = None
+            node.depth = 0
+        self.clear()
+        self.items.extend(self.roots)
+
+    def _visible_descendants(self, node):
+        rows = []
+        stack = list(reversed(node.children or ())) if node.expanded else []
+        while stack:
+            child = stack.pop()
+            rows.append(child)
+            if child.expanded and child.children:
+                stack.extend(reversed(child.children))
+        return rows
+
+    def _subtree_end(self, row):
+        """Index one past the last visible descendant of the node at row"""
+        depth = self.items[row].depth
+        end = row + 1
+        while end < len(self.items) and self.items[end].depth > depth:
+            end += 1
+        return end
+
+    def row_of(self, node):
+        """Visible row of node, or -1 if it is inside a collapsed parent"""
+        items = self.items
+        # Entries of rows that moved below the last change can be stale
+        row = self._rows.get(node)  # Nodes hash by identity
+        if row is not None and row < self._rows_valid and items[row] is node:
+            return row
+        # Index the rows after the last change until the node turns up
+        for row in range(self._rows_valid, len(items)):
+            self._rows[items[row]] = row
+            self._rows_valid = row + 1
+            if items[row] is node:
+                return row
+        return -1
+
+    # Every change to the visible rows goes through these, see row_of
+    def _rows_changed(self, index, removed=()):
+        for node in removed:
+            self._rows.pop(node, None)
+        self._rows_valid = min(self._rows_valid, index)
+
+    def insert_items(self, index, items):
+        self._rows_changed(index)
+        super().insert_items(index, items)
+
+    def remove_items(self, index, count):
+        self._rows_changed(index, self.items[index : index + count])
+        super().remove_items(index, count)
+
+    def replace_items(self, index, items):
+        self._rows_changed(index, self.items[index : index + len(items)])
+        super().replace_items(index, items)
+
+    def clear(self):
+        self._rows = {}
+        self._rows_valid = 0
+        super().clear()
+
+    def expand(self, node):
+        if node.expanded or not node.has_children:
+            return
+        node.expanded = True
+        if node.children is None:
+            self._load(node)
+            return
+        row = self.row_of(node)
+        if row >= 0:
+            self.insert_items(row + 1, self._visible_descendants(node))
+        if self.on_expand:
+            self._invoke(self.on_expand, node)
+
+    def collapse(self, node):
+        if not node.expanded:
+            return
+        row = self.row_of(node)
+        node.expanded = False
+        if row < 0:
+            return
+        end = self._subtree_end(row)
+        # Keep the selection on the collapsing node rather than dropping it
+        if row < self.selected_index < end:
+            self.selected_index = row
+        self.remove_items(row + 1, end - row - 1)
+
+    def toggle(self, node):
+        if node.expanded:
+            self.collapse(node)
+        else:
+            self.expand(node)
+
+    def _load(self, node):
+        if self.async_loading and self.app is not None:
+            node.loading = True
+            self.app.invoke_callback(
+                self,
+                Background(
+                    self._fetch_children,
+                    on_done=self._children_loaded,
+                    while_busy="parallel",
+                ),
+                node,
+            )
+        else:
+            self._children_loaded(self._fetch_children(node))
+
+    def _fetch_children(self, node):
+        # Runs on a worker thread when loading asynchronously
+        return node, list(self.loader(node))
+
+    def _children_loaded(self, result):
+        node, children = result
+        node.loading = False
+        node.set_children(children)
+        if node.expanded:
+            node.expanded = False  # Let expand() insert the new rows
+            self.expand(node)
+
+    def get_selected_node(self):
+        return self.get_selected_item()
+
+    def _draw_item(self, index, y):
+        node = self.items[index]
+        style = self.style
+        selected = index == self.selected_index
+
+        if selected:
+            self._set_color(*style.selected_color)
+        elif index == self.hover_index:
+            self._set_color(*style.hover_color)
+        else:
+            self._set_color(*style.bg_color)
+        self._draw_rect(self.x + 2, y + 2, self.width - 4, self.item_height - 4)
+
+        text_color = style.selected_text_color if selected else style.text_color
+        self._set_color(*text_color)
+        x = self.x + 8 + node.depth * self.indent
+        mid = y + self.item_height / 2
+
+        if node.loading:
+            self._draw_text("...", x, mid + 5)
+        elif node.has_children:
+            if node.expanded:
+                self._draw_polygon([(x, mid - 3), (x + 10, mid - 3), (x + 5, mid + 3)])
+            else:
+                self._draw_polygon([(x + 2, mid - 5), (x + 8, mid), (x + 2, mid + 5)])
+
+        self._draw_text(str(node.label), x + 16, mid + 5)
+
+    def on_click(self):
+        x, y = self.app.cursor_x, self.app.cursor_y
+        if not self.contains(x, y):
+            return False
+        row = self.scroll_offset + int((y - self.y) // self.item_height)
+        if not 0 <= row < len(self.items):
+            return False
+
+        # Clicking the expander toggles, clicking the label selects
+        node = self.items[row]
+        expander_x = self.x + 8 + node.depth * self.indent
+        if node.has_children and expander_x - 4 <= x <= expander_x + 14:
+            self.toggle(node)
+            return True
+        return super().on_click()
+
+    def on_key_press(self, key, action):
+        if action not in (glfw.PRESS, glfw.REPEAT) or not self.items:
+            return
+        row = self.selected_index
+        node = self.items[row] if row >= 0 else None
+
+        if key in (glfw.KEY_DOWN, glfw.KEY_UP):
+            step = 1 if key == glfw.KEY_DOWN else -1
+            row = max(0, min(row + step, len(self.items) - 1))
+        elif key == glfw.KEY_RIGHT and node is not None:
+            if not node.expanded:
+                self.expand(node)
+            elif node.children:
+                row += 1
+        elif key == glfw.KEY_LEFT and node is not None:
+            if node.expanded:
+                self.collapse(node)
+            elif node.parent is not None:
+                row = self.row_of(node.parent)
+        else:
+            return
+
+        if row != self.selected_index:
+            self.selected_index = row
+            if self.on_selection_change:
+                self._invoke(self.on_selection_change)
+        self.ensure_visible(row)
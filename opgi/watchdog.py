@@ -0,0 +1,168 @@
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from contextlib import contextmanager
+
+logger = logging.getLogger("opgi.watchdog")
+
+
+def format_stack(stack):
+    """One-line form of a sampled stack, innermost frame first"""
+    return " <- ".join(stack)
+
+
+class _Section:
+    __slots__ = ("budget", "label", "samples", "start")
+
+    def __init__(self, label, budget):
+        self.label = label
+        self.budget = budget
+        self.start = time.perf_counter()
+        self.samples = Counter()
+
+
+class Stall:
+    """A frame or callback that ran over its budget"""
+
+    __slots__ = ("duration_ms", "label", "samples")
+
+    def __init__(self, label, duration_ms, samples):
+        self.label = label
+        self.duration_ms = duration_ms
+        self.samples = samples
+
+    def hottest(self, n=3):
+        """Most sampled stacks as (stack, samples), innermost frame first"""
+        return self.samples.most_common(n)
+
+    def __repr__(self):
+        return f"Stall({self.label!r}, {self.duration_ms:.1f} ms)"
+
+
+class Watchdog:
+    """Background thread that catches frames and callbacks over budget.
+
+    The UI thread marks its frames and callbacks as sections. While a section
+    runs longer than its budget the watchdog samples the innermost
+    ``stack_depth`` frames of the UI thread's stack every
+    ``sample_interval_ms``. Samples are counted per stack, so a helper called
+    from several places is reported once per caller. When the section ends,
+    the stall is logged with its hottest stacks and added to the running
+    totals in ``hot_frames``.
+    """
+
+    def __init__(
+        self,
+        budget_ms=16,
+        callback_budget_ms=None,
+        sample_interval_ms=2,
+        history=100,
+        stack_depth=8,
+    ):
+        self.budget_ms = budget_ms
+        self.callback_budget_ms = (
+            budget_ms if callback_budget_ms is None else callback_budget_ms
+        )
+        self.sample_interval_ms = sample_interval_ms
+        self.stack_depth = stack_depth
+        self.stalls = deque(maxlen=history)
+        self.hot_frames = Counter()
+
+        self._stack = []
+        self._lock = threading.Lock()
+        self._target = None
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        """Start watching the calling thread"""
+        if self._running:
+            return
+        self._target = threading.get_ident()
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="opgi-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    @contextmanager
+    def section(self, label, budget_ms=None):
+        """Watch a block of UI thread work, e.g. a frame or a callback"""
+        if budget_ms is None:
+            budget_ms = self.budget_ms
+        section = _Section(label, budget_ms / 1000)
+        with self._lock:
+            self._stack.append(section)
+        try:
+            yield section
+        finally:
+            with self._lock:
+                self._stack.pop()
+            elapsed = time.perf_counter() - section.start
+            if elapsed > section.budget:
+                self._report(section, elapsed)
+
+    def callback_section(self, callback):
+        """Section for a widget callback, labelled with its qualified name"""
+        label = getattr(callback, "__qualname__", None) or repr(callback)
+        return self.section(label, self.callback_budget_ms)
+
+    def _report(self, section, elapsed):
+        stall = Stall(section.label, elapsed * 1000, section.samples)
+        self.stalls.append(stall)
+        self.hot_frames.update(section.samples)
+
+        hottest = ", ".join(
+            f"{format_stack(stack)} x{count}" for stack, count in stall.hottest()
+        )
+        logger.warning(
+            "%s took %.1f ms (budget %.1f ms)%s",
+            section.label,
+            stall.duration_ms,
+            section.budget * 1000,
+            f"; hottest: {hottest}" if hottest else "",
+        )
+
+    def _run(self):
+        interval = self.sample_interval_ms / 1000
+        while self._running:
+            time.sleep(interval)
+            now = time.perf_counter()
+            with self._lock:
+                # Blame the innermost section that is over its budget
+                section = next(
+                    (s for s in reversed(self._stack) if now - s.start > s.budget),
+                    None,
+                )
+                if section is None:
+                    continue
+                frame = sys._current_frames().get(self._target)
+                if frame is not None:
+                    summary = traceback.StackSummary.extract(
+                        traceback.walk_stack(frame),
+                        limit=self.stack_depth,
+                        lookup_lines=False,
+                    )
+                    stack = tuple(
+                        f"{entry.name} ({entry.filename}:{entry.lineno})"
+                        for entry in summary
+                    )
+                    section.samples[stack] += 1
+                del frame
+
+    def report(self, n=10):
+        """Hottest stacks over all stalls as (stack, samples)"""
+        return self.hot_frames.most_common(n)
+
+    def reset(self):
+        self.stalls.clear()
+        self.hot_frames.clear()
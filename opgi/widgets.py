@@ -1,13 +1,103 @@
+import bisect
 import math
-
-import glfw
-import OpenGL.GL as gl
-from OpenGL import GLUT as glut
+import time
+
+try:
+    import glfw
+except ImportError:  # No windows, widgets can still draw with SoftwareBackend
+    glfw = None
+
+from .backend import current
+from .text import HELVETICA_12, HELVETICA_18
+
+
+class Style:
+    """Shared visual settings for a widget type.
+
+    One style instance is shared by every widget of a type, so colors and
+    options are not stored per widget. Use copy() to derive a variation for
+    the widgets that need different settings.
+    """
+
+    def __init__(self, **options):
+        self.__dict__.update(options)
+
+    def copy(self, **overrides):
+        options = dict(self.__dict__)
+        options.update(overrides)
+        return Style(**options)
+
+
+LIST_STYLE = Style(
+    bg_color=(1, 1, 1),
+    border_color=(0.82, 0.82, 0.84),
+    text_color=(0.2, 0.2, 0.2),
+    hover_color=(0.95, 0.95, 0.98),
+    selected_color=(0.26, 0.52, 0.96),
+    selected_text_color=(1, 1, 1),
+)
+
+SLIDER_STYLE = Style(
+    # Colors
+    track_color=(0.82, 0.82, 0.84),
+    track_fill_color=(0.26, 0.52, 0.96),
+    thumb_color=(1, 1, 1),
+    thumb_border_color=(0.6, 0.6, 0.6),
+    thumb_hover_color=(0.95, 0.95, 0.98),
+    thumb_active_color=(0.9, 0.9, 0.95),
+    # Dimensions
+    track_height=6,
+    thumb_radius=10,
+    thumb_width=20,
+    thumb_height=20,
+)
+
+PROGRESS_BAR_STYLE = Style(
+    # Colors (modern gradient style)
+    background_color=(0.92, 0.92, 0.94),
+    border_color=(0.82, 0.82, 0.84),
+    progress_color_start=(0.26, 0.52, 0.96),  # Blue gradient start
+    progress_color_end=(0.16, 0.42, 0.86),  # Blue gradient end
+    glow_color=(0.36, 0.62, 1.0, 0.3),  # Subtle glow
+    # Text colors
+    text_color=(0.2, 0.2, 0.2),
+    text_color_over_progress=(1, 1, 1),
+    # Style options
+    show_text=True,
+    show_percentage=True,
+    rounded_corners=True,
+    animation_enabled=True,
+    animation_speed=0.1,
+    glow_effect=True,
+)
+
+
+def draw_spinner(x, y, width, height, t):
+    """Draw a busy spinner at the right edge of a box, rotating with t"""
+    radius = min(8, height / 2 - 2)
+    if radius <= 0:
+        return
+    cx = x + width - radius - 4
+    cy = y + height / 2
+    start = t * 360 % 360
+
+    backend = current()
+    backend.set_color(0.26, 0.52, 0.96)
+    backend.set_line_width(2)
+    points = []
+    for i in range(0, 270, 15):
+        angle = math.radians(start + i)
+        points.append((cx + math.cos(angle) * radius, cy + math.sin(angle) * radius))
+    backend.line_strip(points)
+    backend.set_line_width(1)
 
 
 class Widget:
     """Base class for all widgets"""
 
+    # __weakref__ lets the profiler key statistics by widget
+    __slots__ = ("__weakref__", "app", "busy", "height", "visible", "width", "x", "y")
+
     def __init__(self, x=0, y=0, width=100, height=50):
         self.x = x
         self.y = y
@@ -15,6 +105,7 @@ class Widget:
         self.height = height
         self.app = None
         self.visible = True
+        self.busy = False  # A Background callback of this widget is running
 
     def draw(self):
         """Base draw method - should be overridden by subclasses"""
@@ -30,149 +121,163 @@ class Widget:
         """Set the application reference"""
         self.app = app
 
+    def invalidate(self):
+        """Redraw the main layer, which is cached while an overlay is open.
+
+        Input handlers, tasks and bindings invalidate already; call this
+        after changing what a widget draws from anywhere else, or from
+        draw() to keep animating.
+        """
+        if self.app is not None:
+            self.app.invalidate()
+
+    def release_resources(self):
+        """Free cached GPU data; it is rebuilt by the next draw"""
+
+    def _pool_reset(self, *args, **kwargs):
+        """Reinitialize a pooled widget as if constructed with these arguments.
+
+        Subclasses with expensive state can override this to keep what can
+        be reused; see WidgetPool.
+        """
+        self.__init__(*args, **kwargs)
+
+    def _invoke(self, callback, *args):
+        """Run a user callback, through the app so it can be watched"""
+        if self.app is not None and hasattr(self.app, "invoke_callback"):
+            return self.app.invoke_callback(self, callback, *args)
+        return callback(*args)
+
+    def _time(self):
+        """Seconds on the app clock, which is fixed while replaying input"""
+        if self.app is not None:
+            return self.app.time()
+        return glfw.get_time() if glfw is not None else time.perf_counter()
+
+    def draw_busy(self):
+        """Draw a spinner while a Background callback is running"""
+        draw_spinner(self.x, self.y, self.width, self.height, self._time())
+        self.invalidate()  # Keep spinning
+
+    # Drawing helper methods shared by all widgets, see opgi.backend
+    def _focused(self):
+        return self.app is not None and self.app.focused_widget == self
+
+    def _set_color(self, r, g, b, a=1.0):
+        current().set_color(r, g, b, a)
+
+    def _set_line_width(self, width):
+        current().set_line_width(width)
+
+    def _draw_rect(self, x, y, width, height):
+        current().rect(x, y, width, height)
+
+    def _draw_rect_outline(self, x, y, width, height):
+        current().rect_outline(x, y, width, height)
+
+    def _draw_rounded_rect(self, x, y, width, height, radius):
+        current().rounded_rect(x, y, width, height, radius)
+
+    def _draw_rounded_rect_outline(self, x, y, width, height, radius):
+        current().rounded_rect_outline(x, y, width, height, radius)
+
+    def _draw_quarter_circle(self, cx, cy, radius, start_angle, end_angle):
+        current().pie(cx, cy, radius, start_angle, end_angle)
+
+    def _draw_circle(self, cx, cy, radius):
+        current().circle(cx, cy, radius)
+
+    def _draw_circle_outline(self, cx, cy, radius):
+        current().circle_outline(cx, cy, radius)
+
+    def _draw_polygon(self, points):
+        current().polygon(points)
+
+    def _draw_lines(self, points):
+        current().lines(points)
+
+    def _draw_line_strip(self, points):
+        current().line_strip(points)
+
+    def _draw_quads(self, vertices, colors):
+        current().quads(vertices, colors)
+
+    def _draw_text(self, text, x, y, font=HELVETICA_18):
+        current().text(text, x, y, font)
+
+    def _text_width(self, text, font=HELVETICA_18):
+        return current().text_width(text, font)
+
 
 class Label(Widget):
+    __slots__ = ("_text", "color")
+
     def __init__(self, text, x, y, color=(0, 0, 0)):
         super().__init__(x, y, 0, 0)  # Width/height not used for label
         self.text = text
         self.color = color
 
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        self._text = text
+        self.invalidate()
+
     def draw(self):
-        gl.glColor3f(*self.color)
-        gl.glRasterPos2f(self.x, self.y)
-        for char in self.text:
-            glut.glutBitmapCharacter(glut.GLUT_BITMAP_HELVETICA_18, ord(char))
-
-
-# class Button:
-#     def __init__(self, x, y, width, height, text="Button"):
-#         self.x = x
-#         self.y = y
-#         self.width = width
-#         self.height = height
-#         self.app = None
-#         self.text = str(text)  # Ensure text is always a string
-#         self.pressed = False
-#         self.on_click = None
-
-#     def draw(self):
-#         # Draw button background
-#         if self.pressed:
-#             gl.glColor3f(0.5, 0.5, 0.5)  # Darker when pressed
-#         else:
-#             gl.glColor3f(0.8, 0.8, 0.8)  # Normal color
-
-#         gl.glBegin(gl.GL_QUADS)
-#         gl.glVertex2f(self.x, self.y)
-#         gl.glVertex2f(self.x + self.width, self.y)
-#         gl.glVertex2f(self.x + self.width, self.y + self.height)
-#         gl.glVertex2f(self.x, self.y + self.height)
-#         gl.glEnd()
-
-#         # Draw button text (with safety check)
-#         if hasattr(self, 'text') and self.text:
-#             # Convert text to string to ensure it's iterable
-#             text_str = str(self.text)
-
-#             # Calculate text width safely
-#             text_width = 0
-#             for char in text_str:
-#                 text_width += glut.glutBitmapWidth(glut.GLUT_BITMAP_HELVETICA_18, ord(char))
-
-#             # Calculate text position (centered)
-#             text_x = self.x + (self.width - text_width) // 2
-#             text_y = self.y + self.height // 2 + 5
-
-#             # Draw text
-#             gl.glMatrixMode(gl.GL_PROJECTION)
-#             gl.glLoadIdentity()
-#             gl.glOrtho(0, self.app.width, self.app.height, 0, -1, 1)
-#             gl.glMatrixMode(gl.GL_MODELVIEW)
-#             gl.glLoadIdentity()
-#             gl.glColor3f(0, 0, 0)  # Black text
-#             gl.glRasterPos2f(text_x, text_y)
-
-#             for char in text_str:
-#                 glut.glutBitmapCharacter(glut.GLUT_BITMAP_HELVETICA_18, ord(char))
-
-
-class Button:
+        self._set_color(*self.color)
+        self._draw_text(self.text, self.x, self.y)
+
+
+class Button(Widget):
+    __slots__ = ("on_click_callback", "pressed", "text")
+
     def __init__(self, x, y, width, height, text="Button"):
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
-        self.app = None
+        super().__init__(x, y, width, height)
         self.text = str(text)  # Ensure text is always a string
         self.pressed = False
-        self.on_click = None
-
-    def set_app(self, app):
-        """Set the application reference"""
-        self.app = app
+        self.on_click_callback = None
 
     def draw(self):
         # Draw button background
         if self.pressed:
-            gl.glColor3f(0.5, 0.5, 0.5)  # Darker when pressed
+            self._set_color(0.5, 0.5, 0.5)  # Darker when pressed
         else:
-            gl.glColor3f(0.8, 0.8, 0.8)  # Normal color
-
-        gl.glBegin(gl.GL_QUADS)
-        gl.glVertex2f(self.x, self.y)
-        gl.glVertex2f(self.x + self.width, self.y)
-        gl.glVertex2f(self.x + self.width, self.y + self.height)
-        gl.glVertex2f(self.x, self.y + self.height)
-        gl.glEnd()
-
-        # Draw button text (with safety check)
-        if hasattr(self, "text") and self.text:
-            # Convert text to string to ensure it's iterable
-            text_str = str(self.text)
+            self._set_color(0.8, 0.8, 0.8)  # Normal color
 
-            # Calculate text width safely
-            text_width = 0
-            for char in text_str:
-                text_width += glut.glutBitmapWidth(
-                    glut.GLUT_BITMAP_HELVETICA_18, ord(char)
-                )
+        self._draw_rect(self.x, self.y, self.width, self.height)
+
+        # Draw button text
+        if self.text:
+            text_str = str(self.text)
 
             # Calculate text position (centered)
+            text_width = self._text_width(text_str)
             text_x = self.x + (self.width - text_width) // 2
             text_y = self.y + self.height // 2 + 5
 
-            # Draw text with safe app reference handling
-            gl.glMatrixMode(gl.GL_PROJECTION)
-            gl.glLoadIdentity()
-
-            if self.app and hasattr(self.app, "width") and hasattr(self.app, "height"):
-                # Use app dimensions if available
-                gl.glOrtho(0, self.app.width, self.app.height, 0, -1, 1)
-            else:
-                # Fallback to default dimensions
-                gl.glOrtho(0, 800, 600, 0, -1, 1)
+            self._set_color(0, 0, 0)  # Black text
+            self._draw_text(text_str, text_x, text_y)
 
-            gl.glMatrixMode(gl.GL_MODELVIEW)
-            gl.glLoadIdentity()
-            gl.glColor3f(0, 0, 0)  # Black text
-            gl.glRasterPos2f(text_x, text_y)
-
-            for char in text_str:
-                glut.glutBitmapCharacter(glut.GLUT_BITMAP_HELVETICA_18, ord(char))
+    def on_click(self):
+        self.pressed = True
+        if self.on_click_callback:
+            self._invoke(self.on_click_callback)
+        return True
 
-    def contains(self, x, y):
-        return (
-            self.x <= x <= self.x + self.width and self.y <= y <= self.y + self.height
-        )
+    def on_mouse_release(self):
+        self.pressed = False
+        return True
 
-    def on_click(self):
-        if hasattr(self, "on_click") and self.on_click:
-            self.pressed = True
-            return True
-        return False
+    def set_on_click(self, callback):
+        self.on_click_callback = callback
 
 
 class TextInput(Widget):
+    __slots__ = ("active", "text")
+
     def __init__(self, x, y, width=200, height=30):
         super().__init__(x, y, width, height)
         self.text = ""
@@ -187,51 +292,40 @@ class TextInput(Widget):
 
     def draw(self):
         # Draw background
-        gl.glColor3f(1, 1, 1)
-        gl.glBegin(gl.GL_QUADS)
-        gl.glVertex2f(self.x, self.y)
-        gl.glVertex2f(self.x + self.width, self.y)
-        gl.glVertex2f(self.x + self.width, self.y + self.height)
-        gl.glVertex2f(self.x, self.y + self.height)
-        gl.glEnd()
+        self._set_color(1, 1, 1)
+        self._draw_rect(self.x, self.y, self.width, self.height)
 
         # Draw border (blue if active, gray if not)
-        border_color = (
-            (0.2, 0.5, 0.8) if (self.app.focused_widget == self) else (0.7, 0.7, 0.7)
-        )
-        gl.glColor3f(*border_color)
-        gl.glLineWidth(2)
-        gl.glBegin(gl.GL_LINE_LOOP)
-        gl.glVertex2f(self.x, self.y)
-        gl.glVertex2f(self.x + self.width, self.y)
-        gl.glVertex2f(self.x + self.width, self.y + self.height)
-        gl.glVertex2f(self.x, self.y + self.height)
-        gl.glEnd()
+        border_color = (0.2, 0.5, 0.8) if self._focused() else (0.7, 0.7, 0.7)
+        self._set_color(*border_color)
+        self._set_line_width(2)
+        self._draw_rect_outline(self.x, self.y, self.width, self.height)
 
         # Draw text
-        gl.glColor3f(0, 0, 0)
-        gl.glRasterPos2f(self.x + 5, self.y + self.height // 2 + 5)
-        for char in self.text:
-            glut.glutBitmapCharacter(glut.GLUT_BITMAP_HELVETICA_18, ord(char))
+        self._set_color(0, 0, 0)
+        self._draw_text(self.text, self.x + 5, self.y + self.height // 2 + 5)
 
         # Draw cursor if focused
-        if self.app.focused_widget == self:
-            text_width = sum(
-                glut.glutBitmapWidth(glut.GLUT_BITMAP_HELVETICA_18, ord(c))
-                for c in self.text
-            )
-            cursor_x = self.x + 5 + text_width
-            alpha = 0.5 + 0.5 * math.sin(glfw.get_time() * 5)  # Blinking effect
-            gl.glColor4f(0.2, 0.2, 0.2, alpha)
-            gl.glBegin(gl.GL_QUADS)
-            gl.glVertex2f(cursor_x, self.y + 5)
-            gl.glVertex2f(cursor_x + 2, self.y + 5)
-            gl.glVertex2f(cursor_x + 2, self.y + self.height - 5)
-            gl.glVertex2f(cursor_x, self.y + self.height - 5)
-            gl.glEnd()
+        if self._focused():
+            cursor_x = self.x + 5 + self._text_width(self.text)
+            alpha = 0.5 + 0.5 * math.sin(self._time() * 5)  # Blinking effect
+            self._set_color(0.2, 0.2, 0.2, alpha)
+            self._draw_rect(cursor_x, self.y + 5, 2, self.height - 10)
+            self.invalidate()  # Keep blinking
 
 
 class SpinBox(Widget):
+    __slots__ = (
+        "active",
+        "button_width",
+        "down_hover",
+        "max",
+        "min",
+        "step",
+        "up_hover",
+        "value",
+    )
+
     def __init__(self, x, y, width=120, height=30, min_val=0, max_val=100, step=1):
         super().__init__(x, y, width, height)
         self.value = min_val
@@ -245,40 +339,18 @@ class SpinBox(Widget):
 
     def draw(self):
         # Main box
-        gl.glColor3f(1, 1, 1)
-        gl.glBegin(gl.GL_QUADS)
-        gl.glVertex2f(self.x, self.y)
-        gl.glVertex2f(self.x + self.width, self.y)
-        gl.glVertex2f(self.x + self.width, self.y + self.height)
-        gl.glVertex2f(self.x, self.y + self.height)
-        gl.glEnd()
+        self._set_color(1, 1, 1)
+        self._draw_rect(self.x, self.y, self.width, self.height)
 
         # Border
-        border_color = (
-            (0.2, 0.5, 0.8) if (self.app.focused_widget == self) else (0.7, 0.7, 0.7)
-        )
-        gl.glColor3f(*border_color)
-        gl.glLineWidth(1)
-        gl.glBegin(gl.GL_LINE_LOOP)
-        gl.glVertex2f(self.x, self.y)
-        gl.glVertex2f(self.x + self.width, self.y)
-        gl.glVertex2f(self.x + self.width, self.y + self.height)
-        gl.glVertex2f(self.x, self.y + self.height)
-        gl.glEnd()
+        border_color = (0.2, 0.5, 0.8) if self._focused() else (0.7, 0.7, 0.7)
+        self._set_color(*border_color)
+        self._set_line_width(1)
+        self._draw_rect_outline(self.x, self.y, self.width, self.height)
 
         # Value text
-        value_str = str(self.value)
-        text_width = sum(
-            glut.glutBitmapWidth(glut.GLUT_BITMAP_HELVETICA_18, ord(c))
-            for c in value_str
-        )
-        text_x = self.x + 10
-        text_y = self.y + self.height // 2 + 5
-
-        gl.glColor3f(0, 0, 0)
-        gl.glRasterPos2f(text_x, text_y)
-        for char in value_str:
-            glut.glutBitmapCharacter(glut.GLUT_BITMAP_HELVETICA_18, ord(char))
+        self._set_color(0, 0, 0)
+        self._draw_text(str(self.value), self.x + 10, self.y + self.height // 2 + 5)
 
         # Up/Down buttons with better icons
         self._draw_button(
@@ -294,35 +366,23 @@ class SpinBox(Widget):
     def _draw_button(self, x, y, symbol, hover=False):
         # Button background
         btn_color = (0.85, 0.85, 0.85) if hover else (0.9, 0.9, 0.9)
-        gl.glColor3f(*btn_color)
-        gl.glBegin(gl.GL_QUADS)
-        gl.glVertex2f(x, y)
-        gl.glVertex2f(x + self.button_width, y)
-        gl.glVertex2f(x + self.button_width, y + self.height // 2)
-        gl.glVertex2f(x, y + self.height // 2)
-        gl.glEnd()
+        self._set_color(*btn_color)
+        self._draw_rect(x, y, self.button_width, self.height // 2)
 
         # Button border
-        gl.glColor3f(0.7, 0.7, 0.7)
-        gl.glLineWidth(1)
-        gl.glBegin(gl.GL_LINE_LOOP)
-        gl.glVertex2f(x, y)
-        gl.glVertex2f(x + self.button_width, y)
-        gl.glVertex2f(x + self.button_width, y + self.height // 2)
-        gl.glVertex2f(x, y + self.height // 2)
-        gl.glEnd()
+        self._set_color(0.7, 0.7, 0.7)
+        self._set_line_width(1)
+        self._draw_rect_outline(x, y, self.button_width, self.height // 2)
 
         # Button icon (centered)
-        text_width = glut.glutBitmapWidth(glut.GLUT_BITMAP_HELVETICA_18, ord(symbol))
-        text_x = x + (self.button_width - text_width) // 2
+        text_x = x + (self.button_width - self._text_width(symbol)) // 2
         text_y = y + self.height // 4 + 5
 
-        gl.glColor3f(0, 0, 0)
-        gl.glRasterPos2f(text_x, text_y)
-        glut.glutBitmapCharacter(glut.GLUT_BITMAP_HELVETICA_18, ord(symbol))
+        self._set_color(0, 0, 0)
+        self._draw_text(symbol, text_x, text_y)
 
     def on_click(self):
-        x, y = glfw.get_cursor_pos(self.app.window)
+        x, y = self.app.cursor_x, self.app.cursor_y
 
         # Check if up button was clicked
         up_button_x = self.x + self.width - self.button_width
@@ -345,6 +405,8 @@ class SpinBox(Widget):
 
 
 class CheckButton(Widget):
+    __slots__ = ("checked", "on_change_callback", "text")
+
     def __init__(self, x, y, text="Checkbox", checked=False):
         super().__init__(x, y, 20, 20)
         self.text = text
@@ -353,54 +415,46 @@ class CheckButton(Widget):
 
     def draw(self):
         # Checkbox square
-        gl.glColor3f(1, 1, 1)
-        gl.glBegin(gl.GL_QUADS)
-        gl.glVertex2f(self.x, self.y)
-        gl.glVertex2f(self.x + self.width, self.y)
-        gl.glVertex2f(self.x + self.width, self.y + self.height)
-        gl.glVertex2f(self.x, self.y + self.height)
-        gl.glEnd()
+        self._set_color(1, 1, 1)
+        self._draw_rect(self.x, self.y, self.width, self.height)
 
         # Checkbox border
-        border_color = (
-            (0.2, 0.5, 0.8) if (self.app.focused_widget == self) else (0.7, 0.7, 0.7)
-        )
-        gl.glColor3f(*border_color)
-        gl.glLineWidth(1)
-        gl.glBegin(gl.GL_LINE_LOOP)
-        gl.glVertex2f(self.x, self.y)
-        gl.glVertex2f(self.x + self.width, self.y)
-        gl.glVertex2f(self.x + self.width, self.y + self.height)
-        gl.glVertex2f(self.x, self.y + self.height)
-        gl.glEnd()
+        border_color = (0.2, 0.5, 0.8) if self._focused() else (0.7, 0.7, 0.7)
+        self._set_color(*border_color)
+        self._set_line_width(1)
+        self._draw_rect_outline(self.x, self.y, self.width, self.height)
 
         # Checkmark
         if self.checked:
-            gl.glColor3f(0.2, 0.5, 0.8)
-            gl.glLineWidth(2)
-            gl.glBegin(gl.GL_LINES)
-            gl.glVertex2f(self.x + 5, self.y + 10)
-            gl.glVertex2f(self.x + 10, self.y + 15)
-            gl.glVertex2f(self.x + 10, self.y + 15)
-            gl.glVertex2f(self.x + 15, self.y + 5)
-            gl.glEnd()
+            self._set_color(0.2, 0.5, 0.8)
+            self._set_line_width(2)
+            self._draw_lines(
+                [
+                    (self.x + 5, self.y + 10),
+                    (self.x + 10, self.y + 15),
+                    (self.x + 10, self.y + 15),
+                    (self.x + 15, self.y + 5),
+                ]
+            )
 
         # Label text
-        gl.glColor3f(0, 0, 0)
-        gl.glRasterPos2f(self.x + self.width + 10, self.y + self.height // 2 + 5)
-        for char in self.text:
-            glut.glutBitmapCharacter(glut.GLUT_BITMAP_HELVETICA_18, ord(char))
+        self._set_color(0, 0, 0)
+        self._draw_text(
+            self.text, self.x + self.width + 10, self.y + self.height // 2 + 5
+        )
 
     def on_click(self):
         self.checked = not self.checked
         if self.on_change_callback:
-            self.on_change_callback(self.checked)
+            self._invoke(self.on_change_callback, self.checked)
 
     def set_on_change(self, callback):
         self.on_change_callback = callback
 
 
 class RadioButton(Widget):
+    __slots__ = ("group", "on_select_callback", "selected", "text")
+
     def __init__(self, x, y, text="Radio", group=None, selected=False):
         super().__init__(x, y, 20, 20)
         self.text = text
@@ -409,47 +463,35 @@ class RadioButton(Widget):
         self.group.append(self)
         self.on_select_callback = None
 
+    def _pool_reset(self, *args, **kwargs):
+        # Leave the old group, __init__ joins the new one
+        self.group[:] = [rb for rb in self.group if rb is not self]
+        super()._pool_reset(*args, **kwargs)
+
     def draw(self):
-        # Radio circle
-        gl.glColor3f(1, 1, 1)
-        gl.glBegin(gl.GL_TRIANGLE_FAN)
         cx, cy = self.x + self.width // 2, self.y + self.height // 2
         radius = self.width // 2
-        for i in range(0, 360, 10):
-            angle = math.radians(i)
-            gl.glVertex2f(cx + math.cos(angle) * radius, cy + math.sin(angle) * radius)
-        gl.glEnd()
+
+        # Radio circle
+        self._set_color(1, 1, 1)
+        self._draw_circle(cx, cy, radius)
 
         # Radio border
-        border_color = (
-            (0.2, 0.5, 0.8) if (self.app.focused_widget == self) else (0.7, 0.7, 0.7)
-        )
-        gl.glColor3f(*border_color)
-        gl.glLineWidth(1)
-        gl.glBegin(gl.GL_LINE_LOOP)
-        for i in range(0, 360, 10):
-            angle = math.radians(i)
-            gl.glVertex2f(cx + math.cos(angle) * radius, cy + math.sin(angle) * radius)
-        gl.glEnd()
+        border_color = (0.2, 0.5, 0.8) if self._focused() else (0.7, 0.7, 0.7)
+        self._set_color(*border_color)
+        self._set_line_width(1)
+        self._draw_circle_outline(cx, cy, radius)
 
         # Selected indicator
         if self.selected:
-            gl.glColor3f(0.2, 0.5, 0.8)
-            gl.glBegin(gl.GL_TRIANGLE_FAN)
-            inner_radius = radius // 2
-            for i in range(0, 360, 10):
-                angle = math.radians(i)
-                gl.glVertex2f(
-                    cx + math.cos(angle) * inner_radius,
-                    cy + math.sin(angle) * inner_radius,
-                )
-            gl.glEnd()
+            self._set_color(0.2, 0.5, 0.8)
+            self._draw_circle(cx, cy, radius // 2)
 
         # Label text
-        gl.glColor3f(0, 0, 0)
-        gl.glRasterPos2f(self.x + self.width + 10, self.y + self.height // 2 + 5)
-        for char in self.text:
-            glut.glutBitmapCharacter(glut.GLUT_BITMAP_HELVETICA_18, ord(char))
+        self._set_color(0, 0, 0)
+        self._draw_text(
+            self.text, self.x + self.width + 10, self.y + self.height // 2 + 5
+        )
 
     def on_click(self):
         if not self.selected:
@@ -457,13 +499,46 @@ class RadioButton(Widget):
                 rb.selected = False
             self.selected = True
             if self.on_select_callback:
-                self.on_select_callback()
+                self._invoke(self.on_select_callback)
 
     def set_on_select(self, callback):
         self.on_select_callback = callback
 
 
+class PrefixIndex:
+    """Sorted index of items for fast case-insensitive prefix lookups"""
+
+    __slots__ = ("keys", "positions")
+
+    def __init__(self, items):
+        pairs = sorted((str(item).lower(), i) for i, item in enumerate(items))
+        self.keys = [key for key, _ in pairs]
+        self.positions = [i for _, i in pairs]
+
+    def search(self, prefix):
+        """Return positions of all items starting with prefix, in item order"""
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.keys, prefix)
+        end = bisect.bisect_left(self.keys, prefix + "\U0010ffff", start)
+        return sorted(self.positions[start:end])
+
+
 class ComboBox(Widget):
+    __slots__ = (
+        "_index",
+        "_indexed_items",
+        "dropdown_shadow",
+        "expanded",
+        "filter_text",
+        "highlight_index",
+        "item_height",
+        "items",
+        "matches",
+        "max_visible_items",
+        "scroll_offset",
+        "selected_index",
+    )
+
     def __init__(self, x, y, width=150, height=30, items=None):
         super().__init__(x, y, width, height)
         self.items = items or ["Option 1", "Option 2", "Option 3"]
@@ -471,134 +546,225 @@ class ComboBox(Widget):
         self.expanded = False
         self.item_height = 25
         self.dropdown_shadow = True
+        self.max_visible_items = 8
+
+        # Dropdown state; matches holds item indices passing the filter
+        self.scroll_offset = 0
+        self.filter_text = ""
+        self.matches = range(len(self.items))
+        self.highlight_index = 0
+        self._index = None
+        self._indexed_items = None
+
+    def set_items(self, items):
+        self.items = items
+        self.selected_index = 0
+        self._apply_filter()
+
+    def _apply_filter(self):
+        if not self.filter_text:
+            self.matches = range(len(self.items))
+        else:
+            # Rebuild the prefix index when the items changed, also in place.
+            # Comparing with a copy is linear and far cheaper than sorting.
+            items = list(self.items)
+            if items != self._indexed_items:
+                self._index = PrefixIndex(items)
+                self._indexed_items = items
+            self.matches = self._index.search(self.filter_text)
+        self.scroll_offset = 0
+        self.highlight_index = 0
+
+    def _dropdown_rows(self):
+        return min(len(self.matches), self.max_visible_items)
+
+    def _dropdown_height(self):
+        return self._dropdown_rows() * self.item_height
 
     def draw(self):
         # Main box
-        gl.glColor3f(1, 1, 1)
-        gl.glBegin(gl.GL_QUADS)
-        gl.glVertex2f(self.x, self.y)
-        gl.glVertex2f(self.x + self.width, self.y)
-        gl.glVertex2f(self.x + self.width, self.y + self.height)
-        gl.glVertex2f(self.x, self.y + self.height)
-        gl.glEnd()
+        self._set_color(1, 1, 1)
+        self._draw_rect(self.x, self.y, self.width, self.height)
 
         # Border
         border_color = (
-            (0.2, 0.5, 0.8)
-            if (self.expanded or self.app.focused_widget == self)
-            else (0.7, 0.7, 0.7)
+            (0.2, 0.5, 0.8) if (self.expanded or self._focused()) else (0.7, 0.7, 0.7)
         )
-        gl.glColor3f(*border_color)
-        gl.glLineWidth(1)
-        gl.glBegin(gl.GL_LINE_LOOP)
-        gl.glVertex2f(self.x, self.y)
-        gl.glVertex2f(self.x + self.width, self.y)
-        gl.glVertex2f(self.x + self.width, self.y + self.height)
-        gl.glVertex2f(self.x, self.y + self.height)
-        gl.glEnd()
-
-        # Selected item text
-        selected_text = self.items[self.selected_index]
-        text_x = self.x + 10
-        text_y = self.y + self.height // 2 + 5
-
-        gl.glColor3f(0, 0, 0)
-        gl.glRasterPos2f(text_x, text_y)
-        for char in selected_text:
-            glut.glutBitmapCharacter(glut.GLUT_BITMAP_HELVETICA_18, ord(char))
-
-        # Arrow symbol (better looking)
-        arrow = "▼" if self.expanded else "▲"
-        arrow_x = self.x + self.width - 25
-        arrow_y = self.y + self.height // 2 + 5
-        gl.glRasterPos2f(arrow_x, arrow_y)
-        glut.glutBitmapCharacter(glut.GLUT_BITMAP_HELVETICA_18, ord(arrow))
-
-        # Dropdown items if expanded
+        self._set_color(*border_color)
+        self._set_line_width(1)
+        self._draw_rect_outline(self.x, self.y, self.width, self.height)
+
+        # Filter text while searching, selected item text otherwise
+        if self.expanded and self.filter_text:
+            self._set_color(0.2, 0.5, 0.8)
+            box_text = self.filter_text
+        else:
+            self._set_color(0, 0, 0)
+            box_text = self.items[self.selected_index] if self.items else ""
+        self._draw_text(box_text, self.x + 10, self.y + self.height // 2 + 5)
+
+        # Arrow as a triangle, since bitmap fonts have no arrow glyphs
+        x = self.x + self.width - 25
+        mid = self.y + self.height / 2
         if self.expanded:
-            # Draw shadow overlay first
-            if self.dropdown_shadow:
-                gl.glColor4f(0, 0, 0, 0.2)
-                gl.glBegin(gl.GL_QUADS)
-                gl.glVertex2f(0, 0)
-                gl.glVertex2f(self.app.width, 0)
-                gl.glVertex2f(self.app.width, self.app.height)
-                gl.glVertex2f(0, self.app.height)
-                gl.glEnd()
-
-            for i, item in enumerate(self.items):
-                item_y = self.y + self.height + i * self.item_height
-
-                # Highlight selected item
-                if i == self.selected_index:
-                    gl.glColor3f(0.9, 0.9, 0.9)
-                else:
-                    gl.glColor3f(1, 1, 1)
-
-                gl.glBegin(gl.GL_QUADS)
-                gl.glVertex2f(self.x, item_y)
-                gl.glVertex2f(self.x + self.width, item_y)
-                gl.glVertex2f(self.x + self.width, item_y + self.item_height)
-                gl.glVertex2f(self.x, item_y + self.item_height)
-                gl.glEnd()
-
-                # Item border
-                gl.glColor3f(0.8, 0.8, 0.8)
-                gl.glLineWidth(1)
-                gl.glBegin(gl.GL_LINE_LOOP)
-                gl.glVertex2f(self.x, item_y)
-                gl.glVertex2f(self.x + self.width, item_y)
-                gl.glVertex2f(self.x + self.width, item_y + self.item_height)
-                gl.glVertex2f(self.x, item_y + self.item_height)
-                gl.glEnd()
-
-                # Item text
-                gl.glColor3f(0, 0, 0)
-                gl.glRasterPos2f(self.x + 10, item_y + self.item_height // 2 + 5)
-                for char in item:
-                    glut.glutBitmapCharacter(glut.GLUT_BITMAP_HELVETICA_18, ord(char))
+            self._draw_polygon([(x, mid - 3), (x + 10, mid - 3), (x + 5, mid + 3)])
+        else:
+            self._draw_polygon([(x, mid + 3), (x + 10, mid + 3), (x + 5, mid - 3)])
+
+    def draw_overlay(self):
+        """Draw the dropdown into the app overlay layer"""
+        # Dim everything below the dropdown
+        if self.dropdown_shadow:
+            self._set_color(0, 0, 0, 0.2)
+            self._draw_rect(0, 0, self.app.width, self.app.height)
+
+        # Only the entries inside the dropdown viewport are drawn
+        top = self.y + self.height
+        first = self.scroll_offset
+        for row in range(self._dropdown_rows()):
+            position = first + row
+            if position >= len(self.matches):
+                break
+            item_y = top + row * self.item_height
+
+            # Highlight selected item
+            if position == self.highlight_index:
+                self._set_color(0.85, 0.9, 1.0)
+            elif self.matches[position] == self.selected_index:
+                self._set_color(0.9, 0.9, 0.9)
+            else:
+                self._set_color(1, 1, 1)
+
+            self._draw_rect(self.x, item_y, self.width, self.item_height)
+
+            # Item border
+            self._set_color(0.8, 0.8, 0.8)
+            self._set_line_width(1)
+            self._draw_rect_outline(self.x, item_y, self.width, self.item_height)
+
+            # Item text
+            self._set_color(0, 0, 0)
+            self._draw_text(
+                self.items[self.matches[position]],
+                self.x + 10,
+                item_y + self.item_height // 2 + 5,
+            )
+
+        # Scroll position indicator
+        if len(self.matches) > self.max_visible_items:
+            height = self._dropdown_height()
+            thumb_height = max(10, height * self.max_visible_items / len(self.matches))
+            thumb_y = top + (height - thumb_height) * self.scroll_offset / (
+                len(self.matches) - self.max_visible_items
+            )
+            self._set_color(0.6, 0.6, 0.6)
+            self._draw_rect(self.x + self.width - 6, thumb_y, 4, thumb_height)
+
+    def overlay_contains(self, x, y):
+        top = self.y + self.height
+        return (
+            self.x <= x <= self.x + self.width
+            and top <= y < top + self._dropdown_height()
+        )
+
+    def _row_at(self, y):
+        """Position in matches of the dropdown row at window y"""
+        return self.scroll_offset + int((y - self.y - self.height) // self.item_height)
 
     def on_click(self):
-        x, y = glfw.get_cursor_pos(self.app.window)
+        x, y = self.app.cursor_x, self.app.cursor_y
 
         if not self.expanded:
             # Check if main box was clicked
             if self.contains(x, y):
-                self.expanded = True
-                # Bring to front by re-adding to widget list
-                if self in self.app.widgets:
-                    # self.app.widgets.remove(self)
-                    self.app.add_widget(self)
-        else:
-            # Check if an item was clicked
-            item_clicked = False
-            for i in range(len(self.items)):
-                item_y = self.y + self.height + i * self.item_height
-                if (
-                    self.x <= x <= self.x + self.width
-                    and item_y <= y <= item_y + self.item_height
-                ):
-                    self.selected_index = i
-                    item_clicked = True
-                    break
-
-            # Collapse if item was clicked or click was outside
-            if item_clicked or not (
-                self.x <= x <= self.x + self.width
-                and self.y
-                <= y
-                <= self.y + self.height + len(self.items) * self.item_height
-            ):
-                self.expanded = False
-
-
-class List:
-    def __init__(self, x, y, width, height, items=None):
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
-        self.app = None
+                self._expand()
+        elif self.overlay_contains(x, y):
+            # Map the click straight to a dropdown row
+            position = self._row_at(y)
+            if position < len(self.matches):
+                self.selected_index = self.matches[position]
+            self._collapse()
+
+    def on_overlay_hover(self, x, y):
+        if self.overlay_contains(x, y):
+            self.highlight_index = self._row_at(y)
+
+    def on_overlay_dismiss(self):
+        self._collapse()
+
+    def on_scroll(self, dx, dy):
+        if not self.expanded:
+            return False
+        self._scroll_to(self.scroll_offset - int(dy))
+        return True
+
+    def on_char_input(self, char):
+        # Typing opens the dropdown and narrows it down
+        if not self.expanded:
+            self._expand()
+        self.filter_text += chr(char)
+        self._apply_filter()
+
+    def on_key_press(self, key, action):
+        if action not in (glfw.PRESS, glfw.REPEAT) or not self.expanded:
+            return
+
+        if key == glfw.KEY_BACKSPACE:
+            self.filter_text = self.filter_text[:-1]
+            self._apply_filter()
+        elif key == glfw.KEY_ESCAPE:
+            self._collapse()
+        elif key in (glfw.KEY_ENTER, glfw.KEY_KP_ENTER):
+            if self.highlight_index < len(self.matches):
+                self.selected_index = self.matches[self.highlight_index]
+            self._collapse()
+        elif key in (glfw.KEY_DOWN, glfw.KEY_UP):
+            step = 1 if key == glfw.KEY_DOWN else -1
+            self.highlight_index = max(
+                0, min(self.highlight_index + step, len(self.matches) - 1)
+            )
+            # Keep the highlighted row inside the viewport
+            if self.highlight_index < self.scroll_offset:
+                self._scroll_to(self.highlight_index)
+            elif self.highlight_index >= self.scroll_offset + self.max_visible_items:
+                self._scroll_to(self.highlight_index - self.max_visible_items + 1)
+
+    def _scroll_to(self, offset):
+        max_offset = max(0, len(self.matches) - self.max_visible_items)
+        self.scroll_offset = max(0, min(offset, max_offset))
+
+    def _expand(self):
+        self.expanded = True
+        if self.app:
+            self.app.open_overlay(self)
+        self.filter_text = ""
+        self._apply_filter()
+        # Start with the selected item in view
+        self.highlight_index = self.selected_index
+        self._scroll_to(self.selected_index)
+
+    def _collapse(self):
+        self.expanded = False
+        if self.app:
+            self.app.close_overlay(self)
+        self.filter_text = ""
+        self._apply_filter()
+
+
+class List(Widget):
+    __slots__ = (
+        "hover_index",
+        "item_height",
+        "items",
+        "on_selection_change",
+        "scroll_offset",
+        "selected_index",
+        "style",
+        "visible_items",
+    )
+
+    def __init__(self, x, y, width, height, items=None, style=None):
+        super().__init__(x, y, width, height)
         self.items = items or []
         self.selected_index = -1
         self.scroll_offset = 0
@@ -606,27 +772,35 @@ class List:
         self.visible_items = height // self.item_height
         self.hover_index = -1
         self.on_selection_change = None
-
-        # Colors
-        self.bg_color = (1, 1, 1)
-        self.border_color = (0.82, 0.82, 0.84)
-        self.text_color = (0.2, 0.2, 0.2)
-        self.hover_color = (0.95, 0.95, 0.98)
-        self.selected_color = (0.26, 0.52, 0.96)
-        self.selected_text_color = (1, 1, 1)
+        self.style = style or LIST_STYLE
 
     def add_item(self, item):
         self.items.append(item)
 
     def remove_item(self, index):
         if 0 <= index < len(self.items):
-            self.items.pop(index)
-            if self.selected_index == index:
-                self.selected_index = -1
-                if self.on_selection_change:
-                    self.on_selection_change()
-            elif self.selected_index > index:
-                self.selected_index -= 1
+            self.remove_items(index, 1)
+
+    def insert_items(self, index, items):
+        """Insert items before index, keeping the selection on its item"""
+        self.items[index:index] = items
+        if self.selected_index >= index:
+            self.selected_index += len(items)
+
+    def remove_items(self, index, count):
+        """Remove count items starting at index, keeping the selection valid"""
+        del self.items[index : index + count]
+        if index <= self.selected_index < index + count:
+            self.selected_index = -1
+            if self.on_selection_change:
+                self._invoke(self.on_selection_change)
+        elif self.selected_index >= index + count:
+            self.selected_index -= count
+        self._scroll_to(self.scroll_offset)
+
+    def replace_items(self, index, items):
+        """Overwrite items in place starting at index"""
+        self.items[index : index + len(items)] = items
 
     def clear(self):
         self.items.clear()
@@ -635,11 +809,12 @@ class List:
 
     def draw(self):
         # Draw background
-        gl.glColor3f(*self.bg_color)
+        self._set_color(*self.style.bg_color)
         self._draw_rounded_rect(self.x, self.y, self.width, self.height, 8)
 
         # Draw border
-        gl.glColor3f(*self.border_color)
+        self._set_color(*self.style.border_color)
+        self._set_line_width(2)
         self._draw_rounded_rect_outline(self.x, self.y, self.width, self.height, 8)
 
         # Draw scrollbar if needed
@@ -655,39 +830,32 @@ class List:
             self._draw_item(i, item_y)
 
     def _draw_item(self, index, y):
+        style = self.style
+
         # Draw item background
         if index == self.selected_index:
-            gl.glColor3f(*self.selected_color)
+            self._set_color(*style.selected_color)
         elif index == self.hover_index:
-            gl.glColor3f(*self.hover_color)
+            self._set_color(*style.hover_color)
         else:
-            gl.glColor3f(*self.bg_color)
+            self._set_color(*style.bg_color)
 
         self._draw_rect(self.x + 2, y + 2, self.width - 4, self.item_height - 4)
 
         # Draw item text
         text_color = (
-            self.selected_text_color
+            style.selected_text_color
             if index == self.selected_index
-            else self.text_color
+            else style.text_color
+        )
+        self._set_color(*text_color)
+        self._draw_text(
+            str(self.items[index]), self.x + 10, y + self.item_height // 2 + 5
         )
-        text_x = self.x + 10
-        text_y = y + self.item_height // 2 + 5
-
-        gl.glMatrixMode(gl.GL_PROJECTION)
-        gl.glLoadIdentity()
-        gl.glOrtho(0, self.app.width, self.app.height, 0, -1, 1)
-        gl.glMatrixMode(gl.GL_MODELVIEW)
-        gl.glLoadIdentity()
-        gl.glColor3f(*text_color)
-        gl.glRasterPos2f(text_x, text_y)
-
-        for char in str(self.items[index]):
-            glut.glutBitmapCharacter(glut.GLUT_BITMAP_HELVETICA_18, ord(char))
 
         # Draw separator line
         if index < len(self.items) - 1 and index != self.selected_index:
-            gl.glColor3f(0.9, 0.9, 0.9)
+            self._set_color(0.9, 0.9, 0.9)
             self._draw_rect(self.x + 5, y + self.item_height - 1, self.width - 10, 1)
 
     def _draw_scrollbar(self):
@@ -705,22 +873,17 @@ class List:
         thumb_y = self.y + scroll_ratio * max_scroll_pos
 
         # Draw scrollbar track
-        gl.glColor3f(0.9, 0.9, 0.9)
+        self._set_color(0.9, 0.9, 0.9)
         self._draw_rect(scrollbar_x, self.y, scrollbar_width, self.height)
 
         # Draw scrollbar thumb
-        gl.glColor3f(0.6, 0.6, 0.6)
+        self._set_color(0.6, 0.6, 0.6)
         self._draw_rounded_rect(
             scrollbar_x, thumb_y, scrollbar_width, scrollbar_height, 4
         )
 
-    def contains(self, x, y):
-        return (
-            self.x <= x <= self.x + self.width and self.y <= y <= self.y + self.height
-        )
-
     def on_click(self):
-        x, y = glfw.get_cursor_pos(self.app.window)
+        x, y = self.app.cursor_x, self.app.cursor_y
         if not self.contains(x, y):
             return False
 
@@ -731,119 +894,58 @@ class List:
         if 0 <= item_index < len(self.items):
             self.selected_index = item_index
             if self.on_selection_change:
-                self.on_selection_change()
+                self._invoke(self.on_selection_change)
             return True
 
         return False
 
+    def on_scroll(self, dx, dy):
+        self._scroll_to(self.scroll_offset - int(dy) * 3)
+        return True
+
+    def _scroll_to(self, offset):
+        max_offset = max(0, len(self.items) - self.visible_items)
+        self.scroll_offset = max(0, min(offset, max_offset))
+
+    def ensure_visible(self, index):
+        """Scroll just enough to bring the item at index into view"""
+        if index < self.scroll_offset:
+            self._scroll_to(index)
+        elif index >= self.scroll_offset + self.visible_items:
+            self._scroll_to(index - self.visible_items + 1)
+
     def get_selected_item(self):
         if 0 <= self.selected_index < len(self.items):
             return self.items[self.selected_index]
         return None
 
-    # Drawing helper methods
-    def _draw_rect(self, x, y, width, height):
-        gl.glBegin(gl.GL_QUADS)
-        gl.glVertex2f(x, y)
-        gl.glVertex2f(x + width, y)
-        gl.glVertex2f(x + width, y + height)
-        gl.glVertex2f(x, y + height)
-        gl.glEnd()
-
-    def _draw_rounded_rect(self, x, y, width, height, radius):
-        # Center rectangle
-        gl.glBegin(gl.GL_QUADS)
-        gl.glVertex2f(x + radius, y)
-        gl.glVertex2f(x + width - radius, y)
-        gl.glVertex2f(x + width - radius, y + height)
-        gl.glVertex2f(x + radius, y + height)
-        gl.glEnd()
-
-        # Left rectangle
-        gl.glBegin(gl.GL_QUADS)
-        gl.glVertex2f(x, y + radius)
-        gl.glVertex2f(x + radius, y + radius)
-        gl.glVertex2f(x + radius, y + height - radius)
-        gl.glVertex2f(x, y + height - radius)
-        gl.glEnd()
-
-        # Right rectangle
-        gl.glBegin(gl.GL_QUADS)
-        gl.glVertex2f(x + width - radius, y + radius)
-        gl.glVertex2f(x + width, y + radius)
-        gl.glVertex2f(x + width, y + height - radius)
-        gl.glVertex2f(x + width - radius, y + height - radius)
-        gl.glEnd()
-
-        # Four corners (simplified)
-        self._draw_quarter_circle(x + radius, y + radius, radius, 180, 270)
-        self._draw_quarter_circle(x + width - radius, y + radius, radius, 270, 360)
-        self._draw_quarter_circle(
-            x + width - radius, y + height - radius, radius, 0, 90
-        )
-        self._draw_quarter_circle(x + radius, y + height - radius, radius, 90, 180)
-
-    def _draw_rounded_rect_outline(self, x, y, width, height, radius):
-        gl.glLineWidth(2)
-        gl.glBegin(gl.GL_LINE_LOOP)
-
-        # Top edge
-        gl.glVertex2f(x + radius, y)
-        gl.glVertex2f(x + width - radius, y)
-
-        # Right edge
-        gl.glVertex2f(x + width, y + radius)
-        gl.glVertex2f(x + width, y + height - radius)
 
-        # Bottom edge
-        gl.glVertex2f(x + width - radius, y + height)
-        gl.glVertex2f(x + radius, y + height)
+class Slider(Widget):
+    __slots__ = (
+        "dragging",
+        "max_value",
+        "min_value",
+        "on_value_change",
+        "style",
+        "value",
+    )
 
-        # Left edge
-        gl.glVertex2f(x, y + height - radius)
-        gl.glVertex2f(x, y + radius)
-
-        gl.glEnd()
-
-    def _draw_quarter_circle(self, cx, cy, radius, start_angle, end_angle):
-        gl.glBegin(gl.GL_TRIANGLE_FAN)
-        gl.glVertex2f(cx, cy)
-        for i in range(start_angle, end_angle + 1, 5):
-            angle = math.radians(i)
-            gl.glVertex2f(cx + math.cos(angle) * radius, cy + math.sin(angle) * radius)
-        gl.glEnd()
-
-
-class Slider:
-    def __init__(self, x, y, width, height, min_value=0, max_value=100, value=50):
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
-        self.app = None
+    def __init__(
+        self, x, y, width, height, min_value=0, max_value=100, value=50, style=None
+    ):
+        super().__init__(x, y, width, height)
         self.min_value = min_value
         self.max_value = max_value
         self.value = value
         self.dragging = False
         self.on_value_change = None
-
-        # Colors
-        self.track_color = (0.82, 0.82, 0.84)
-        self.track_fill_color = (0.26, 0.52, 0.96)
-        self.thumb_color = (1, 1, 1)
-        self.thumb_border_color = (0.6, 0.6, 0.6)
-        self.thumb_hover_color = (0.95, 0.95, 0.98)
-        self.thumb_active_color = (0.9, 0.9, 0.95)
-
-        # Dimensions
-        self.track_height = 6
-        self.thumb_radius = 10
-        self.thumb_width = 20
-        self.thumb_height = 20
+        self.style = style or SLIDER_STYLE
 
     def draw(self):
+        style = self.style
+
         # Calculate positions
-        track_y = self.y + (self.height - self.track_height) // 2
+        track_y = self.y + (self.height - style.track_height) // 2
         thumb_x = (
             self.x
             + (self.value - self.min_value)
@@ -853,8 +955,8 @@ class Slider:
         thumb_y = self.y + self.height // 2
 
         # Draw track background
-        gl.glColor3f(*self.track_color)
-        self._draw_rounded_rect(self.x, track_y, self.width, self.track_height, 3)
+        self._set_color(*style.track_color)
+        self._draw_rounded_rect(self.x, track_y, self.width, style.track_height, 3)
 
         # Draw filled track
         if self.value > self.min_value:
@@ -863,138 +965,55 @@ class Slider:
                 / (self.max_value - self.min_value)
                 * self.width
             )
-            gl.glColor3f(*self.track_fill_color)
-            self._draw_rounded_rect(self.x, track_y, fill_width, self.track_height, 3)
+            self._set_color(*style.track_fill_color)
+            self._draw_rounded_rect(self.x, track_y, fill_width, style.track_height, 3)
 
         # Draw thumb
-        thumb_state_color = self.thumb_color
+        thumb_state_color = style.thumb_color
         if self.dragging:
-            thumb_state_color = self.thumb_active_color
+            thumb_state_color = style.thumb_active_color
 
         # Thumb shadow (subtle)
-        gl.glColor3f(0, 0, 0)
-        self._draw_circle(thumb_x, thumb_y + 1, self.thumb_radius + 1)
+        self._set_color(0, 0, 0)
+        self._draw_circle(thumb_x, thumb_y + 1, style.thumb_radius + 1)
 
         # Thumb background
-        gl.glColor3f(*thumb_state_color)
-        self._draw_circle(thumb_x, thumb_y, self.thumb_radius)
+        self._set_color(*thumb_state_color)
+        self._draw_circle(thumb_x, thumb_y, style.thumb_radius)
 
         # Thumb border
-        gl.glColor3f(*self.thumb_border_color)
-        gl.glLineWidth(1.5)
-        gl.glBegin(gl.GL_LINE_LOOP)
-        for i in range(0, 360, 10):
-            angle = math.radians(i)
-            gl.glVertex2f(
-                thumb_x + math.cos(angle) * self.thumb_radius,
-                thumb_y + math.sin(angle) * self.thumb_radius,
-            )
-        gl.glEnd()
+        self._set_color(*style.thumb_border_color)
+        self._set_line_width(1.5)
+        self._draw_circle_outline(thumb_x, thumb_y, style.thumb_radius)
 
-        # Value indicator (optional)
-        if self.dragging:
-            self._draw_value_tooltip(thumb_x, thumb_y)
+    def draw_overlay(self):
+        """Draw the value tooltip above all widgets while dragging"""
+        thumb_x = (
+            self.x
+            + (self.value - self.min_value)
+            / (self.max_value - self.min_value)
+            * self.width
+        )
+        self._draw_value_tooltip(thumb_x, self.y + self.height // 2)
 
     def _draw_value_tooltip(self, x, y):
         # Draw tooltip background
         tooltip_width = 40
         tooltip_height = 25
         tooltip_x = x - tooltip_width // 2
-        tooltip_y = y - self.thumb_radius - tooltip_height - 5
+        tooltip_y = y - self.style.thumb_radius - tooltip_height - 5
 
-        gl.glColor3f(0.2, 0.2, 0.2)
+        self._set_color(0.2, 0.2, 0.2)
         self._draw_rounded_rect(tooltip_x, tooltip_y, tooltip_width, tooltip_height, 4)
 
         # Draw value text
         value_text = str(int(self.value))
-        text_width = sum(
-            glut.glutBitmapWidth(glut.GLUT_BITMAP_HELVETICA_12, ord(c))
-            for c in value_text
-        )
+        text_width = self._text_width(value_text, HELVETICA_12)
         text_x = tooltip_x + (tooltip_width - text_width) // 2
         text_y = tooltip_y + tooltip_height // 2 + 4
 
-        gl.glMatrixMode(gl.GL_PROJECTION)
-        gl.glLoadIdentity()
-        gl.glOrtho(0, self.app.width, self.app.height, 0, -1, 1)
-        gl.glMatrixMode(gl.GL_MODELVIEW)
-        gl.glLoadIdentity()
-        gl.glColor3f(1, 1, 1)
-        gl.glRasterPos2f(text_x, text_y)
-
-        for char in value_text:
-            glut.glutBitmapCharacter(glut.GLUT_BITMAP_HELVETICA_12, ord(char))
-
-    def _draw_circle(self, cx, cy, radius):
-        gl.glBegin(gl.GL_TRIANGLE_FAN)
-        gl.glVertex2f(cx, cy)
-        for i in range(0, 360, 10):
-            angle = math.radians(i)
-            gl.glVertex2f(cx + math.cos(angle) * radius, cy + math.sin(angle) * radius)
-        gl.glEnd()
-
-    def _draw_rounded_rect(self, x, y, width, height, radius):
-        # Center rectangle
-        gl.glBegin(gl.GL_QUADS)
-        gl.glVertex2f(x + radius, y)
-        gl.glVertex2f(x + width - radius, y)
-        gl.glVertex2f(x + width - radius, y + height)
-        gl.glVertex2f(x + radius, y + height)
-        gl.glEnd()
-
-        # Left rectangle
-        gl.glBegin(gl.GL_QUADS)
-        gl.glVertex2f(x, y + radius)
-        gl.glVertex2f(x + radius, y + radius)
-        gl.glVertex2f(x + radius, y + height - radius)
-        gl.glVertex2f(x, y + height - radius)
-        gl.glEnd()
-
-        # Right rectangle
-        gl.glBegin(gl.GL_QUADS)
-        gl.glVertex2f(x + width - radius, y + radius)
-        gl.glVertex2f(x + width, y + radius)
-        gl.glVertex2f(x + width, y + height - radius)
-        gl.glVertex2f(x + width - radius, y + height - radius)
-        gl.glEnd()
-
-        # Four corners
-        self._draw_quarter_circle(x + radius, y + radius, radius, 180, 270)
-        self._draw_quarter_circle(x + width - radius, y + radius, radius, 270, 360)
-        self._draw_quarter_circle(
-            x + width - radius, y + height - radius, radius, 0, 90
-        )
-        self._draw_quarter_circle(x + radius, y + height - radius, radius, 90, 180)
-
-    def _draw_quarter_circle(self, cx, cy, radius, start_angle, end_angle):
-        gl.glBegin(gl.GL_TRIANGLE_FAN)
-        gl.glVertex2f(cx, cy)
-        for i in range(start_angle, end_angle + 1, 5):
-            angle = math.radians(i)
-            gl.glVertex2f(cx + math.cos(angle) * radius, cy + math.sin(angle) * radius)
-        gl.glEnd()
-
-    def _draw_rounded_rect_outline(self, x, y, width, height, radius):
-        gl.glLineWidth(2)
-        gl.glBegin(gl.GL_LINE_LOOP)
-
-        # Top edge
-        gl.glVertex2f(x + radius, y)
-        gl.glVertex2f(x + width - radius, y)
-
-        # Right edge
-        gl.glVertex2f(x + width, y + radius)
-        gl.glVertex2f(x + width, y + height - radius)
-
-        # Bottom edge
-        gl.glVertex2f(x + width - radius, y + height)
-        gl.glVertex2f(x + radius, y + height)
-
-        # Left edge
-        gl.glVertex2f(x, y + height - radius)
-        gl.glVertex2f(x, y + radius)
-
-        gl.glEnd()
+        self._set_color(1, 1, 1)
+        self._draw_text(value_text, text_x, text_y, HELVETICA_12)
 
     def contains(self, x, y):
         # Check if point is near the thumb or track
@@ -1008,23 +1027,24 @@ class Slider:
 
         # Check thumb area
         distance = math.sqrt((x - thumb_x) ** 2 + (y - thumb_y) ** 2)
-        if distance <= self.thumb_radius + 5:  # Add some padding for easier clicking
+        if distance <= self.style.thumb_radius + 5:  # Padding for easier clicking
             return True
 
         # Check track area
-        track_y = self.y + (self.height - self.track_height) // 2
+        track_y = self.y + (self.height - self.style.track_height) // 2
         if (
             self.x <= x <= self.x + self.width
-            and track_y - 5 <= y <= track_y + self.track_height + 5
+            and track_y - 5 <= y <= track_y + self.style.track_height + 5
         ):
             return True
 
         return False
 
     def on_click(self):
-        x, y = glfw.get_cursor_pos(self.app.window)
+        x, y = self.app.cursor_x, self.app.cursor_y
         if self.contains(x, y):
             self.dragging = True
+            self.app.open_overlay(self)
             self._update_value_from_mouse(x)
             return True
         return False
@@ -1038,6 +1058,7 @@ class Slider:
     def on_mouse_release(self):
         if self.dragging:
             self.dragging = False
+            self.app.close_overlay(self)
             return True
         return False
 
@@ -1055,42 +1076,33 @@ class Slider:
         if new_value != self.value:
             self.value = new_value
             if self.on_value_change:
-                self.on_value_change(self.value)
+                self._invoke(self.on_value_change, self.value)
 
 
-class ProgressBar:
-    def __init__(self, x, y, width, height, value=0, max_value=100):
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
-        self.app = None
+class ProgressBar(Widget):
+    __slots__ = ("_value", "animation_progress", "max_value", "style")
+
+    def __init__(self, x, y, width, height, value=0, max_value=100, style=None):
+        super().__init__(x, y, width, height)
         self.value = value
         self.max_value = max_value
         self.animation_progress = value  # For smooth animation
-        self.animation_speed = 0.1
-
-        # Colors (modern gradient style)
-        self.background_color = (0.92, 0.92, 0.94)
-        self.border_color = (0.82, 0.82, 0.84)
-        self.progress_color_start = (0.26, 0.52, 0.96)  # Blue gradient start
-        self.progress_color_end = (0.16, 0.42, 0.86)  # Blue gradient end
-        self.glow_color = (0.36, 0.62, 1.0, 0.3)  # Subtle glow
-
-        # Text colors
-        self.text_color = (0.2, 0.2, 0.2)
-        self.text_color_over_progress = (1, 1, 1)
-
-        # Style options
-        self.show_text = True
-        self.show_percentage = True
-        self.rounded_corners = True
-        self.animation_enabled = True
-        self.glow_effect = True
+        self.style = style or PROGRESS_BAR_STYLE
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+        self.invalidate()
 
     def draw(self):
+        style = self.style
+
         # Update animation
-        if self.animation_enabled:
+        if style.animation_enabled:
             self._update_animation()
 
         # Calculate progress width
@@ -1098,8 +1110,8 @@ class ProgressBar:
         progress_width = max(0, min(progress_width, self.width))
 
         # Draw background
-        gl.glColor3f(*self.background_color)
-        if self.rounded_corners:
+        self._set_color(*style.background_color)
+        if style.rounded_corners:
             self._draw_rounded_rect(
                 self.x, self.y, self.width, self.height, self.height // 2
             )
@@ -1107,9 +1119,9 @@ class ProgressBar:
             self._draw_rect(self.x, self.y, self.width, self.height)
 
         # Draw border
-        gl.glColor3f(*self.border_color)
-        gl.glLineWidth(1.5)
-        if self.rounded_corners:
+        self._set_color(*style.border_color)
+        self._set_line_width(1.5)
+        if style.rounded_corners:
             self._draw_rounded_rect_outline(
                 self.x, self.y, self.width, self.height, self.height // 2
             )
@@ -1124,8 +1136,8 @@ class ProgressBar:
                     self.x, self.y, progress_width, self.height
                 )
             else:
-                gl.glColor3f(*self.progress_color_start)
-                if self.rounded_corners:
+                self._set_color(*style.progress_color_start)
+                if style.rounded_corners:
                     self._draw_rounded_rect(
                         self.x, self.y, progress_width, self.height, self.height // 2
                     )
@@ -1133,65 +1145,65 @@ class ProgressBar:
                     self._draw_rect(self.x, self.y, progress_width, self.height)
 
             # Draw glow effect
-            if self.glow_effect and progress_width > 10:
+            if style.glow_effect and progress_width > 10:
                 self._draw_glow_effect(self.x + progress_width, self.y, self.height)
 
         # Draw text
-        if self.show_text:
-            self._draw_text(progress_width)
+        if style.show_text:
+            self._draw_text_label(progress_width)
 
     def _update_animation(self):
         # Smoothly animate towards target value
         if abs(self.animation_progress - self.value) > 0.1:
             self.animation_progress += (
                 self.value - self.animation_progress
-            ) * self.animation_speed
+            ) * self.style.animation_speed
+            self.invalidate()  # Keep animating
         else:
             self.animation_progress = self.value
 
     def _draw_gradient_progress(self, x, y, width, height):
+        style = self.style
+
         # Draw gradient from start to end color
-        radius = height // 2 if self.rounded_corners else 0
-
-        gl.glBegin(gl.GL_QUADS)
-
-        # Left side (start color)
-        gl.glColor3f(*self.progress_color_start)
-        if self.rounded_corners:
-            # Left rounded part
-            gl.glVertex2f(x + radius, y)
-            gl.glVertex2f(x + width, y)
-            gl.glColor3f(*self.progress_color_end)
-            gl.glVertex2f(x + width, y + height)
-            gl.glColor3f(*self.progress_color_start)
-            gl.glVertex2f(x + radius, y + height)
+        radius = height // 2 if style.rounded_corners else 0
+
+        start, end = style.progress_color_start, style.progress_color_end
+        if style.rounded_corners:
+            # Left rounded part, the caps are drawn below
+            vertices = [
+                (x + radius, y),
+                (x + width, y),
+                (x + width, y + height),
+                (x + radius, y + height),
+            ]
+            colors = [start, start, end, start]
         else:
-            # Simple gradient for rectangular bars
-            for i in range(4):  # 4 segments for smooth gradient
-                segment_width = width / 4
+            # Simple gradient for rectangular bars, 4 segments
+            vertices = []
+            colors = []
+            segment_width = width / 4
+            for i in range(4):
                 segment_x = x + i * segment_width
-                segment_color = self._interpolate_color(
-                    self.progress_color_start, self.progress_color_end, i / 3
-                )
-
-                gl.glColor3f(*segment_color)
-                gl.glVertex2f(segment_x, y)
-                gl.glVertex2f(segment_x + segment_width, y)
-                gl.glVertex2f(segment_x + segment_width, y + height)
-                gl.glVertex2f(segment_x, y + height)
-
-        gl.glEnd()
+                vertices += [
+                    (segment_x, y),
+                    (segment_x + segment_width, y),
+                    (segment_x + segment_width, y + height),
+                    (segment_x, y + height),
+                ]
+                colors += [self._interpolate_color(start, end, i / 3)] * 4
+        self._draw_quads(vertices, colors)
 
         # Draw rounded ends if needed
-        if self.rounded_corners and radius > 0:
+        if style.rounded_corners and radius > 0:
             # Left rounded cap
-            gl.glColor3f(*self.progress_color_start)
+            self._set_color(*style.progress_color_start)
             self._draw_quarter_circle(x + radius, y + radius, radius, 180, 270)
             self._draw_quarter_circle(x + radius, y + height - radius, radius, 90, 180)
 
             # Right rounded cap (if progress reaches the end)
             if width >= self.width - radius:
-                gl.glColor3f(*self.progress_color_end)
+                self._set_color(*style.progress_color_end)
                 self._draw_quarter_circle(
                     x + self.width - radius, y + radius, radius, 270, 360
                 )
@@ -1200,61 +1212,45 @@ class ProgressBar:
                 )
 
     def _draw_glow_effect(self, x, y, height):
-        # Draw a subtle glow at the progress edge
-        gl.glEnable(gl.GL_BLEND)
-        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        glow_color = self.style.glow_color
 
+        # Draw a subtle glow at the progress edge, fading to the right
         glow_width = 10
-        glow_height = height * 1.2
+        top = y - height * 0.1
+        bottom = y + height * 1.1
 
-        gl.glColor4f(*self.glow_color)
-        gl.glBegin(gl.GL_QUADS)
+        vertices = []
+        colors = []
         for i in range(glow_width):
-            alpha = 1.0 - (i / glow_width)
-            gl.glColor4f(
-                self.glow_color[0], self.glow_color[1], self.glow_color[2], alpha * 0.3
-            )
+            alpha = (1.0 - i / glow_width) * 0.3
+            left, right = x + i, x + i + 1
+            vertices += [(left, top), (right, top), (right, bottom), (left, bottom)]
+            colors += [(*glow_color[:3], alpha)] * 4
+        self._draw_quads(vertices, colors)
 
-            gl.glVertex2f(x + i, y - (glow_height - height) / 2)
-            gl.glVertex2f(x + i + 1, y - (glow_height - height) / 2)
-            gl.glVertex2f(x + i + 1, y + height + (glow_height - height) / 2)
-            gl.glVertex2f(x + i, y + height + (glow_height - height) / 2)
+    def _draw_text_label(self, progress_width):
+        style = self.style
 
-        gl.glEnd()
-        gl.glDisable(gl.GL_BLEND)
-
-    def _draw_text(self, progress_width):
         # Determine text to display
-        if self.show_percentage:
+        if style.show_percentage:
             percentage = (self.value / self.max_value) * 100
             text = f"{percentage:.1f}%"
         else:
             text = f"{self.value}/{self.max_value}"
 
         # Calculate text position (centered)
-        text_width = sum(
-            glut.glutBitmapWidth(glut.GLUT_BITMAP_HELVETICA_12, ord(c)) for c in text
-        )
+        text_width = self._text_width(text, HELVETICA_12)
         text_x = self.x + (self.width - text_width) // 2
         text_y = self.y + self.height // 2 + 4
 
         # Choose text color based on position
         if text_x + text_width < self.x + progress_width:
-            text_color = self.text_color_over_progress
+            text_color = style.text_color_over_progress
         else:
-            text_color = self.text_color
-
-        # Draw text
-        gl.glMatrixMode(gl.GL_PROJECTION)
-        gl.glLoadIdentity()
-        gl.glOrtho(0, self.app.width, self.app.height, 0, -1, 1)
-        gl.glMatrixMode(gl.GL_MODELVIEW)
-        gl.glLoadIdentity()
-        gl.glColor3f(*text_color)
-        gl.glRasterPos2f(text_x, text_y)
+            text_color = style.text_color
 
-        for char in text:
-            glut.glutBitmapCharacter(glut.GLUT_BITMAP_HELVETICA_12, ord(char))
+        self._set_color(*text_color)
+        self._draw_text(text, text_x, text_y, HELVETICA_12)
 
     def _interpolate_color(self, color1, color2, factor):
         """Interpolate between two colors"""
@@ -1285,32 +1281,3 @@ class ProgressBar:
     def complete(self, animate=True):
         """Set progress to maximum"""
         self.set_value(self.max_value, animate)
-
-    # Drawing helper methods (reuse from other widgets)
-    def _draw_rect(self, x, y, width, height):
-        gl.glBegin(gl.GL_QUADS)
-        gl.glVertex2f(x, y)
-        gl.glVertex2f(x + width, y)
-        gl.glVertex2f(x + width, y + height)
-        gl.glVertex2f(x, y + height)
-        gl.glEnd()
-
-    def _draw_rect_outline(self, x, y, width, height):
-        gl.glBegin(gl.GL_LINE_LOOP)
-        gl.glVertex2f(x, y)
-        gl.glVertex2f(x + width, y)
-        gl.glVertex2f(x + width, y + height)
-        gl.glVertex2f(x, y + height)
-        gl.glEnd()
-
-    def _draw_rounded_rect(self, x, y, width, height, radius):
-        # Implementation from previous widgets
-        pass
-
-    def _draw_rounded_rect_outline(self, x, y, width, height, radius):
-        # Implementation from previous widgets
-        pass
-
-    def _draw_quarter_circle(self, cx, cy, radius, start_angle, end_angle):
-        # Implementation from previous widgets
-        pass
@@ -0,0 +1,89 @@
+import numbers
+import time
+
+import numpy as np
+import pytest
+
+from opgi.backend import RecordingBackend, set_backend
+from opgi.remote import RemoteClient, RemoteServer, decode, encode
+from opgi.renderer import Frame
+from opgi.widgets import Button
+
+COMMANDS = [
+    ("set_color", (0.2, 0.4, 0.6, 1.0)),
+    ("rect", (10.0, 20.0, 100.0, 30.0)),
+    ("rounded_rect_outline", (10.0, 20.0, 100.0, 30.0, 4.0)),
+    ("clip", (0.0, 0.0, 50.0, 50.0)),
+    ("line_strip", (np.array([(0, 0), (5, 5), (10, 0)], dtype=np.float32),)),
+    ("unclip", ()),
+]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("no frame received")
+        time.sleep(0.005)
+
+
+def assert_same(commands, expected):
+    """Compare decoded commands, which also carry default arguments"""
+    assert [name for name, _ in commands] == [name for name, _ in expected]
+    for (_, args), (_, expected_args) in zip(commands, expected, strict=True):
+        assert len(args) >= len(expected_args)
+        for arg, expected_arg in zip(args, expected_args):
+            if isinstance(expected_arg, (numbers.Real, np.ndarray, tuple)):
+                np.testing.assert_allclose(arg, expected_arg, rtol=1e-6)
+            else:
+                assert arg == expected_arg  # Strings and fonts
+
+
+def frame(index, commands):
+    return Frame(tuple(commands), 320, 240, (320, 240), index, index / 60)
+
+
+@pytest.fixture
+def server():
+    server = RemoteServer()
+    yield server
+    server.close()
+
+
+def test_widget_commands_round_trip():
+    recorder = RecordingBackend()
+    previous = set_backend(recorder)
+    try:
+        Button(10, 10, 100, 30, "Hello").draw()
+    finally:
+        set_backend(previous)
+    commands = recorder.take()
+
+    decoded = [decode(encode(name, args)) for name, args in commands]
+    assert_same(decoded, commands)
+    assert "Hello" in [args[0] for name, args in decoded if name == "text"]
+
+
+def test_loopback(server):
+    client = RemoteClient(*server.address)
+    try:
+        server.send(frame(1, COMMANDS))
+        wait_for(lambda: client.frame == 1)
+        assert client.size == (320, 240)
+        assert_same(client.snapshot()[1], COMMANDS)
+
+        # Only the changed command is sent again
+        changed = list(COMMANDS)
+        changed[1] = ("rect", (12.0, 20.0, 100.0, 30.0))
+        sent = server.bytes_sent
+        server.send(frame(2, changed))
+        wait_for(lambda: client.frame == 2)
+        assert_same(client.snapshot()[1], changed)
+        assert server.bytes_sent - sent < sent
+
+        # Unchanged frames are not sent
+        frames = server.frames_sent
+        server.send(frame(3, changed))
+        assert server.frames_sent == frames
+    finally:
+        client.close()
@@ -0,0 +1,98 @@
+import hashlib
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+from opgi.backend import SoftwareBackend
+from opgi.widgets import Button, CheckButton, Label, ProgressBar, Slider
+
+# sha256 of SoftwareBackend.to_uint8() after drawing each scene
+CHECKSUMS = {
+    "button": "c3cc8964f9453657102c6c86139d3b10d6bb8148b6522a7516b51601e24f67a3",
+    "check_button": "04ada2b48bb5a5da6bee0cb86cfe14dffd4b24d1ed8241e83e875e2974fddf32",
+    "label": "422ce0a701778c6a1e51162f6b9dd849c0addc1e744c47b113a0ae9445f5a577",
+    "progress_bar": "b199215251ae9ce45334f09bc7c5c7e91b8eb8c3b559d8625ce0337929dd757c",
+    "slider": "5dd0c12eddb8e675e8ce845d43f3efec6e43882dba487f83fa66e0a15cbc3ffe",
+}
+
+
+def checksum(backend):
+    return hashlib.sha256(backend.to_uint8().tobytes()).hexdigest()
+
+
+def test_rect_covers_pixel_centers():
+    backend = SoftwareBackend(40, 30)
+    backend.set_color(1, 0, 0)
+    backend.rect(10, 10, 20, 10)
+    pixels = backend.to_uint8()
+    assert (pixels[10:20, 10:30] == (255, 0, 0, 255)).all()
+    assert (pixels[9, 10] == 255).all() and (pixels[20, 10] == 255).all()
+    assert (pixels[10, 9] == 255).all() and (pixels[10, 30] == 255).all()
+
+
+def test_translucent_colors_blend():
+    backend = SoftwareBackend(10, 10)
+    backend.set_color(0, 0, 1, 0.5)
+    backend.rect(0, 0, 10, 10)
+    assert tuple(backend.to_uint8()[5, 5]) == (128, 128, 255, 255)
+
+
+def test_clip():
+    backend = SoftwareBackend(20, 20)
+    backend.set_color(0, 0, 0)
+    backend.clip(0, 0, 5, 5)
+    backend.rect(0, 0, 20, 20)
+    backend.unclip()
+    assert int((backend.pixels[..., 0] == 0).sum()) == 25
+
+
+SCENES = {
+    "button": lambda: [Button(10, 10, 100, 30, "Hello")],
+    "check_button": lambda: [
+        CheckButton(10, 10, "Off"),
+        CheckButton(10, 40, "On", checked=True),
+    ],
+    "progress_bar": lambda: [ProgressBar(10, 10, 200, 20, value=40)],
+    "slider": lambda: [Slider(10, 10, 200, 30, value=25)],
+    "label": lambda: [Label("Label text", 10, 30, color=(0.2, 0.3, 0.4))],
+}
+
+
+@pytest.mark.parametrize("scene", sorted(SCENES))
+def test_widget_checksums(scene):
+    backend = SoftwareBackend(240, 80)
+    backend.render(SCENES[scene]())
+    assert checksum(backend) == CHECKSUMS[scene]
+
+    # Drawing again gives the same pixels
+    backend.clear()
+    backend.render(SCENES[scene]())
+    assert checksum(backend) == CHECKSUMS[scene]
+    assert np.any(backend.to_uint8() != 255)
+
+
+def test_draws_without_gl():
+    # A fresh interpreter, so the imports cannot reuse loaded GL modules
+    script = textwrap.dedent(
+        """
+        import sys
+
+        sys.modules["OpenGL"] = None
+        sys.modules["glfw"] = None
+
+        import opgi
+        from opgi.backend import SoftwareBackend
+
+        backend = SoftwareBackend(240, 80)
+        backend.render([opgi.Button(10, 10, 100, 30, "Hello")])
+        print(backend.to_uint8().min())
+        """
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=False
+    )
+    assert result.returncode == 0, result.stderr
+    assert int(result.stdout) < 255